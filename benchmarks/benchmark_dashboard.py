@@ -0,0 +1,63 @@
+"""
+Benchmark dashboard metrics: ReportAccumulator, folding summaries one at a
+time, against the vectorized CommitFrame group-bys.
+
+Usage:
+    python benchmarks/benchmark_dashboard.py --commits 50000
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from agents.commit_frame import CommitFrame
+from agents.enhanced_report_generator import ReportAccumulator
+from benchmark_serialization import build_report, time_call
+
+
+def accumulator_dashboard(summaries):
+    accumulator = ReportAccumulator()
+    for summary in summaries:
+        accumulator.add(summary)
+    return accumulator.dashboard_summary()
+
+
+def run_benchmark(commit_count: int, repeat: int):
+    report = build_report(commit_count)
+    analyses = report['detailed_analysis']
+    summaries = report['non_technical_summaries']
+    # Summaries carry the typed commit time, as generate_non_technical_summary sets it
+    for analysis, summary in zip(analyses, summaries):
+        summary['timestamp'] = analysis.date
+
+    accumulator_time, expected = time_call(lambda: accumulator_dashboard(summaries), repeat)
+    build_time, frame = time_call(lambda: CommitFrame.from_commits(analyses, summaries), repeat)
+    query_time, dashboard = time_call(frame.dashboard_summary, repeat)
+
+    print(f"Commits: {commit_count}")
+    print(f"{'path':<24}{'ms':>10}")
+    print(f"{'accumulator':<24}{accumulator_time * 1000:>10.1f}")
+    print(f"{'frame build':<24}{build_time * 1000:>10.1f}")
+    print(f"{'frame dashboard':<24}{query_time * 1000:>10.1f}")
+    print(f"{'frame total':<24}{(build_time + query_time) * 1000:>10.1f}")
+
+    if dashboard != expected:
+        print("WARNING: CommitFrame dashboard differs from ReportAccumulator")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dashboard metrics benchmark')
+    parser.add_argument('--commits', type=int, default=50000,
+                        help='Number of commits in the generated report')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement; the best time is reported')
+
+    args = parser.parse_args()
+    run_benchmark(args.commits, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
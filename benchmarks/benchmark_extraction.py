@@ -0,0 +1,89 @@
+"""
+Benchmark per-commit `git diff-tree` lookups against single-pass `git log --numstat`.
+
+Usage:
+    python benchmarks/benchmark_extraction.py /path/to/repo --timeframe month
+    python benchmarks/benchmark_extraction.py --synthetic 2000
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from agents.commit_analyzer import CommitAnalyzerAgent
+
+
+def create_synthetic_repo(path: Path, commit_count: int):
+    """Create a throwaway repository with the requested number of commits."""
+    subprocess.run(['git', 'init', '-q', str(path)], check=True)
+    env_args = ['-c', 'user.name=Benchmark', '-c', 'user.email=bench@example.com']
+    for i in range(commit_count):
+        file_path = path / f"src/module_{i % 20}.py"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'a') as f:
+            f.write(f"value_{i} = {i}\n")
+        subprocess.run(['git', '-C', str(path), 'add', '-A'], check=True)
+        subprocess.run(['git', '-C', str(path), *env_args, 'commit', '-q', '-m', f"Add value {i}"], check=True)
+
+
+def time_per_commit(agent: CommitAnalyzerAgent, timeframe: str):
+    start = time.perf_counter()
+    commits = agent._fetch_commits(timeframe)
+    analyses = [agent._analyze_commit(commit) for commit in commits]
+    return time.perf_counter() - start, analyses
+
+
+def time_bulk(agent: CommitAnalyzerAgent, timeframe: str):
+    start = time.perf_counter()
+    analyses = agent._extract_commits_bulk(timeframe)
+    return time.perf_counter() - start, analyses
+
+
+def run_benchmark(repo_path: str, timeframe: str):
+    agent = CommitAnalyzerAgent(repo_path)
+
+    per_commit_time, per_commit = time_per_commit(agent, timeframe)
+    bulk_time, bulk = time_bulk(agent, timeframe)
+
+    print(f"Repository: {repo_path}")
+    print(f"Timeframe:  {timeframe}")
+    print(f"{'mode':<12}{'commits':>10}{'seconds':>12}{'commits/s':>14}")
+    for name, elapsed, analyses in (('per_commit', per_commit_time, per_commit), ('bulk', bulk_time, bulk)):
+        rate = len(analyses) / elapsed if elapsed else 0.0
+        print(f"{name:<12}{len(analyses):>10}{elapsed:>12.3f}{rate:>14.1f}")
+
+    if bulk_time:
+        print(f"\nSpeedup: {per_commit_time / bulk_time:.1f}x")
+
+    if [a.commit_hash for a in per_commit] != [a.commit_hash for a in bulk]:
+        print("WARNING: extraction modes returned different commit sets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Commit extraction benchmark')
+    parser.add_argument('repo_path', nargs='?', help='Path to the git repository')
+    parser.add_argument('--timeframe', default='10 years ago',
+                        help='Timeframe passed to the analyzer')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='Benchmark a generated repository with this many commits')
+
+    args = parser.parse_args()
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            repo_path = Path(tmp_dir) / 'repo'
+            create_synthetic_repo(repo_path, args.synthetic)
+            run_benchmark(str(repo_path), args.timeframe)
+    elif args.repo_path:
+        run_benchmark(args.repo_path, args.timeframe)
+    else:
+        parser.error('either repo_path or --synthetic is required')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark report serialization: the former recursive `_make_serializable` +
+indented `json.dump` path against the typed encoders in storage.serialization.
+
+Usage:
+    python benchmarks/benchmark_serialization.py --commits 5000
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from agents.advanced_analyzer import AdvancedCommitAnalyzer
+from agents.base_agent import CommitAnalysis
+from storage import serialization
+
+
+def make_serializable(obj):
+    """The recursive conversion DocumentStore used before typed encoders."""
+    if isinstance(obj, dict):
+        return {k: make_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [make_serializable(item) for item in obj]
+    elif hasattr(obj, '__dict__'):
+        return make_serializable(obj.__dict__)
+    elif hasattr(obj, '_asdict'):
+        return make_serializable(obj._asdict())
+    else:
+        return obj
+
+
+def build_report(commit_count: int):
+    """Build a report shaped like CommitAnalyzerAgent.process output."""
+    analyzer = AdvancedCommitAnalyzer()
+    start = datetime(2024, 1, 1, 9, 30)
+    analyses = []
+    for i in range(commit_count):
+        files = [f"src/module_{(i + j) % 40}.py" for j in range(1 + i % 6)]
+        analyses.append(CommitAnalysis(
+            commit_hash=f"{i:040x}",
+            author=f"Developer {i % 12}",
+            date=start + timedelta(minutes=37 * i),
+            message=f"Update module {i % 40}",
+            files_changed=files,
+            insertions=10 + i % 90,
+            deletions=i % 30,
+            summary=f"Commit touching {len(files)} files",
+            category=['feature', 'bugfix', 'refactor', 'docs'][i % 4],
+            impact_score=float(i % 10),
+            risk_assessment=['low', 'medium', 'high'][i % 3],
+            file_stats={path: (10, 2) for path in files}
+        ))
+
+    return {
+        'timeframe': 'month',
+        'commits_analyzed': commit_count,
+        'report': "# Commit Analysis\n" * 50,
+        'detailed_analysis': analyses,
+        'non_technical_summaries': [analyzer.generate_non_technical_summary(a) for a in analyses],
+        'dashboard_summary': {'total_commits': commit_count}
+    }
+
+
+def time_call(func, repeat: int):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(commit_count: int, repeat: int):
+    report = build_report(commit_count)
+
+    legacy_time, legacy_payload = time_call(
+        lambda: json.dumps(make_serializable(report), indent=2, default=str).encode('utf-8'), repeat
+    )
+    typed_time, typed_payload = time_call(
+        lambda: serialization.dumps(serialization.encode_report(report)), repeat
+    )
+    legacy_load_time, _ = time_call(lambda: json.loads(legacy_payload), repeat)
+    typed_load_time, decoded = time_call(
+        lambda: serialization.decode_report(serialization.loads(typed_payload)), repeat
+    )
+
+    encoder = 'orjson' if serialization.HAS_ORJSON else 'stdlib json'
+    print(f"Commits: {commit_count}  (typed path uses {encoder})")
+    print(f"{'path':<10}{'encode s':>12}{'decode s':>12}{'bytes':>14}")
+    print(f"{'legacy':<10}{legacy_time:>12.3f}{legacy_load_time:>12.3f}{len(legacy_payload):>14,}")
+    print(f"{'typed':<10}{typed_time:>12.3f}{typed_load_time:>12.3f}{len(typed_payload):>14,}")
+    if typed_time:
+        print(f"\nEncode speedup: {legacy_time / typed_time:.1f}x")
+
+    if decoded['detailed_analysis'] != report['detailed_analysis']:
+        print("WARNING: typed round trip did not reproduce the commit analyses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report serialization benchmark')
+    parser.add_argument('--commits', type=int, default=5000,
+                        help='Number of commits in the generated report')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement; the best time is reported')
+
+    args = parser.parse_args()
+    run_benchmark(args.commits, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -89,7 +89,8 @@ function createReportCard(report) {
 // View detailed report
 async function viewReport(reportId) {
     try {
-        const response = await fetch(`/api/reports/${reportId}`);
+        // First paint only needs the summary sections
+        const response = await fetch(`/api/reports/${reportId}?fields=timeframe,commits_analyzed,dashboard_summary`);
         const report = await response.json();
         
         const reportView = document.getElementById('reportView');
@@ -102,11 +103,32 @@ async function viewReport(reportId) {
         
         // Scroll to report
         reportView.scrollIntoView({ behavior: 'smooth' });
+        
+        // Per-commit summaries for the timeline and technical tabs follow page by page
+        report.non_technical_summaries = await fetchReportSection(reportId, 'non_technical_summaries');
+        if (report.non_technical_summaries.length > 0) {
+            displayEnhancedReport(report);
+        }
     } catch (error) {
         showNotification('Error loading report: ' + error.message, 'error');
     }
 }
 
+// Load every page of a per-commit report section
+async function fetchReportSection(reportId, section, pageSize = 500) {
+    const items = [];
+    let total = null;
+    while (total === null || items.length < total) {
+        const response = await fetch(`/api/reports/${reportId}?section=${section}&offset=${items.length}&limit=${pageSize}`);
+        if (!response.ok) break;
+        const page = await response.json();
+        total = page.total;
+        if (!page.items || page.items.length === 0) break;
+        items.push(...page.items);
+    }
+    return items;
+}
+
 // Close report view
 function closeReport() {
     const reportView = document.getElementById('reportView');
@@ -9,6 +9,11 @@ from datetime import datetime
 from .base_agent import CommitAnalysis
 
 
+# Impact scores above these thresholds are described as high and medium impact
+HIGH_IMPACT_THRESHOLD = 0.7
+MEDIUM_IMPACT_THRESHOLD = 0.3
+
+
 @dataclass
 class CodeExplanation:
     file_path: str
@@ -259,9 +264,12 @@ class AdvancedCommitAnalyzer:
         if commit.files_changed:
             for i, file in enumerate(commit.files_changed):
                 if file != 'unknown':
-                    # Distribute changes evenly if we don't have specific counts per file
-                    file_insertions = commit.insertions // len(commit.files_changed) if commit.insertions else 0
-                    file_deletions = commit.deletions // len(commit.files_changed) if commit.deletions else 0
+                    if file in commit.file_stats:
+                        file_insertions, file_deletions = commit.file_stats[file]
+                    else:
+                        # Distribute changes evenly if we don't have specific counts per file
+                        file_insertions = commit.insertions // len(commit.files_changed) if commit.insertions else 0
+                        file_deletions = commit.deletions // len(commit.files_changed) if commit.deletions else 0
                     
                     explanation = self.explain_file_change(
                         file,
@@ -294,6 +302,10 @@ class AdvancedCommitAnalyzer:
             'commit_id': commit.commit_hash[:8],
             'author': commit.author,
             'date': formatted_date,
+            # Typed time for aggregation; date above is only for display
+            'timestamp': commit.date,
+            # Dashboard partials are bucketed by the date windows select on
+            'committed_at': commit.committed_at,
             'category': category,
             'category_explanation': category_explanation,
             'message': commit.message,
@@ -304,12 +316,13 @@ class AdvancedCommitAnalyzer:
             'impact_score': self._humanize_impact_score(commit.impact_score),
             'visual_changes': self._detect_visual_changes(commit),
             'insertions': commit.insertions,
-            'deletions': commit.deletions
+            'deletions': commit.deletions,
+            'omitted_files': commit.omitted_files
         }
     
     def _generate_overall_impact(self, commit: CommitAnalysis, file_explanations: List[Dict[str, Any]]) -> str:
         """Generate overall impact description."""
-        total_files = len(commit.files_changed)
+        total_files = len(commit.files_changed) + commit.omitted_files
         total_changes = commit.insertions + commit.deletions
         
         impact = f"This update modified {total_files} file{'s' if total_files != 1 else ''} "
@@ -343,9 +356,9 @@ class AdvancedCommitAnalyzer:
     
     def _humanize_impact_score(self, impact_score: float) -> str:
         """Convert impact score to human-friendly description."""
-        if impact_score > 0.7:
+        if impact_score > HIGH_IMPACT_THRESHOLD:
             return "High impact - major change to the application"
-        elif impact_score > 0.3:
+        elif impact_score > MEDIUM_IMPACT_THRESHOLD:
             return "Medium impact - noticeable change to functionality"
         else:
             return "Low impact - minor adjustment or fix"
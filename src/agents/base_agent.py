@@ -3,11 +3,12 @@ Base Agent Framework following Anthropic's Building Effective Agents patterns.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import subprocess
+import sys
 import re
 
 
@@ -25,6 +26,41 @@ class CommitAnalysis:
     category: str
     impact_score: float
     risk_assessment: str
+    file_stats: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    omitted_files: int = 0
+    # Committer date, which selects commits into time windows
+    committed_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CommitAnalysis':
+        """Rebuild an analysis from a stored record with an ISO formatted date."""
+        date = data['date']
+        if isinstance(date, str):
+            date = datetime.fromisoformat(date)
+        committed_at = data.get('committed_at')
+        if isinstance(committed_at, str):
+            committed_at = datetime.fromisoformat(committed_at)
+        # Rows whose author was lost, e.g. in legacy databases, have none
+        author = data.get('author')
+        if isinstance(author, str):
+            author = sys.intern(author)
+        
+        return cls(
+            commit_hash=data['commit_hash'],
+            author=author,
+            date=date,
+            message=data.get('message', ''),
+            files_changed=[sys.intern(path) for path in data.get('files_changed', [])],
+            insertions=data.get('insertions', 0),
+            deletions=data.get('deletions', 0),
+            summary=data.get('summary', ''),
+            category=data.get('category', 'unknown'),
+            impact_score=data.get('impact_score', 0.0),
+            risk_assessment=data.get('risk_assessment', 'unknown'),
+            file_stats={path: tuple(stats) for path, stats in data.get('file_stats', {}).items()},
+            omitted_files=data.get('omitted_files', 0),
+            committed_at=committed_at
+        )
 
 
 class AgentWorkflow(ABC):
@@ -58,10 +94,12 @@ class AgentWorkflow(ABC):
                 evaluation['feedback']
             )
             
+            # Only the size is kept; a copy of every intermediate response
+            # would multiply the memory held for large reports
             self.optimization_history.append({
                 'iteration': i + 1,
                 'evaluation': evaluation,
-                'improved_response': current_response
+                'response_length': len(current_response)
             })
         
         return current_response
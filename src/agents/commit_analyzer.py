@@ -4,13 +4,36 @@ Commit Analysis Agent implementing advanced workflow patterns.
 
 from datetime import datetime
 import subprocess
+import hashlib
 import json
 import re
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Set, Callable, Iterator
 from pathlib import Path
 from .base_agent import AgentWorkflow, CommitAnalysis
+from .git_log import iter_numstat_commits
+from .commit_index import CommitDateIndex, parse_timeframe
+from .git_object_reader import GitObjectReader
+from .parallel import WorkerPool, EXECUTOR_MODES
 from .advanced_analyzer import AdvancedCommitAnalyzer
-from .enhanced_report_generator import EnhancedReportGenerator
+from .enhanced_report_generator import EnhancedReportGenerator, ReportAccumulator, render_to_string
+
+
+# 'per_commit' looks up each commit on a persistent `git diff-tree` pipe, 'bulk' streams one `git log --numstat`
+EXTRACTION_MODES = ('per_commit', 'bulk')
+
+# Commits held in memory per pipeline stage when streaming
+DEFAULT_STREAM_BUFFER = 256
+
+# High impact commits listed in a streamed technical deep dive
+MAX_STREAMED_HIGH_IMPACT = 50
+
+# Paths kept per commit; larger commits keep counting lines but summarize the rest
+DEFAULT_MAX_FILES_PER_COMMIT = 1000
+
+# Bump whenever analysis or report output changes, so stored analyses and
+# cached results of earlier versions are not reused
+ANALYZER_VERSION = 3
 
 
 class CommitAnalyzerAgent(AgentWorkflow):
@@ -18,26 +41,71 @@ class CommitAnalyzerAgent(AgentWorkflow):
     Agent specialized in analyzing code commits with multi-step LLM workflow.
     """
     
-    def __init__(self, repo_path: str, model_name: str = "claude-3-opus-20240229"):
+    def __init__(self, repo_path: str, model_name: str = "claude-3-opus-20240229",
+                 extraction_mode: str = "per_commit", workers: int = 1, executor: str = "thread",
+                 max_files_per_commit: Optional[int] = DEFAULT_MAX_FILES_PER_COMMIT,
+                 index_dir: Optional[str] = None):
         super().__init__(model_name)
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {extraction_mode}")
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {executor}")
+        
         self.repo_path = Path(repo_path)
+        self.extraction_mode = extraction_mode
+        self.workers = max(1, workers)
+        self.executor = executor
+        # Pools live as long as the agent; extraction is git-bound and always uses threads
+        self.extraction_pool = WorkerPool(self.workers, 'thread')
+        self.summary_pool = self.extraction_pool if executor == 'thread' else WorkerPool(self.workers, executor)
+        self.max_files_per_commit = max_files_per_commit
+        self.object_reader = GitObjectReader(self.repo_path)
+        # Without an index directory timeframes are resolved by walking `git log`
+        self.commit_index = CommitDateIndex(self.repo_path, index_dir) if index_dir else None
         self.advanced_analyzer = AdvancedCommitAnalyzer()
         self.report_generator = EnhancedReportGenerator()
     
-    def process(self, timeframe: str = "week") -> Dict[str, Any]:
+    def process(self, timeframe: str = "week", known_hashes: Optional[Set[str]] = None,
+                load_known: Optional[Callable[[List[str]], Dict[str, CommitAnalysis]]] = None) -> Dict[str, Any]:
         """
         Process commits within specified timeframe.
         
         Args:
             timeframe: 'week', 'month', or specific date range
+            known_hashes: Hashes of commits that already have a stored analysis
+            load_known: Callable returning stored analyses for a list of hashes
         
         Returns:
             Comprehensive analysis report
         """
-        # Step 1: Fetch commits
-        commits = self._fetch_commits(timeframe)
+        # Steps 1 and 2: Fetch commits and analyze the ones not seen before
+        analyzed_commits = self._collect_analyses(timeframe, known_hashes, load_known)
+        
+        return self._build_report(timeframe, analyzed_commits)
+    
+    def process_records(self, records: List[Dict[str, Any]], timeframe: str = "week",
+                        known_hashes: Optional[Set[str]] = None,
+                        load_known: Optional[Callable[[List[str]], Dict[str, CommitAnalysis]]] = None) -> Dict[str, Any]:
+        """
+        Process commit records that were already extracted with numstat counts,
+        e.g. by an asynchronous `git log` reader.
         
-        if not commits:
+        Args:
+            records: Commit records in the format produced by the numstat log parser
+            timeframe: Timeframe label for the report
+            known_hashes: Hashes of commits that already have a stored analysis
+            load_known: Callable returning stored analyses for a list of hashes
+        
+        Returns:
+            Comprehensive analysis report
+        """
+        analyzed_commits = self._analyze_records(records, known_hashes, load_known, from_numstat=True)
+        
+        return self._build_report(timeframe, analyzed_commits)
+    
+    def _build_report(self, timeframe: str, analyzed_commits: List[CommitAnalysis]) -> Dict[str, Any]:
+        """Summarize analyzed commits and generate the combined report."""
+        if not analyzed_commits:
             return {
                 'timeframe': timeframe,
                 'commits_analyzed': 0,
@@ -45,28 +113,87 @@ class CommitAnalyzerAgent(AgentWorkflow):
                 'detailed_analysis': []
             }
         
-        # Step 2: Parse and analyze each commit
-        analyzed_commits = []
-        for commit in commits:
-            analysis = self._analyze_commit(commit)
-            analyzed_commits.append(analysis)
-        
         # Step 3: Generate non-technical summaries
-        non_technical_summaries = []
-        for analysis in analyzed_commits:
-            non_tech_summary = self.advanced_analyzer.generate_non_technical_summary(analysis)
-            non_technical_summaries.append(non_tech_summary)
-        
-        # Step 4: Generate comprehensive reports
-        dashboard_summary = self.report_generator.generate_dashboard_summary(non_technical_summaries)
-        executive_summary = self.report_generator.generate_executive_summary(dashboard_summary, non_technical_summaries)
-        timeline_report = self.report_generator.generate_commit_timeline(non_technical_summaries)
-        technical_report = self.report_generator.generate_technical_deep_dive(non_technical_summaries)
+        non_technical_summaries = self._summarize_commits(analyzed_commits)
         
-        # Combine all reports
-        full_report = f"{executive_summary}\n\n{timeline_report}\n\n{technical_report}"
+        # Step 4: Generate comprehensive reports in one pass over the summaries,
+        # written in chunks and joined once
+        accumulator = self.report_generator.prepare_report(non_technical_summaries, analyzed_commits)
+        dashboard_summary = accumulator.dashboard_summary()
+        full_report = render_to_string(self.report_generator.write_report, dashboard_summary, accumulator)
         
         # Step 5: Optimize report using evaluator-optimizer pattern
+        final_report = self._optimize_report(full_report)
+        
+        return {
+            'timeframe': timeframe,
+            'commits_analyzed': len(analyzed_commits),
+            'report': final_report,
+            'detailed_analysis': analyzed_commits,
+            'dashboard_summary': dashboard_summary,
+            'dashboard_partials': accumulator.daily,
+            'non_technical_summaries': non_technical_summaries
+        }
+    
+    def process_stream(self, timeframe: str = "week",
+                       sink: Optional[Callable[[List[CommitAnalysis]], None]] = None,
+                       known_hashes: Optional[Set[str]] = None,
+                       load_known: Optional[Callable[[List[str]], Dict[str, CommitAnalysis]]] = None,
+                       buffer_size: int = DEFAULT_STREAM_BUFFER) -> Dict[str, Any]:
+        """
+        Process commits as a bounded-memory stream.
+        
+        Fetching, analysis and summarization run batch by batch, report
+        statistics are folded into a ReportAccumulator, and each batch of
+        analyses is handed to sink (e.g. storage) instead of being kept.
+        Memory therefore stays flat regardless of the number of commits.
+        The returned report omits the per-commit timeline and lists.
+        
+        Args:
+            timeframe: 'week', 'month', or specific date range
+            sink: Called with every batch of commit analyses
+            known_hashes: Hashes of commits that already have a stored analysis
+            load_known: Callable returning stored analyses for a list of hashes
+            buffer_size: Maximum number of commits held per pipeline stage
+        
+        Returns:
+            Analysis report without per-commit detail
+        """
+        accumulator = ReportAccumulator(max_high_impact=MAX_STREAMED_HIGH_IMPACT)
+        
+        for batch in self._iter_analysis_batches(timeframe, known_hashes, load_known, buffer_size):
+            for summary in self._summarize_commits(batch):
+                accumulator.add(summary)
+            
+            if sink is not None:
+                sink(batch)
+        
+        if not accumulator.total_commits:
+            return {
+                'timeframe': timeframe,
+                'commits_analyzed': 0,
+                'report': "No commits found in the specified timeframe.",
+                'detailed_analysis': []
+            }
+        
+        dashboard_summary = accumulator.dashboard_summary()
+        full_report = render_to_string(self.report_generator.write_report, dashboard_summary, accumulator)
+        
+        final_report = self._optimize_report(full_report)
+        
+        return {
+            'timeframe': timeframe,
+            'commits_analyzed': accumulator.total_commits,
+            'report': final_report,
+            'detailed_analysis': [],
+            'dashboard_summary': dashboard_summary,
+            'dashboard_partials': accumulator.daily,
+            'non_technical_summaries': [],
+            'streamed': True
+        }
+    
+    def _optimize_report(self, full_report: str) -> str:
+        """Refine the combined report with the evaluator-optimizer pattern."""
         criteria = {
             'clarity': 'Is the report clear and well-structured?',
             'completeness': 'Does the report cover all important aspects?',
@@ -75,47 +202,122 @@ class CommitAnalyzerAgent(AgentWorkflow):
             'non_technical': 'Is the report understandable for non-technical users?'
         }
         
-        final_report = self.evaluator_optimizer_flow(full_report, criteria)
+        return self.evaluator_optimizer_flow(full_report, criteria)
+    
+    def _iter_analysis_batches(self, timeframe: str, known_hashes: Optional[Set[str]],
+                               load_known: Optional[Callable[[List[str]], Dict[str, CommitAnalysis]]],
+                               buffer_size: int) -> Iterator[List[CommitAnalysis]]:
+        """Yield commit analyses in bounded batches, in git log order."""
+        bulk = self.extraction_mode == "bulk"
+        records = self._iter_window_records(timeframe, with_numstat=bulk)
         
+        while True:
+            chunk = list(islice(records, buffer_size))
+            if not chunk:
+                break
+            
+            yield self._analyze_records(chunk, known_hashes, load_known, from_numstat=bulk)
+    
+    def _analyze_records(self, records: List[Dict[str, Any]], known_hashes: Optional[Set[str]],
+                         load_known: Optional[Callable[[List[str]], Dict[str, CommitAnalysis]]],
+                         from_numstat: bool) -> List[CommitAnalysis]:
+        """
+        Analyze log records in order, rehydrating known commits.
+        
+        Records carrying numstat counts are analyzed directly; metadata-only
+        records go through the per-commit `git diff-tree` path.
+        """
+        known = {}
+        if known_hashes and load_known is not None:
+            known = load_known([commit['hash'] for commit in records if commit['hash'] in known_hashes])
+        new_commits = [commit for commit in records if commit['hash'] not in known]
+        
+        if from_numstat:
+            fresh = [self._build_analysis_from_record(commit) for commit in new_commits]
+        else:
+            fresh = self._analyze_commits(new_commits)
+        fresh_by_hash = {analysis.commit_hash: analysis for analysis in fresh}
+        
+        return [known.get(commit['hash']) or fresh_by_hash[commit['hash']] for commit in records]
+    
+    def close(self):
+        """Release the worker pools and the persistent git object reader."""
+        # Forked workers inherit the reader's pipes, so they exit first
+        self.extraction_pool.close()
+        self.summary_pool.close()
+        self.object_reader.close()
+    
+    def _resolve_window(self, timeframe: str) -> Tuple[Optional[str], Optional[str]]:
+        """Translate a timeframe into `git log` since/until values."""
+        return parse_timeframe(timeframe)
+    
+    def _window_hashes(self, timeframe: str) -> Optional[List[str]]:
+        """
+        Look up the commits in a timeframe from the commit-date index.
+        
+        Returns None when no index is configured or it cannot be updated,
+        in which case callers fall back to walking `git log`.
+        """
+        if self.commit_index is None:
+            return None
+        
+        try:
+            return self.commit_index.commits_in_range(*self._resolve_window(timeframe))
+        except subprocess.CalledProcessError as e:
+            print(f"Commit index unavailable, walking git log instead: {e}")
+            return None
+    
+    @property
+    def analysis_settings(self) -> str:
+        """Analyzer version and settings that determine a commit's analysis."""
+        # The two extraction modes read counts from different git commands, so
+        # analyses are only reused by the mode that made them
+        return f"v{ANALYZER_VERSION};mode={self.extraction_mode};max_files={self.max_files_per_commit or 0}"
+    
+    def window_fingerprint(self, timeframe: str) -> Optional[Dict[str, Any]]:
+        """
+        Identify everything a run over a timeframe depends on.
+        
+        Relative windows resolve to new boundaries on every call, so the
+        window is identified by the commits it selects rather than by its
+        raw timestamps.
+        
+        Returns:
+            HEAD and a digest of the window's commits, analyzer version and
+            settings; None when no commit index is available
+        """
+        commit_hashes = self._window_hashes(timeframe)
+        if commit_hashes is None:
+            return None
+        
+        window = hashlib.sha1('\n'.join(commit_hashes).encode('ascii')).hexdigest()
         return {
-            'timeframe': timeframe,
-            'commits_analyzed': len(analyzed_commits),
-            'report': final_report,
-            'detailed_analysis': analyzed_commits,
-            'dashboard_summary': dashboard_summary,
-            'non_technical_summaries': non_technical_summaries
+            'head': self.commit_index.indexed_head(),
+            'window': window,
+            'commit_count': len(commit_hashes),
+            'analyzer_version': ANALYZER_VERSION,
+            'model': self.model_name,
+            'extraction_mode': self.extraction_mode,
+            'max_files_per_commit': self.max_files_per_commit
         }
     
+    def _iter_window_records(self, timeframe: str, with_numstat: bool,
+                             commit_hashes: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream log records for a timeframe, or for commit_hashes when given."""
+        if commit_hashes is None:
+            commit_hashes = self._window_hashes(timeframe)
+        if commit_hashes is not None:
+            return iter_numstat_commits(self.repo_path, commit_hashes=commit_hashes, with_numstat=with_numstat,
+                                        max_files=self.max_files_per_commit)
+        
+        since, until = self._resolve_window(timeframe)
+        return iter_numstat_commits(self.repo_path, since, with_numstat=with_numstat,
+                                    max_files=self.max_files_per_commit, until=until)
+    
     def _fetch_commits(self, timeframe: str) -> List[Dict[str, Any]]:
         """Fetch commits from git repository."""
         try:
-            if timeframe == "week":
-                since_date = "1 week ago"
-            elif timeframe == "month":
-                since_date = "1 month ago"
-            else:
-                since_date = timeframe
-            
-            cmd = f"git -C {self.repo_path} log --since='{since_date}' --format='%H|||%an|||%ad|||%s'"
-            output = subprocess.check_output(cmd, shell=True).decode('utf-8').strip()
-            
-            # Check if output is empty
-            if not output:
-                return []
-            
-            commits = []
-            for line in output.split('\n'):
-                if line:
-                    parts = line.split('|||')
-                    if len(parts) >= 4:  # Ensure we have all expected parts
-                        commits.append({
-                            'hash': parts[0],
-                            'author': parts[1],
-                            'date': parts[2],
-                            'message': parts[3]
-                        })
-            
-            return commits
+            return list(self._iter_window_records(timeframe, with_numstat=False))
         except subprocess.CalledProcessError as e:
             print(f"Git command failed: {e}")
             return []
@@ -123,87 +325,159 @@ class CommitAnalyzerAgent(AgentWorkflow):
             print(f"Error fetching commits: {e}")
             return []
     
+    def _collect_analyses(self, timeframe: str, known_hashes: Optional[Set[str]] = None,
+                          load_known: Optional[Callable[[List[str]], Dict[str, CommitAnalysis]]] = None) -> List[CommitAnalysis]:
+        """
+        Fetch and analyze the commits in a timeframe.
+        
+        Commits listed in known_hashes are not analyzed again; their stored
+        analyses are rehydrated through load_known instead.
+        """
+        if not known_hashes or load_known is None:
+            if self.extraction_mode == "bulk":
+                return self._extract_commits_bulk(timeframe)
+            
+            return self._analyze_commits(self._fetch_commits(timeframe))
+        
+        commits = self._fetch_commits(timeframe)
+        new_commits = [commit for commit in commits if commit['hash'] not in known_hashes]
+        known = load_known([commit['hash'] for commit in commits if commit['hash'] in known_hashes])
+        
+        if self.extraction_mode == "bulk":
+            new_hashes = [commit['hash'] for commit in new_commits]
+            fresh = {a.commit_hash: a for a in self._extract_commits_bulk(timeframe, commit_hashes=new_hashes)}
+        else:
+            fresh = {a.commit_hash: a for a in self._analyze_commits(new_commits)}
+        
+        # Keep git log order, analyzing any commit whose stored row has gone missing
+        analyzed_commits = []
+        for commit in commits:
+            analysis = fresh.get(commit['hash']) or known.get(commit['hash'])
+            if analysis is None:
+                analysis = self._analyze_commit(commit)
+            analyzed_commits.append(analysis)
+        return analyzed_commits
+    
+    def _analyze_commits(self, commits: List[Dict[str, Any]]) -> List[CommitAnalysis]:
+        """
+        Analyze commits on a thread pool, since the work is dominated by git.
+        
+        Results keep the input order and a failing commit is replaced by a
+        placeholder analysis instead of aborting the batch.
+        """
+        return self.extraction_pool.map_ordered(self._analyze_commit, commits,
+                                                on_error=self._handle_analysis_error)
+    
+    def _summarize_commits(self, analyzed_commits: List[CommitAnalysis]) -> List[Dict[str, Any]]:
+        """Generate non-technical summaries using the configured executor."""
+        return self.summary_pool.map_ordered(self.advanced_analyzer.generate_non_technical_summary,
+                                             analyzed_commits, on_error=self._handle_summary_error)
+    
+    def _handle_analysis_error(self, commit: Dict[str, Any], error: Exception) -> CommitAnalysis:
+        print(f"Error analyzing commit {commit.get('hash')}: {error}")
+        return self._unanalyzed_commit(commit)
+    
+    def _handle_summary_error(self, analysis: CommitAnalysis, error: Exception) -> Dict[str, Any]:
+        print(f"Error summarizing commit {analysis.commit_hash}: {error}")
+        return self.advanced_analyzer.generate_non_technical_summary(self._unanalyzed_commit({
+            'hash': analysis.commit_hash,
+            'author': analysis.author,
+            'message': analysis.message
+        }))
+    
+    def _unanalyzed_commit(self, commit: Dict[str, Any]) -> CommitAnalysis:
+        """Placeholder analysis for a commit that could not be analyzed."""
+        return CommitAnalysis(
+            commit_hash=commit['hash'],
+            author=commit['author'],
+            date=datetime.now(),
+            message=commit['message'],
+            files_changed=[],
+            insertions=0,
+            deletions=0,
+            summary="Unable to analyze commit",
+            category="unknown",
+            impact_score=0.0,
+            risk_assessment="unknown"
+        )
+    
+    def _extract_commits_bulk(self, timeframe: str, commit_hashes: Optional[List[str]] = None) -> List[CommitAnalysis]:
+        """
+        Extract and analyze commits from a single streamed `git log --numstat`.
+        
+        Avoids a lookup per commit; file lists and exact line
+        counts come straight from the numstat records. When commit_hashes
+        is given only those commits are extracted.
+        """
+        try:
+            analyzed_commits = []
+            for commit in self._iter_window_records(timeframe, True, commit_hashes):
+                analyzed_commits.append(self._build_analysis_from_record(commit))
+            return analyzed_commits
+        except subprocess.CalledProcessError as e:
+            print(f"Git command failed: {e}")
+            return []
+    
+    def _build_analysis_from_record(self, commit: Dict[str, Any]) -> CommitAnalysis:
+        """Analyze a commit record produced by the numstat log parser."""
+        return self._build_analysis(
+            commit,
+            commit['files_changed'],
+            commit['insertions'],
+            commit['deletions'],
+            raw_output='',
+            file_stats=commit['file_stats'],
+            omitted_files=commit['omitted_files']
+        )
+    
     def _analyze_commit(self, commit: Dict[str, Any]) -> CommitAnalysis:
-        """Analyze a single commit."""
+        """
+        Analyze a single commit.
+        
+        Line counts come from the reader's long-lived `git diff-tree` pipe,
+        so no process is started per commit; at most max_files_per_commit
+        paths are kept and further files are only counted.
+        """
         try:
-            cmd = f"git -C {self.repo_path} show --stat {commit['hash']}"
-            output = subprocess.check_output(cmd, shell=True).decode('utf-8', errors='ignore')
-            
-            # Parse file changes and stats
-            files_changed = []
-            insertions = 0
-            deletions = 0
-            
-            lines = output.strip().split('\n')
-            for line in lines:
-                # Skip empty lines
-                if not line.strip():
-                    continue
-                    
-                # File changes line pattern
-                if '|' in line and (' +' in line or ' -' in line):
-                    try:
-                        parts = line.split('|')
-                        if len(parts) >= 2:
-                            file_path = parts[0].strip()
-                            files_changed.append(file_path)
-                            
-                            # Extract insertions/deletions
-                            stats = parts[1].strip()
-                            plus_count = stats.count('+')
-                            minus_count = stats.count('-')
-                            insertions += plus_count
-                            deletions += minus_count
-                    except Exception as e:
-                        print(f"Error parsing line: {line}, error: {e}")
-                        continue
-            
-            # Sometimes git show doesn't have file stats, try a different format
-            if not files_changed:
-                try:
-                    cmd = f"git -C {self.repo_path} diff-tree --no-commit-id --name-only -r {commit['hash']}"
-                    diff_output = subprocess.check_output(cmd, shell=True).decode('utf-8', errors='ignore')
-                    files_changed = [f.strip() for f in diff_output.strip().split('\n') if f.strip()]
-                except:
-                    files_changed = ['unknown']
-            
-            # Use LLM patterns for advanced analysis
-            classification = self.classify_and_route(commit)
-            
-            # Generate summary and analysis
-            summary = self._generate_commit_summary(commit, files_changed, output)
-            impact_score = self._calculate_impact_score(insertions, deletions, len(files_changed))
-            risk_assessment = self._assess_risk(commit, files_changed)
-            
-            return CommitAnalysis(
-                commit_hash=commit['hash'],
-                author=commit['author'],
-                date=self._parse_date(commit['date']),
-                message=commit['message'],
-                files_changed=files_changed,
-                insertions=insertions,
-                deletions=deletions,
-                summary=summary,
-                category=classification,
-                impact_score=impact_score,
-                risk_assessment=risk_assessment
-            )
-        except subprocess.CalledProcessError:
-            return CommitAnalysis(
-                commit_hash=commit['hash'],
-                author=commit['author'],
-                date=datetime.now(),
-                message=commit['message'],
-                files_changed=[],
-                insertions=0,
-                deletions=0,
-                summary="Unable to analyze commit",
-                category="unknown",
-                impact_score=0.0,
-                risk_assessment="unknown"
-            )
-    
-    def _generate_commit_summary(self, commit: Dict[str, Any], files_changed: List[str], raw_output: str) -> str:
+            stats = self.object_reader.commit_numstat(commit['hash'], self.max_files_per_commit)
+        except (subprocess.CalledProcessError, EOFError, OSError):
+            return self._unanalyzed_commit(commit)
+        
+        return self._build_analysis(commit, stats['files_changed'], stats['insertions'], stats['deletions'], '',
+                                    file_stats=stats['file_stats'], omitted_files=stats['omitted_files'])
+    
+    def _build_analysis(self, commit: Dict[str, Any], files_changed: List[str], insertions: int,
+                        deletions: int, raw_output: str,
+                        file_stats: Optional[Dict[str, Tuple[int, int]]] = None,
+                        omitted_files: int = 0) -> CommitAnalysis:
+        """Apply classification, summary, impact and risk heuristics to extracted commit data."""
+        # Use LLM patterns for advanced analysis
+        classification = self.classify_and_route(commit)
+        
+        # Generate summary and analysis
+        summary = self._generate_commit_summary(commit, files_changed, raw_output, omitted_files)
+        impact_score = self._calculate_impact_score(insertions, deletions, len(files_changed) + omitted_files)
+        risk_assessment = self._assess_risk(commit, files_changed)
+        
+        return CommitAnalysis(
+            commit_hash=commit['hash'],
+            author=commit['author'],
+            date=self._parse_date(commit['date']),
+            message=commit['message'],
+            files_changed=files_changed,
+            insertions=insertions,
+            deletions=deletions,
+            summary=summary,
+            category=classification,
+            impact_score=impact_score,
+            risk_assessment=risk_assessment,
+            file_stats=file_stats or {},
+            omitted_files=omitted_files,
+            committed_at=self._parse_date(commit['committer_date']) if commit.get('committer_date') else None
+        )
+    
+    def _generate_commit_summary(self, commit: Dict[str, Any], files_changed: List[str], raw_output: str,
+                                 omitted_files: int = 0) -> str:
         """Generate a natural language summary of the commit."""
         # In real implementation, this would use an LLM
         if not files_changed or files_changed == ['unknown']:
@@ -212,7 +486,10 @@ class CommitAnalyzerAgent(AgentWorkflow):
         file_types = self._classify_file_types(files_changed)
         dominant_type = max(file_types, key=file_types.get) if file_types else "general"
         
-        return f"This commit modifies {len(files_changed)} files, primarily affecting {dominant_type} components. The changes appear to {commit.get('message', 'perform unspecified modifications').lower()}."
+        summary = f"This commit modifies {len(files_changed) + omitted_files} files, primarily affecting {dominant_type} components. The changes appear to {commit.get('message', 'perform unspecified modifications').lower()}."
+        if omitted_files:
+            summary += f" Only the first {len(files_changed)} files were inspected; {omitted_files} more files were not listed."
+        return summary
     
     def _classify_file_types(self, files: List[str]) -> Dict[str, int]:
         """Classify files by type."""
@@ -0,0 +1,94 @@
+"""
+Batched CPU embeddings of commit messages and summaries.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from .base_agent import CommitAnalysis
+
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Texts per encode call; large batches keep the CPU busy between Python calls
+DEFAULT_EMBEDDING_BATCH = 256
+
+
+class CommitEmbedder:
+    """
+    Embeds commits with a local sentence-transformers model.
+
+    The model is only imported and loaded when the first commit needs
+    embedding. Embeddings are stored per model version, keyed by commit
+    hash, so a commit is embedded once per model across all runs.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = DEFAULT_EMBEDDING_BATCH,
+                 model_version: Optional[str] = None):
+        """
+        Args:
+            model_name: Model name or path to a locally stored model
+            batch_size: Texts encoded per call
+            model_version: Cache namespace; defaults to the model name, so
+                set it when a local model is updated in place
+        """
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.model_version = model_version or model_name
+        self._model = None
+
+    @property
+    def namespace(self) -> str:
+        """Filesystem-safe name of the embedding cache for this model version."""
+        return re.sub(r'[^A-Za-z0-9_.-]+', '_', self.model_version).strip('_.') or 'default'
+
+    def _load_model(self):
+        if self._model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+            except ImportError as e:
+                raise ImportError("Commit embeddings require the sentence-transformers package") from e
+            self._model = SentenceTransformer(self.model_name, device='cpu')
+        return self._model
+
+    def commit_text(self, analysis: CommitAnalysis) -> str:
+        """Text embedded for a commit: its message followed by the analysis summary."""
+        return f"{analysis.message}\n{analysis.summary}".strip()
+
+    def embed(self, analyses: List[CommitAnalysis], store: Any) -> Dict[str, Any]:
+        """
+        Embed commits that are not cached yet and append them to store.
+
+        Args:
+            analyses: Commit analyses to embed
+            store: Vector store for this model version (see namespace)
+
+        Returns:
+            Counts of embedded and cached commits, elapsed seconds and
+            embeddings per second
+        """
+        pending = {}
+        for analysis in analyses:
+            if analysis.commit_hash not in store:
+                pending[analysis.commit_hash] = analysis
+        cached = len(analyses) - len(pending)
+
+        start = time.perf_counter()
+        if pending:
+            model = self._load_model()
+            hashes = list(pending)
+            for offset in range(0, len(hashes), self.batch_size):
+                batch = hashes[offset:offset + self.batch_size]
+                vectors = model.encode([self.commit_text(pending[commit_hash]) for commit_hash in batch],
+                                       batch_size=self.batch_size, convert_to_numpy=True,
+                                       show_progress_bar=False)
+                store.add_many(batch, vectors)
+        elapsed = time.perf_counter() - start
+
+        return {
+            'embedded': len(pending),
+            'cached': cached,
+            'seconds': elapsed,
+            'per_second': len(pending) / elapsed if elapsed else 0.0
+        }
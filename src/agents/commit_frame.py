@@ -0,0 +1,166 @@
+"""
+Columnar view of summarized commits for vectorized dashboard metrics.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .advanced_analyzer import HIGH_IMPACT_THRESHOLD, MEDIUM_IMPACT_THRESHOLD
+from .base_agent import CommitAnalysis
+from .enhanced_report_generator import DashboardPartial, commit_day, commit_timestamp
+
+
+# Day numbers below count days since the Unix epoch
+EPOCH = date(1970, 1, 1)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_SECOND = timedelta(seconds=1)
+
+
+def wall_clock_seconds(summary: Dict[str, Any]) -> int:
+    """
+    Seconds since the epoch of commit_timestamp(summary), as an integer.
+
+    Typed timestamps are converted with integer arithmetic, which is much
+    cheaper than building naive datetimes and converting those.
+    """
+    timestamp = summary.get('timestamp')
+    if not isinstance(timestamp, datetime):
+        return (commit_timestamp(summary) - NAIVE_EPOCH) // ONE_SECOND
+    return _wall_clock_seconds(timestamp)
+
+
+def commit_day_number(summary: Dict[str, Any]) -> int:
+    """Day number of commit_day(summary), the day dashboard partials bucket it under."""
+    committed_at = summary.get('committed_at')
+    if isinstance(committed_at, datetime):
+        return _wall_clock_seconds(committed_at) // 86400
+    return (commit_day(summary) - EPOCH).days
+
+
+def _wall_clock_seconds(timestamp: datetime) -> int:
+    offset = timestamp.utcoffset()
+    if offset is None:
+        seconds = (timestamp - NAIVE_EPOCH) // ONE_SECOND
+    else:
+        # Shift UTC by the commit's own offset to get its wall-clock time
+        seconds = (timestamp - UTC_EPOCH) // ONE_SECOND + offset // ONE_SECOND
+    # Reports resolve commit times to the minute
+    return seconds - seconds % 60
+
+
+class CommitFrame:
+    """
+    Summarized commits held as a pandas DataFrame with one row per commit.
+
+    Columns are typed for vectorized group-bys: numeric impact scores,
+    categorical author, category and risk columns whose categories are in
+    order of first appearance, int64 wall-clock author timestamps in seconds
+    and the int64 day number each commit's dashboard partial is for.
+    Results match ReportAccumulator, including how ties are broken.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+
+    @classmethod
+    def from_commits(cls, analyses: List[CommitAnalysis], summaries: List[Dict[str, Any]]) -> 'CommitFrame':
+        """
+        Build the frame from analyses and their non-technical summaries.
+
+        Args:
+            analyses: Commit analyses, providing numeric impact and risk
+            summaries: Summaries of the same commits in the same order
+        """
+        import pandas as pd
+
+        if len(analyses) != len(summaries):
+            raise ValueError("analyses and summaries must have the same length")
+
+        def categorical(values: List[Any]):
+            return pd.Categorical(values, categories=pd.unique(pd.Series(values, dtype=object)))
+
+        # The extraction pass is the only Python-level loop over commits
+        timestamps = np.fromiter(map(wall_clock_seconds, summaries), dtype=np.int64, count=len(summaries))
+        frame = pd.DataFrame({
+            'author': categorical([summary['author'] for summary in summaries]),
+            'category': categorical([summary['category'] for summary in summaries]),
+            'risk': categorical([analysis.risk_assessment for analysis in analyses]),
+            'impact_score': np.fromiter((analysis.impact_score for analysis in analyses),
+                                        dtype=np.float64, count=len(analyses)),
+            'visual_changes': np.fromiter((bool(summary.get('visual_changes', False)) for summary in summaries),
+                                          dtype=bool, count=len(summaries)),
+            'timestamp': timestamps,
+            'day': np.fromiter(map(commit_day_number, summaries), dtype=np.int64, count=len(summaries))
+        })
+        return cls(frame)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def impact_levels(self):
+        """Impact level per commit, using the thresholds of the humanized descriptions."""
+        scores = self.frame['impact_score'].to_numpy()
+        return np.where(scores > HIGH_IMPACT_THRESHOLD, 'high',
+                        np.where(scores > MEDIUM_IMPACT_THRESHOLD, 'medium', 'low'))
+
+    def daily_partials(self) -> Dict[date, DashboardPartial]:
+        """
+        One DashboardPartial per day, the same as ReportAccumulator.daily.
+
+        Every tally comes from a group-by over the whole frame; Python only
+        loops over the grouped results.
+        """
+        frame = self.frame.assign(
+            level=self.impact_levels(),
+            high_risk=(self.frame['risk'] == 'high').to_numpy()
+        )
+        partials: Dict[date, DashboardPartial] = {}
+        if not len(frame):
+            return partials
+
+        per_day = frame.groupby('day', sort=True).agg(
+            commits=('timestamp', 'size'),
+            earliest=('timestamp', 'min'),
+            latest=('timestamp', 'max'),
+            high_risk=('high_risk', 'sum'),
+            visual=('visual_changes', 'sum')
+        )
+        for day, row in zip(per_day.index, per_day.itertuples(index=False)):
+            partial = partials[day] = DashboardPartial()
+            partial.total_commits = int(row.commits)
+            partial.earliest_date = NAIVE_EPOCH + timedelta(seconds=int(row.earliest))
+            partial.latest_date = NAIVE_EPOCH + timedelta(seconds=int(row.latest))
+            partial.high_risk_commits = int(row.high_risk)
+            partial.visual_changes_count = int(row.visual)
+
+        for (day, author), count in frame.groupby(['day', 'author'], sort=False, observed=True).size().items():
+            partials[day].authors[author] = int(count)
+        for (day, category), count in frame.groupby(['day', 'category'], sort=False, observed=True).size().items():
+            partials[day].categories[category] = int(count)
+        for (day, level), count in frame.groupby(['day', 'level'], sort=False).size().items():
+            partials[day].impact_distribution[level] = int(count)
+
+        daily = {}
+        for day, partial in partials.items():
+            commit_day = EPOCH + timedelta(days=int(day))
+            # Each partial covers exactly one day, so that day's buckets are its categories
+            partial.days[commit_day] = defaultdict(int, partial.categories)
+            daily[commit_day] = partial
+        return daily
+
+    def timeline(self, summaries: List[Dict[str, Any]]) -> Dict[date, List[Dict[str, Any]]]:
+        """Group the summaries the frame was built from by author day, keeping their order."""
+        # Like ReportAccumulator, the timeline follows the author date
+        author_days = self.frame['timestamp'].to_numpy() // 86400
+        return {
+            EPOCH + timedelta(days=int(day)): [summaries[position] for position in positions]
+            for day, positions in self.frame.groupby(author_days, sort=False).indices.items()
+        }
+
+    def dashboard_summary(self) -> Dict[str, Any]:
+        """Build the same dashboard summary as ReportAccumulator.dashboard_summary."""
+        return DashboardPartial.merged(self.daily_partials().values()).summary()
@@ -0,0 +1,252 @@
+"""
+On-disk index from commit timestamps to hashes for fast date-range queries.
+"""
+
+import hashlib
+import sqlite3
+import subprocess
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+
+# Range of UTC offsets a commit's local date can be in, in seconds
+MIN_UTC_OFFSET = -12 * 3600
+MAX_UTC_OFFSET = 14 * 3600
+
+
+def parse_timeframe(timeframe: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Split a timeframe into `git log` since/until values.
+
+    Accepts 'week', 'month', an explicit 'SINCE..UNTIL' range (either side
+    may be empty) or any other date expression understood by git.
+    """
+    if timeframe == "week":
+        return "1 week ago", None
+    elif timeframe == "month":
+        return "1 month ago", None
+    elif '..' in timeframe:
+        since, until = timeframe.split('..', 1)
+        return since.strip() or None, until.strip() or None
+    return timeframe, None
+
+
+def format_timeframe(since: Optional[str] = None, until: Optional[str] = None,
+                     default: str = "week") -> str:
+    """Build a 'SINCE..UNTIL' timeframe from explicit bounds, or return default."""
+    if not since and not until:
+        return default
+    return f"{since or ''}..{until or ''}"
+
+
+def resolve_dates(repo_path: Union[str, Path], since: Optional[str],
+                  until: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Resolve since/until expressions to Unix timestamps with git's own date parser.
+
+    `git rev-parse --since/--until` prints the equivalent --max-age/--min-age
+    values, so relative dates behave exactly as they do for `git log`.
+    """
+    args = []
+    if since:
+        args.append(f'--since={since}')
+    if until:
+        args.append(f'--until={until}')
+    if not args:
+        return None, None
+
+    output = subprocess.check_output(
+        ['git', '-C', str(repo_path), 'rev-parse', *args],
+        stderr=subprocess.DEVNULL
+    ).decode('utf-8')
+
+    since_ts = until_ts = None
+    for line in output.split():
+        if line.startswith('--max-age='):
+            since_ts = int(line.split('=', 1)[1])
+        elif line.startswith('--min-age='):
+            until_ts = int(line.split('=', 1)[1])
+    return since_ts, until_ts
+
+
+def complete_days(since_ts: Optional[int], until_ts: Optional[int]) -> Tuple[Optional[date], Optional[date]]:
+    """
+    First and last commit-local day wholly inside a resolved window.
+
+    Commits are bucketed by their committer's local date, and windows
+    select them by committer time, so a day counts as complete only if it
+    lies inside the window in every UTC offset. Returns None
+    for the first day when the window has no start; the last day is
+    before the first when no day is complete.
+    """
+    first = None
+    if since_ts is not None:
+        # Earliest instant of a local day is its midnight at the largest offset
+        first = datetime.fromtimestamp(since_ts + MAX_UTC_OFFSET, timezone.utc).date()
+        if datetime(first.year, first.month, first.day, tzinfo=timezone.utc).timestamp() - MAX_UTC_OFFSET < since_ts:
+            first += timedelta(days=1)
+
+    if until_ts is None:
+        until_ts = int(datetime.now(timezone.utc).timestamp())
+    # Latest instant of a local day is its end at the smallest offset
+    last = datetime.fromtimestamp(until_ts + MIN_UTC_OFFSET, timezone.utc).date() - timedelta(days=1)
+    return first, last
+
+
+class CommitDateIndex:
+    """
+    Per-repository SQLite index of commit timestamps reachable from HEAD.
+
+    The index is brought up to date from the last indexed HEAD, so only new
+    commits are read from git; a rewritten history triggers a rebuild.
+    Range queries then return exactly the commits inside the window
+    without walking the rest of the history.
+    """
+
+    def __init__(self, repo_path: Union[str, Path], index_dir: Union[str, Path]):
+        self.repo_path = Path(repo_path)
+        repo_key = hashlib.sha1(str(self.repo_path.resolve()).encode('utf-8')).hexdigest()[:16]
+
+        index_dir = Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = index_dir / f"commits_{repo_key}.sqlite"
+        self._init_database()
+
+    def _init_database(self):
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS commits (
+                commit_hash TEXT PRIMARY KEY,
+                committed_at INTEGER NOT NULL,
+                position INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_committed_at ON commits (committed_at)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS index_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+
+        conn.commit()
+        conn.close()
+
+    def _git(self, *args: str) -> str:
+        return subprocess.check_output(
+            ['git', '-C', str(self.repo_path), *args],
+            stderr=subprocess.DEVNULL
+        ).decode('utf-8').strip()
+
+    def _is_ancestor(self, old_head: str, new_head: str) -> bool:
+        result = subprocess.run(
+            ['git', '-C', str(self.repo_path), 'merge-base', '--is-ancestor', old_head, new_head],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return result.returncode == 0
+
+    def update(self) -> int:
+        """
+        Index commits added since the last indexed HEAD.
+
+        Returns:
+            Number of commits added to the index
+        """
+        head = self._git('rev-parse', 'HEAD')
+
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM index_state WHERE key = 'head'")
+        row = cursor.fetchone()
+        indexed_head = row[0] if row else None
+
+        if indexed_head == head:
+            conn.close()
+            return 0
+
+        revisions = [head]
+        if indexed_head and self._is_ancestor(indexed_head, head):
+            revisions.append(f'^{indexed_head}')
+        else:
+            # First run or rewritten history: rebuild from scratch
+            cursor.execute("DELETE FROM commits")
+
+        # Positions grow towards HEAD so queries can return `git log` order
+        cursor.execute("SELECT COALESCE(MAX(position), 0) FROM commits")
+        position = cursor.fetchone()[0]
+
+        process = subprocess.Popen(
+            ['git', '-C', str(self.repo_path), 'log', '--reverse', '--format=%H %ct', *revisions],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+        added = 0
+        batch = []
+        for raw in process.stdout:
+            commit_hash, _, committed_at = raw.decode('ascii').strip().partition(' ')
+            position += 1
+            batch.append((commit_hash, int(committed_at), position))
+            if len(batch) >= 5000:
+                cursor.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?)", batch)
+                added += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany("INSERT OR REPLACE INTO commits VALUES (?, ?, ?)", batch)
+            added += len(batch)
+
+        process.stdout.close()
+        if process.wait() != 0:
+            conn.rollback()
+            conn.close()
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+
+        cursor.execute("INSERT OR REPLACE INTO index_state (key, value) VALUES ('head', ?)", (head,))
+        conn.commit()
+        conn.close()
+
+        return added
+
+    def indexed_head(self) -> Optional[str]:
+        """HEAD as of the last update, or None before the first one."""
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM index_state WHERE key = 'head'")
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def query(self, since_ts: Optional[int] = None, until_ts: Optional[int] = None) -> List[str]:
+        """Return hashes of indexed commits in [since_ts, until_ts], in `git log` order."""
+        conditions = []
+        params = []
+        if since_ts is not None:
+            conditions.append("committed_at >= ?")
+            params.append(since_ts)
+        if until_ts is not None:
+            conditions.append("committed_at <= ?")
+            params.append(until_ts)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = sqlite3.connect(self.index_path)
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT commit_hash FROM commits
+            {where}
+            ORDER BY position DESC
+        """, params)
+
+        hashes = [row[0] for row in cursor.fetchall()]
+        conn.close()
+
+        return hashes
+
+    def commits_in_range(self, since: Optional[str] = None, until: Optional[str] = None) -> List[str]:
+        """Update the index and return the commits between two git date expressions."""
+        self.update()
+        since_ts, until_ts = resolve_dates(self.repo_path, since, until)
+        return self.query(since_ts, until_ts)
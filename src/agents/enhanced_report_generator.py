@@ -2,163 +2,539 @@
 Enhanced report generator that creates comprehensive, non-technical reports.
 """
 
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
+import queue
+import threading
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+from datetime import date, datetime, timedelta
 from collections import defaultdict
 
 
-class EnhancedReportGenerator:
+# Reports on at least this many commits take dashboard metrics from a
+# vectorized CommitFrame when pandas is available
+FRAME_MIN_COMMITS = 5000
+
+# Renderers emit markdown in chunks to a writer: anything called with one
+# string at a time, such as file.write, list.append or a socket writer
+Writer = Callable[[str], Any]
+
+
+def render_to_string(render: Callable[..., None], *args) -> str:
+    """Run a writer-based renderer and join its chunks once."""
+    chunks: List[str] = []
+    render(*args, chunks.append)
+    return ''.join(chunks)
+
+
+class _RenderClosed(Exception):
+    """Raised inside a renderer whose iter_rendered consumer stopped reading."""
+
+
+def iter_rendered(render: Callable[..., None], *args, chunk_size: int) -> Iterator[str]:
     """
-    Generates beautiful, comprehensive reports that non-technical users can understand.
+    Run a writer-based renderer on a background thread and yield its output.
+    
+    Written markdown is joined into chunks of about chunk_size characters.
+    At most two chunks wait to be read, so a slow reader such as an HTTP
+    client holds back rendering instead of the whole text piling up.
+    Closing the iterator early stops the renderer at its next write.
     """
+    pending: queue.Queue = queue.Queue(maxsize=2)
+    closed = threading.Event()
+    done = object()
+    buffer: List[str] = []
+    buffered = 0
     
-    def generate_dashboard_summary(self, commits: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate dashboard summary with key metrics."""
-        if not commits:
-            return {
-                'total_commits': 0,
-                'time_span_days': 0,
-                'active_contributors': 0,
-                'most_active_contributor': 'None',
-                'commit_categories': {},
-                'impact_distribution': {'high': 0, 'medium': 0, 'low': 0},
-                'high_risk_commits': 0,
-                'visual_changes_count': 0,
-                'activity_timeline': []
-            }
+    def put(item):
+        while not closed.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise _RenderClosed()
+    
+    def write(chunk: str):
+        nonlocal buffered
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= chunk_size:
+            put(''.join(buffer))
+            buffer.clear()
+            buffered = 0
+    
+    def run():
+        try:
+            try:
+                render(*args, write)
+            except _RenderClosed:
+                return
+            except Exception as e:
+                put(e)
+                return
+            if buffer:
+                put(''.join(buffer))
+            put(done)
+        except _RenderClosed:
+            pass
+    
+    threading.Thread(target=run, daemon=True).start()
+    try:
+        while True:
+            item = pending.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        closed.set()
+
+
+def commit_timestamp(commit: Dict[str, Any]) -> datetime:
+    """
+    Wall-clock time of a commit summary, to the minute, as reports show it.
+    
+    Uses the typed timestamp set by generate_non_technical_summary (an ISO
+    string once a report has been stored) and only parses the display date
+    of summaries that predate it.
+    """
+    timestamp = commit.get('timestamp')
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            timestamp = None
+    
+    if not isinstance(timestamp, datetime):
+        try:
+            date_str = commit['date']
+            # Handle different date formats
+            if ' at ' in date_str:
+                timestamp = datetime.strptime(date_str, "%B %d, %Y at %I:%M %p")
+            else:
+                timestamp = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
+        except (ValueError, TypeError, KeyError):
+            # If date parsing fails, use current date
+            timestamp = datetime.now()
+    
+    return timestamp.replace(tzinfo=None, second=0, microsecond=0)
+
+
+def _ranked(counts: Dict[str, int]) -> Dict[str, int]:
+    """Counts ordered by descending count, ties by name, independent of merge order."""
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def commit_day(commit: Dict[str, Any]) -> date:
+    """
+    Day a commit summary counts towards in dashboard partials.
+    
+    This is the committer's local date, since time windows select commits
+    by committer date; summaries without one fall back to the author date.
+    """
+    committed_at = commit.get('committed_at')
+    if isinstance(committed_at, str):
+        try:
+            committed_at = datetime.fromisoformat(committed_at)
+        except ValueError:
+            committed_at = None
+    
+    if isinstance(committed_at, datetime):
+        return committed_at.date()
+    return commit_timestamp(commit).date()
+
+
+class DashboardPartial:
+    """
+    Mergeable partial aggregate behind the dashboard summary.
+    
+    Holds counts, per-author and per-category tallies, the earliest and
+    latest commit time and per-day category buckets. Partials for disjoint
+    sets of commits merge into the partial of their union, in any order,
+    so a dashboard for a long window can be assembled from stored daily
+    partials instead of reanalyzing its commits.
+    """
+    
+    def __init__(self):
+        self.total_commits = 0
+        self.authors: Dict[str, int] = defaultdict(int)
+        self.categories: Dict[str, int] = defaultdict(int)
+        self.impact_distribution = {'high': 0, 'medium': 0, 'low': 0}
+        self.high_risk_commits = 0
+        self.visual_changes_count = 0
+        self.earliest_date: Optional[datetime] = None
+        self.latest_date: Optional[datetime] = None
+        # Category counts per day
+        self.days: Dict[date, Dict[str, int]] = {}
+    
+    def add(self, commit: Dict[str, Any], timestamp: Optional[datetime] = None,
+            commit_date: Optional[date] = None):
+        """Fold one commit summary into the partial."""
+        if timestamp is None:
+            timestamp = commit_timestamp(commit)
+        if commit_date is None:
+            commit_date = commit_day(commit)
         
-        total_commits = len(commits)
+        self.total_commits += 1
+        self.authors[commit['author']] += 1
+        self.categories[commit['category']] += 1
         
-        # Author statistics
-        authors = defaultdict(int)
-        for commit in commits:
-            authors[commit['author']] += 1
+        if self.earliest_date is None or timestamp < self.earliest_date:
+            self.earliest_date = timestamp
+        if self.latest_date is None or timestamp > self.latest_date:
+            self.latest_date = timestamp
         
-        # Time analysis
-        dates = []
-        for commit in commits:
-            try:
-                date_str = commit['date']
-                # Handle different date formats
-                if ' at ' in date_str:
-                    date_obj = datetime.strptime(date_str, "%B %d, %Y at %I:%M %p")
-                else:
-                    date_obj = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                dates.append(date_obj)
-            except ValueError:
-                # If date parsing fails, use current date
-                dates.append(datetime.now())
+        day = self.days.setdefault(commit_date, defaultdict(int))
+        day[commit.get('category', 'other')] += 1
+        
+        # Impact and risk analysis
+        impact_score = commit.get('impact_score', '')
+        if 'High impact' in impact_score:
+            self.impact_distribution['high'] += 1
+        if 'Medium impact' in impact_score:
+            self.impact_distribution['medium'] += 1
+        if 'Low impact' in impact_score:
+            self.impact_distribution['low'] += 1
+        
+        if 'High risk' in commit.get('risk_level', ''):
+            self.high_risk_commits += 1
+        if commit.get('visual_changes', False):
+            self.visual_changes_count += 1
+    
+    def merge(self, other: 'DashboardPartial') -> 'DashboardPartial':
+        """Fold another partial into this one and return this one."""
+        self.total_commits += other.total_commits
+        for author, count in other.authors.items():
+            self.authors[author] += count
+        for category, count in other.categories.items():
+            self.categories[category] += count
+        for level, count in other.impact_distribution.items():
+            self.impact_distribution[level] = self.impact_distribution.get(level, 0) + count
+        self.high_risk_commits += other.high_risk_commits
+        self.visual_changes_count += other.visual_changes_count
         
-        if dates:
-            earliest_date = min(dates)
-            latest_date = max(dates)
-            time_span = (latest_date - earliest_date).days + 1  # Include both start and end days
+        if other.earliest_date is not None and (self.earliest_date is None or other.earliest_date < self.earliest_date):
+            self.earliest_date = other.earliest_date
+        if other.latest_date is not None and (self.latest_date is None or other.latest_date > self.latest_date):
+            self.latest_date = other.latest_date
+        
+        for day, categories in other.days.items():
+            bucket = self.days.setdefault(day, defaultdict(int))
+            for category, count in categories.items():
+                bucket[category] += count
+        return self
+    
+    @classmethod
+    def merged(cls, partials: Iterable['DashboardPartial']) -> 'DashboardPartial':
+        """Merge any number of partials into a new one."""
+        result = cls()
+        for partial in partials:
+            result.merge(partial)
+        return result
+    
+    def summary(self) -> Dict[str, Any]:
+        """Build the dashboard summary."""
+        if self.total_commits:
+            time_span = (self.latest_date - self.earliest_date).days + 1  # Include both start and end days
         else:
             time_span = 0
         
-        # Category analysis
-        categories = defaultdict(int)
+        authors = _ranked(self.authors)
+        return {
+            'total_commits': self.total_commits,
+            'time_span_days': time_span,
+            'active_contributors': len(authors),
+            'most_active_contributor': next(iter(authors)) if authors else 'None',
+            'commit_categories': _ranked(self.categories),
+            'impact_distribution': dict(self.impact_distribution),
+            'high_risk_commits': self.high_risk_commits,
+            'visual_changes_count': self.visual_changes_count,
+            'activity_timeline': self.activity_timeline()
+        }
+    
+    def activity_timeline(self) -> List[Dict[str, Any]]:
+        """Per-day commit counts for visualization."""
+        return [{
+            'date': day.isoformat(),
+            'total_commits': sum(self.days[day].values()),
+            'category_breakdown': _ranked(self.days[day])
+        } for day in sorted(self.days)]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible form for storage."""
+        return {
+            'total_commits': self.total_commits,
+            'authors': dict(self.authors),
+            'categories': dict(self.categories),
+            'impact_distribution': dict(self.impact_distribution),
+            'high_risk_commits': self.high_risk_commits,
+            'visual_changes_count': self.visual_changes_count,
+            'earliest_date': self.earliest_date.isoformat() if self.earliest_date else None,
+            'latest_date': self.latest_date.isoformat() if self.latest_date else None,
+            'days': {day.isoformat(): dict(categories) for day, categories in self.days.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DashboardPartial':
+        """Rebuild a partial stored with to_dict."""
+        partial = cls()
+        partial.total_commits = data.get('total_commits', 0)
+        partial.authors.update(data.get('authors', {}))
+        partial.categories.update(data.get('categories', {}))
+        partial.impact_distribution.update(data.get('impact_distribution', {}))
+        partial.high_risk_commits = data.get('high_risk_commits', 0)
+        partial.visual_changes_count = data.get('visual_changes_count', 0)
+        if data.get('earliest_date'):
+            partial.earliest_date = datetime.fromisoformat(data['earliest_date'])
+        if data.get('latest_date'):
+            partial.latest_date = datetime.fromisoformat(data['latest_date'])
+        for day, categories in data.get('days', {}).items():
+            partial.days[date.fromisoformat(day)] = defaultdict(int, categories)
+        return partial
+
+
+class ReportAccumulator:
+    """
+    Folds commit summaries into report statistics one commit at a time.
+    
+    Holds only aggregates (one DashboardPartial per day plus per-file
+    tallies), so reports can be built from a stream of commits without
+    keeping the commits themselves. With keep_timeline=True it also groups
+    the summaries by day for the timeline, so every report section is
+    built from one pass over the commits.
+    """
+    
+    def __init__(self, max_high_impact: Optional[int] = None, keep_timeline: bool = False):
+        self.total_commits = 0
+        # Dashboard statistics per day, mergeable into any longer window
+        self.daily: Dict[date, DashboardPartial] = {}
+        self.file_stats = defaultdict(lambda: {'changes': 0, 'commits': 0})
+        self.language_stats = defaultdict(int)
+        self.high_impact_commits = []
+        self.omitted_high_impact = 0
+        self.max_high_impact = max_high_impact
+        # Commit summaries per day, in the order they were added
+        self.timeline = defaultdict(list) if keep_timeline else None
+    
+    def add(self, commit: Dict[str, Any]):
+        """Fold one commit summary into the running statistics."""
+        self.total_commits += 1
+        
+        # Time analysis; days stay date objects until rendering
+        timestamp = commit_timestamp(commit)
+        if self.timeline is not None:
+            self.timeline[timestamp.date()].append(commit)
+        
+        # Partials follow the committer date, the timeline the author date
+        partial_day = commit_day(commit)
+        partial = self.daily.get(partial_day)
+        if partial is None:
+            partial = self.daily[partial_day] = DashboardPartial()
+        partial.add(commit, timestamp, partial_day)
+        
+        self.add_details(commit)
+    
+    def add_details(self, commit: Dict[str, Any]):
+        """Fold only the per-file statistics and high impact entry of a commit summary."""
+        # File and language statistics
+        file_explanations = commit.get('file_explanations', [])
+        for file_exp in file_explanations:
+            # Handle both dict and object formats
+            if isinstance(file_exp, dict):
+                file_path = file_exp.get('file_path', 'unknown')
+                language = file_exp.get('language', 'Unknown')
+            else:
+                file_path = getattr(file_exp, 'file_path', 'unknown')
+                language = getattr(file_exp, 'language', 'Unknown')
+            
+            self.file_stats[file_path]['changes'] += 1
+            self.file_stats[file_path]['commits'] += 1
+            self.language_stats[language] += 1
+        
+        if 'High impact' in commit.get('impact_score', ''):
+            if self.max_high_impact is None or len(self.high_impact_commits) < self.max_high_impact:
+                self.high_impact_commits.append({
+                    'commit_id': commit['commit_id'],
+                    'message': commit['message'],
+                    'author': commit['author'],
+                    'date': commit['date'],
+                    'files_changed': len(file_explanations),
+                    'overall_impact': commit.get('overall_impact', 'No impact information')
+                })
+            else:
+                self.omitted_high_impact += 1
+    
+    def dashboard(self) -> DashboardPartial:
+        """All daily partials merged."""
+        return DashboardPartial.merged(self.daily.values())
+    
+    def dashboard_summary(self) -> Dict[str, Any]:
+        """Build the dashboard summary from the accumulated statistics."""
+        return self.dashboard().summary()
+    
+    def activity_timeline(self) -> List[Dict[str, Any]]:
+        """Per-day commit counts for visualization."""
+        return self.dashboard().activity_timeline()
+
+
+class EnhancedReportGenerator:
+    """
+    Generates beautiful, comprehensive reports that non-technical users can understand.
+    """
+    
+    def accumulate(self, commits: List[Dict[str, Any]], keep_timeline: bool = False) -> ReportAccumulator:
+        """Fold commit summaries into a ReportAccumulator in one pass."""
+        accumulator = ReportAccumulator(keep_timeline=keep_timeline)
         for commit in commits:
-            categories[commit['category']] += 1
+            accumulator.add(commit)
+        
+        return accumulator
+    
+    def prepare_report(self, commits: List[Dict[str, Any]],
+                       analyses: Optional[List[Any]] = None) -> ReportAccumulator:
+        """
+        Collect everything the report sections need in a single pass over the commits.
+        
+        Args:
+            commits: Non-technical commit summaries
+            analyses: The CommitAnalysis objects the summaries were made
+                from, in the same order. For large reports they enable the
+                vectorized CommitFrame path
         
-        # Impact analysis
-        high_impact = sum(1 for commit in commits if 'High impact' in commit.get('impact_score', ''))
-        medium_impact = sum(1 for commit in commits if 'Medium impact' in commit.get('impact_score', ''))
-        low_impact = sum(1 for commit in commits if 'Low impact' in commit.get('impact_score', ''))
+        Returns:
+            An accumulator with the timeline kept, ready for write_report
+        """
+        frame = self._commit_frame(commits, analyses)
+        if frame is None:
+            return self.accumulate(commits, keep_timeline=True)
         
-        # Risk analysis
-        high_risk = sum(1 for commit in commits if 'High risk' in commit.get('risk_level', ''))
+        # Dashboard metrics and day grouping come from the frame; only
+        # per-file statistics are folded commit by commit
+        accumulator = ReportAccumulator()
+        for commit in commits:
+            accumulator.add_details(commit)
+        accumulator.timeline = frame.timeline(commits)
+        accumulator.daily = frame.daily_partials()
+        return accumulator
+    
+    def generate_report_sections(self, commits: List[Dict[str, Any]],
+                                 analyses: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """
+        Generate every report section from a single pass over the commits.
+        
+        Returns:
+            dashboard_summary, executive_summary, timeline and
+            technical_deep_dive, plus dashboard_partials: the
+            DashboardPartial of each day, for storage and later roll-ups
+        """
+        accumulator = self.prepare_report(commits, analyses)
+        dashboard_summary = accumulator.dashboard_summary()
         
         return {
-            'total_commits': total_commits,
-            'time_span_days': time_span,
-            'active_contributors': len(authors),
-            'most_active_contributor': max(authors.items(), key=lambda x: x[1])[0] if authors else 'None',
-            'commit_categories': dict(categories),
-            'impact_distribution': {
-                'high': high_impact,
-                'medium': medium_impact,
-                'low': low_impact
-            },
-            'high_risk_commits': high_risk,
-            'visual_changes_count': sum(1 for commit in commits if commit.get('visual_changes', False)),
-            'activity_timeline': self._generate_activity_timeline(commits)
+            'dashboard_summary': dashboard_summary,
+            'executive_summary': self.generate_executive_summary(dashboard_summary, commits),
+            'timeline': self.render_commit_timeline(accumulator),
+            'technical_deep_dive': self.render_technical_deep_dive(accumulator),
+            'dashboard_partials': accumulator.daily
         }
     
+    def write_report(self, dashboard_summary: Dict[str, Any], accumulator: ReportAccumulator, write: Writer):
+        """
+        Write the combined report: executive summary, timeline and technical deep dive.
+        
+        The timeline is left out when the accumulator did not keep one, as
+        for streamed analyses.
+        """
+        self.write_executive_summary(dashboard_summary, write)
+        if accumulator.timeline is not None:
+            write("\n\n")
+            self.write_commit_timeline(accumulator, write)
+        write("\n\n")
+        self.write_technical_deep_dive(accumulator, write)
+    
+    def _commit_frame(self, commits: List[Dict[str, Any]], analyses: Optional[List[Any]]):
+        """A CommitFrame for large reports with analyses, or None to use ReportAccumulator."""
+        if analyses is None or len(commits) < FRAME_MIN_COMMITS:
+            return None
+        try:
+            from .commit_frame import CommitFrame
+        except ImportError:
+            return None
+        return CommitFrame.from_commits(analyses, commits)
+    
+    def generate_dashboard_summary(self, commits: List[Dict[str, Any]],
+                                   analyses: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Generate dashboard summary with key metrics."""
+        frame = self._commit_frame(commits, analyses)
+        if frame is not None:
+            return frame.dashboard_summary()
+        return self.accumulate(commits).dashboard_summary()
+    
     def generate_executive_summary(self, summary: Dict[str, Any], commits: List[Dict[str, Any]]) -> str:
         """Generate an executive summary for non-technical stakeholders."""
-        report = "# Development Activity Executive Summary\n\n"
+        return render_to_string(self.write_executive_summary, summary)
+    
+    def write_executive_summary(self, summary: Dict[str, Any], write: Writer):
+        """Write the executive summary for non-technical stakeholders."""
+        write("# Development Activity Executive Summary\n\n")
         
         # Overview
-        report += "## Overview\n"
-        report += f"During this period, the development team made {summary['total_commits']} updates to the application "
-        report += f"over {summary['time_span_days']} days. "
-        report += f"These changes involved {summary['active_contributors']} team member{'s' if summary['active_contributors'] != 1 else ''}.\n\n"
+        write("## Overview\n")
+        write(f"During this period, the development team made {summary['total_commits']} updates to the application ")
+        write(f"over {summary['time_span_days']} days. ")
+        write(f"These changes involved {summary['active_contributors']} team member{'s' if summary['active_contributors'] != 1 else ''}.\n\n")
         
         # Key Metrics
-        report += "## Key Metrics\n"
-        report += f"- **Most Active Contributor**: {summary['most_active_contributor']}\n"
-        report += f"- **High Impact Changes**: {summary['impact_distribution']['high']}\n"
-        report += f"- **Features Added**: {summary['commit_categories'].get('feature', 0)}\n"
-        report += f"- **Bugs Fixed**: {summary['commit_categories'].get('bugfix', 0)}\n"
-        report += f"- **Visual Updates**: {summary['visual_changes_count']}\n\n"
+        write("## Key Metrics\n")
+        write(f"- **Most Active Contributor**: {summary['most_active_contributor']}\n")
+        write(f"- **High Impact Changes**: {summary['impact_distribution']['high']}\n")
+        write(f"- **Features Added**: {summary['commit_categories'].get('feature', 0)}\n")
+        write(f"- **Bugs Fixed**: {summary['commit_categories'].get('bugfix', 0)}\n")
+        write(f"- **Visual Updates**: {summary['visual_changes_count']}\n\n")
         
         # Risk Assessment
         if summary['high_risk_commits'] > 0:
-            report += "## Risk Areas\n"
-            report += f"There were {summary['high_risk_commits']} high-risk changes that require careful attention. "
-            report += "These updates affect critical components of the application and should be thoroughly tested.\n\n"
+            write("## Risk Areas\n")
+            write(f"There were {summary['high_risk_commits']} high-risk changes that require careful attention. ")
+            write("These updates affect critical components of the application and should be thoroughly tested.\n\n")
         
         # Activity Breakdown
-        report += "## Activity Breakdown\n"
+        write("## Activity Breakdown\n")
         categories = summary['commit_categories']
         for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / summary['total_commits']) * 100
-            report += f"- **{category.title()}**: {count} updates ({percentage:.1f}%)\n"
-        
-        return report
+            write(f"- **{category.title()}**: {count} updates ({percentage:.1f}%)\n")
     
     def generate_commit_timeline(self, commits: List[Dict[str, Any]]) -> str:
         """Generate a timeline view of commits."""
-        if not commits:
-            return "# Development Timeline\n\nNo commits available for the selected timeframe."
-        
-        timeline = "# Development Timeline\n\n"
-        
-        # Group commits by date
-        commits_by_date = defaultdict(list)
-        for commit in commits:
-            try:
-                date_str = commit['date']
-                if ' at ' in date_str:
-                    date_obj = datetime.strptime(date_str, "%B %d, %Y at %I:%M %p")
-                else:
-                    date_obj = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                date_key = date_obj.strftime("%B %d, %Y")
-            except (ValueError, AttributeError):
-                date_key = datetime.now().strftime("%B %d, %Y")
-            
-            commits_by_date[date_key].append(commit)
+        return self.render_commit_timeline(self.accumulate(commits, keep_timeline=True))
+    
+    def render_commit_timeline(self, accumulator: ReportAccumulator) -> str:
+        """Render the timeline from summaries grouped by an accumulator with keep_timeline=True."""
+        return render_to_string(self.write_commit_timeline, accumulator)
+    
+    def write_commit_timeline(self, accumulator: ReportAccumulator, write: Writer):
+        """Write the timeline from summaries grouped by an accumulator with keep_timeline=True."""
+        if not accumulator.timeline:
+            write("# Development Timeline\n\nNo commits available for the selected timeframe.")
+            return
         
-        # Sort dates properly
-        date_keys = sorted(commits_by_date.keys(), 
-                          key=lambda x: datetime.strptime(x, "%B %d, %Y"), 
-                          reverse=True)
+        write("# Development Timeline\n\n")
         
-        # Generate timeline
-        for date in date_keys:
-            timeline += f"## {date}\n\n"
+        # Newest day first
+        for day in sorted(accumulator.timeline, reverse=True):
+            write(f"## {day.strftime('%B %d, %Y')}\n\n")
             
-            for commit in commits_by_date[date]:
+            for commit in accumulator.timeline[day]:
                 # Commit header
-                timeline += f"### {commit['author']} - {commit['message']}\n"
-                timeline += f"- **Type**: {commit['category'].title()} - {commit.get('category_explanation', 'General change')}\n"
-                timeline += f"- **Impact**: {commit.get('impact_score', 'Unknown')}\n"
-                timeline += f"- **Risk**: {commit.get('risk_level', 'Unknown')}\n\n"
+                write(f"### {commit['author']} - {commit['message']}\n")
+                write(f"- **Type**: {commit['category'].title()} - {commit.get('category_explanation', 'General change')}\n")
+                write(f"- **Impact**: {commit.get('impact_score', 'Unknown')}\n")
+                write(f"- **Risk**: {commit.get('risk_level', 'Unknown')}\n\n")
                 
                 # Files changed explanation
                 if commit.get('file_explanations'):
-                    timeline += "**Changes Made:**\n"
+                    write("**Changes Made:**\n")
                     for file_exp in commit['file_explanations']:
                         if isinstance(file_exp, dict):
                             file_path = file_exp.get('file_path', 'unknown')
@@ -170,97 +546,56 @@ class EnhancedReportGenerator:
                             code_summary = getattr(file_exp, 'code_summary', '')
                             if not code_summary:
                                 code_summary = getattr(file_exp, 'non_technical_summary', 'No summary available')
-                        timeline += f"- `{file_path}`: {code_summary}\n"
-                    timeline += "\n"
+                        write(f"- `{file_path}`: {code_summary}\n")
+                    if commit.get('omitted_files'):
+                        write(f"- ...and {commit['omitted_files']} more files\n")
+                    write("\n")
                 
                 # Overall impact
-                timeline += f"**Overall Impact:** {commit.get('overall_impact', 'No impact information available')}\n\n"
-                timeline += "---\n\n"
-        
-        return timeline
+                write(f"**Overall Impact:** {commit.get('overall_impact', 'No impact information available')}\n\n")
+                write("---\n\n")
     
     def generate_technical_deep_dive(self, commits: List[Dict[str, Any]]) -> str:
         """Generate a technical deep dive for developers."""
-        deep_dive = "# Technical Deep Dive\n\n"
-        
-        # File statistics
-        all_files = defaultdict(lambda: {'changes': 0, 'commits': 0})
-        for commit in commits:
-            for file_exp in commit.get('file_explanations', []):
-                # Handle both dict and object formats
-                if isinstance(file_exp, dict):
-                    file_path = file_exp.get('file_path', 'unknown')
-                else:
-                    file_path = getattr(file_exp, 'file_path', 'unknown')
-                    
-                all_files[file_path]['changes'] += 1
-                all_files[file_path]['commits'] += 1
+        return self.render_technical_deep_dive(self.accumulate(commits))
+    
+    def render_technical_deep_dive(self, accumulator: ReportAccumulator) -> str:
+        """Render the technical deep dive from accumulated statistics."""
+        return render_to_string(self.write_technical_deep_dive, accumulator)
+    
+    def write_technical_deep_dive(self, accumulator: ReportAccumulator, write: Writer):
+        """Write the technical deep dive from accumulated statistics."""
+        write("# Technical Deep Dive\n\n")
         
         # Most changed files
-        deep_dive += "## Most Changed Files\n"
-        for file_path, stats in sorted(all_files.items(), 
+        write("## Most Changed Files\n")
+        for file_path, stats in sorted(accumulator.file_stats.items(), 
                                      key=lambda x: x[1]['changes'], 
                                      reverse=True)[:10]:
-            deep_dive += f"- `{file_path}`: {stats['changes']} changes across {stats['commits']} commits\n"
-        deep_dive += "\n"
+            write(f"- `{file_path}`: {stats['changes']} changes across {stats['commits']} commits\n")
+        write("\n")
         
         # Language breakdown
-        language_stats = defaultdict(int)
-        for commit in commits:
-            for file_exp in commit.get('file_explanations', []):
-                if isinstance(file_exp, dict):
-                    language = file_exp.get('language', 'Unknown')
-                else:
-                    language = getattr(file_exp, 'language', 'Unknown')
-                language_stats[language] += 1
-        
-        deep_dive += "## Language Distribution\n"
-        for language, count in sorted(language_stats.items(), 
+        write("## Language Distribution\n")
+        for language, count in sorted(accumulator.language_stats.items(), 
                                     key=lambda x: x[1], 
                                     reverse=True):
-            deep_dive += f"- **{language}**: {count} file changes\n"
-        deep_dive += "\n"
+            write(f"- **{language}**: {count} file changes\n")
+        write("\n")
         
         # High impact commits
-        high_impact_commits = [c for c in commits if 'High impact' in c.get('impact_score', '')]
-        if high_impact_commits:
-            deep_dive += "## High Impact Changes\n"
-            for commit in high_impact_commits:
-                deep_dive += f"### {commit['commit_id']} - {commit['message']}\n"
-                deep_dive += f"- **Author**: {commit['author']}\n"
-                deep_dive += f"- **Date**: {commit['date']}\n"
-                deep_dive += f"- **Files Changed**: {len(commit.get('file_explanations', []))}\n"
-                deep_dive += f"- **Impact**: {commit.get('overall_impact', 'No impact information')}\n\n"
-        
-        return deep_dive
+        if accumulator.high_impact_commits:
+            write("## High Impact Changes\n")
+            for commit in accumulator.high_impact_commits:
+                write(f"### {commit['commit_id']} - {commit['message']}\n"
+                      f"- **Author**: {commit['author']}\n"
+                      f"- **Date**: {commit['date']}\n"
+                      f"- **Files Changed**: {commit['files_changed']}\n"
+                      f"- **Impact**: {commit['overall_impact']}\n\n")
+            
+            if accumulator.omitted_high_impact:
+                write(f"...and {accumulator.omitted_high_impact} more high impact changes.\n\n")
     
     def _generate_activity_timeline(self, commits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Generate activity timeline data for visualization."""
-        timeline_data = []
-        
-        # Group by date
-        commits_by_date = defaultdict(lambda: {'count': 0, 'categories': defaultdict(int)})
-        for commit in commits:
-            try:
-                date_str = commit['date']
-                if ' at ' in date_str:
-                    date_obj = datetime.strptime(date_str, "%B %d, %Y at %I:%M %p")
-                else:
-                    date_obj = datetime.strptime(date_str, "%a %b %d %H:%M:%S %Y %z")
-                date_key = date_obj.strftime("%Y-%m-%d")
-            except (ValueError, AttributeError):
-                # Use today's date if parsing fails
-                date_key = datetime.now().strftime("%Y-%m-%d")
-            
-            commits_by_date[date_key]['count'] += 1
-            commits_by_date[date_key]['categories'][commit.get('category', 'other')] += 1
-        
-        # Convert to list format
-        for date, data in commits_by_date.items():
-            timeline_data.append({
-                'date': date,
-                'total_commits': data['count'],
-                'category_breakdown': dict(data['categories'])
-            })
-        
-        return sorted(timeline_data, key=lambda x: x['date'])
+        return self.accumulate(commits).activity_timeline()
@@ -0,0 +1,220 @@
+"""
+Streaming extraction of commit metadata and per-file line counts from `git log`.
+"""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Union
+
+
+# Field and record separators that cannot appear in git metadata we request
+RECORD_SEPARATOR = '\x1e'
+FIELD_SEPARATOR = '\x1f'
+
+# The committer date comes last, after the subject
+LOG_FORMAT = f"{RECORD_SEPARATOR}%H{FIELD_SEPARATOR}%an{FIELD_SEPARATOR}%ad{FIELD_SEPARATOR}%s{FIELD_SEPARATOR}%cd"
+
+
+class NumstatLogParser:
+    """
+    Incremental parser for `git log --numstat` output.
+
+    Lines are fed one at a time; a commit record is returned as soon as the
+    header of the following commit (or the end of the stream) is seen, so the
+    whole log never has to be held in memory.
+    """
+
+    def __init__(self, max_files: Optional[int] = None):
+        self._current: Optional[Dict[str, Any]] = None
+        # Paths kept per commit; later files only contribute to the totals
+        self.max_files = max_files
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """Consume one line of output, returning a finished commit if any."""
+        line = line.rstrip('\r\n')
+        if line.startswith(RECORD_SEPARATOR):
+            finished = self._current
+            self._current = self._parse_header(line[1:])
+            return finished
+
+        if self._current is not None and line:
+            self._parse_numstat(line)
+        return None
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Flush the last pending commit at end of stream."""
+        finished = self._current
+        self._current = None
+        return finished
+
+    def _parse_header(self, header: str) -> Optional[Dict[str, Any]]:
+        parts = header.split(FIELD_SEPARATOR)
+        if len(parts) < 4:
+            return None
+        return {
+            'hash': parts[0],
+            # Authors and paths repeat across commits; interning keeps one copy
+            'author': sys.intern(parts[1]),
+            'date': parts[2],
+            'message': parts[3],
+            'committer_date': parts[4] if len(parts) > 4 else None,
+            **empty_file_stats()
+        }
+
+    def _parse_numstat(self, line: str):
+        add_numstat_line(self._current, line, self.max_files)
+
+
+def empty_file_stats() -> Dict[str, Any]:
+    """File statistics of a commit before any numstat line is added."""
+    return {'files_changed': [], 'file_stats': {}, 'insertions': 0, 'deletions': 0, 'omitted_files': 0}
+
+
+def add_numstat_line(commit: Dict[str, Any], line: str, max_files: Optional[int] = None):
+    """
+    Add one `--numstat` line to a commit's file statistics.
+
+    Lines that are not "insertions<TAB>deletions<TAB>path" are ignored; at
+    most max_files paths are kept and further files are only counted.
+    """
+    parts = line.split('\t', 2)
+    if len(parts) != 3:
+        return
+
+    added, removed, file_path = parts
+    file_path = sys.intern(file_path)
+    # Binary files are reported as "-\t-\tpath"
+    insertions = int(added) if added.isdigit() else 0
+    deletions = int(removed) if removed.isdigit() else 0
+
+    commit['insertions'] += insertions
+    commit['deletions'] += deletions
+    if max_files is not None and len(commit['files_changed']) >= max_files:
+        commit['omitted_files'] += 1
+        return
+
+    commit['files_changed'].append(file_path)
+    commit['file_stats'][file_path] = (insertions, deletions)
+
+
+def parse_numstat_log(lines: Iterable[str], max_files: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Parse an iterable of `git log --numstat` lines into commit records."""
+    parser = NumstatLogParser(max_files)
+    for line in lines:
+        commit = parser.feed(line)
+        if commit is not None:
+            yield commit
+
+    commit = parser.close()
+    if commit is not None:
+        yield commit
+
+
+def build_log_command(repo_path: Union[str, Path], since: Optional[str] = None,
+                      from_stdin: bool = False, with_numstat: bool = True,
+                      until: Optional[str] = None) -> List[str]:
+    """Build the single `git log` invocation used for bulk extraction."""
+    cmd = ['git', '-C', str(repo_path), 'log', f'--format={LOG_FORMAT}']
+    if with_numstat:
+        # Renames count as a deletion and an addition, as in the per-commit
+        # diff-tree reader, rather than as an "old => new" pseudo-path
+        cmd.extend(['--numstat', '--no-renames'])
+    if since:
+        cmd.append(f'--since={since}')
+    if until:
+        cmd.append(f'--until={until}')
+    if from_stdin:
+        # Show exactly the commits listed on stdin, in the order given
+        cmd.extend(['--no-walk=unsorted', '--stdin'])
+    return cmd
+
+
+def iter_numstat_commits(repo_path: Union[str, Path], since: Optional[str] = None,
+                         commit_hashes: Optional[List[str]] = None,
+                         with_numstat: bool = True,
+                         max_files: Optional[int] = None,
+                         until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream commits with per-file numstat counts from one `git log` process.
+
+    Args:
+        repo_path: Path to the git repository
+        since: Value passed to `git log --since`
+        commit_hashes: Restrict extraction to these commits instead of walking history
+        with_numstat: Set to False to stream commit metadata only
+        max_files: Maximum number of paths kept per commit
+        until: Value passed to `git log --until`
+
+    Yields:
+        Commit records with hash, author, date, message and file statistics
+    """
+    if commit_hashes is not None and not commit_hashes:
+        return
+
+    from_stdin = commit_hashes is not None
+    process = subprocess.Popen(
+        build_log_command(repo_path, since, from_stdin, with_numstat, until),
+        stdin=subprocess.PIPE if from_stdin else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    if from_stdin:
+        # git reads the full revision list before producing any output
+        process.stdin.write(''.join(f"{commit_hash}\n" for commit_hash in commit_hashes).encode('utf-8'))
+        process.stdin.close()
+
+    try:
+        lines = (raw.decode('utf-8', errors='ignore') for raw in process.stdout)
+        yield from parse_numstat_log(lines, max_files)
+    finally:
+        process.stdout.close()
+        return_code = process.wait()
+
+    if return_code != 0:
+        raise subprocess.CalledProcessError(return_code, process.args)
+
+
+async def read_numstat_commits_async(repo_path: Union[str, Path], since: Optional[str] = None,
+                                     max_files: Optional[int] = None,
+                                     until: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Extract commits with numstat counts using an asyncio subprocess.
+
+    Lets many repositories be read concurrently from one event loop.
+
+    Args:
+        repo_path: Path to the git repository
+        since: Value passed to `git log --since`
+        max_files: Maximum number of paths kept per commit
+        until: Value passed to `git log --until`
+
+    Returns:
+        Commit records in git log order
+    """
+    cmd = build_log_command(repo_path, since, until=until)
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        # Allow very long path lines in the numstat output
+        limit=1024 * 1024
+    )
+
+    parser = NumstatLogParser(max_files)
+    commits = []
+    async for raw in process.stdout:
+        commit = parser.feed(raw.decode('utf-8', errors='ignore'))
+        if commit is not None:
+            commits.append(commit)
+
+    commit = parser.close()
+    if commit is not None:
+        commits.append(commit)
+
+    return_code = await process.wait()
+    if return_code != 0:
+        raise subprocess.CalledProcessError(return_code, cmd)
+
+    return commits
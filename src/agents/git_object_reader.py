@@ -0,0 +1,155 @@
+"""
+Per-commit line counts from a long-lived `git diff-tree --stdin` process.
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+from .git_log import add_numstat_line, empty_file_stats
+
+
+class _DiffTreeProcess:
+    """
+    One `git diff-tree --stdin --numstat` child process, restarted on failure.
+
+    diff-tree echoes input lines that are not object names, so a sentinel
+    line written after each commit marks the end of that commit's output.
+    """
+
+    SENTINEL = b'--end-of-commit--'
+
+    def __init__(self, repo_path: Path):
+        self.repo_path = repo_path
+        self.process: Optional[subprocess.Popen] = None
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            ['git', '-C', str(self.repo_path), 'diff-tree', '--stdin', '-r', '--root', '--numstat', '--no-renames'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    def _is_alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def request(self, commit_hash: str, max_files: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Return the file statistics of one commit, restarting a dead child once.
+
+        Merges and missing commits have no files.
+        """
+        for attempt in range(2):
+            if not self._is_alive():
+                self._start()
+            try:
+                return self._exchange(commit_hash, max_files)
+            except (BrokenPipeError, OSError, EOFError):
+                # The child died mid-request; start a fresh one and retry once
+                self.stop()
+                if attempt == 1:
+                    raise
+        raise EOFError("git diff-tree did not respond")
+
+    def _exchange(self, commit_hash: str, max_files: Optional[int]) -> Dict[str, Any]:
+        self.process.stdin.write(commit_hash.encode('utf-8') + b'\n' + self.SENTINEL + b'\n')
+        self.process.stdin.flush()
+
+        # Each line is counted as it is read, so commits touching many files
+        # never hold more than max_files paths
+        stats = empty_file_stats()
+        while True:
+            raw = self.process.stdout.readline()
+            if not raw:
+                raise EOFError("git diff-tree closed its output")
+            line = raw.rstrip(b'\n')
+            if line == self.SENTINEL:
+                return stats
+            # The first line of a commit's output is its own hash
+            if b'\t' in line:
+                add_numstat_line(stats, line.decode('utf-8', errors='ignore'), max_files)
+
+    def stop(self):
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+class GitObjectReader:
+    """
+    Serves per-commit line counts over persistent `git diff-tree --stdin`
+    pipes instead of spawning a `git show` process per commit.
+
+    Each thread gets its own pipe, so worker threads read from git in
+    parallel rather than queueing on one process. The child processes are
+    started lazily, restarted if they die, and shut down by `close()`.
+    """
+
+    def __init__(self, repo_path: Union[str, Path]):
+        self.repo_path = Path(repo_path)
+        self._local = threading.local()
+        # Every pipe handed out, so close() can stop those of all threads
+        self._pipes: List[_DiffTreeProcess] = []
+        self._lock = threading.Lock()
+
+    def _diff_tree(self) -> _DiffTreeProcess:
+        """The calling thread's pipe."""
+        pipe = getattr(self._local, 'pipe', None)
+        if pipe is None:
+            pipe = self._local.pipe = _DiffTreeProcess(self.repo_path)
+            with self._lock:
+                self._pipes.append(pipe)
+        return pipe
+
+    def commit_numstat(self, commit_hash: str, max_files: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Per-file line counts of a commit against its parent.
+
+        Root commits are compared with the empty tree; merge commits report
+        no files, as with `git show --stat`.
+
+        Args:
+            commit_hash: Commit to inspect
+            max_files: Maximum number of paths kept; further files are only counted
+
+        Returns:
+            files_changed, file_stats, insertions, deletions and omitted_files
+        """
+        return self._diff_tree().request(commit_hash, max_files)
+
+    @property
+    def running_processes(self) -> int:
+        """Number of git child processes currently alive."""
+        with self._lock:
+            return sum(1 for pipe in self._pipes if pipe.process is not None)
+
+    def close(self):
+        """Shut down the git child processes of every thread."""
+        with self._lock:
+            pipes = list(self._pipes)
+        for pipe in pipes:
+            pipe.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
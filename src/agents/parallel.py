@@ -0,0 +1,157 @@
+"""
+Order-preserving parallel execution helpers for per-commit work.
+"""
+
+import pickle
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+
+# 'thread' suits git-bound work, 'process' suits CPU-bound heuristics
+EXECUTOR_MODES = ('thread', 'process')
+
+
+def _apply_chunk(func: Callable[[Any], Any], chunk: Sequence[Any]) -> List[Tuple[bool, Any]]:
+    """Apply func to every item of a chunk, capturing failures per item."""
+    results = []
+    for item in chunk:
+        try:
+            results.append((True, func(item)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _apply_chunk_in_process(func: Callable[[Any], Any], chunk: Sequence[Any]) -> List[Tuple[bool, Any]]:
+    """
+    _apply_chunk for a worker process.
+
+    An exception that cannot make the round trip to the parent would break
+    the whole pool, so it is replaced by a RuntimeError with its message.
+    """
+    results = _apply_chunk(func, chunk)
+    for i, (ok, value) in enumerate(results):
+        if not ok:
+            try:
+                pickle.loads(pickle.dumps(value))
+            except Exception:
+                results[i] = (False, RuntimeError(f"{type(value).__name__}: {value}"))
+    return results
+
+
+class WorkerPool:
+    """
+    Executor reused across map_ordered calls.
+
+    The pool is started on first use and kept until close(), so callers
+    mapping many batches do not pay for starting workers on every batch.
+    A pool broken by a dead worker process is dropped and started again
+    on the next call.
+    """
+
+    def __init__(self, workers: int = 1, executor: str = 'thread'):
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {executor}")
+        self.workers = workers
+        self.executor = executor
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                pool_class = ThreadPoolExecutor if self.executor == 'thread' else ProcessPoolExecutor
+                self._pool = pool_class(max_workers=self.workers)
+            return self._pool
+
+    def _discard(self, pool: Executor):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def map_ordered(self, func: Callable[[Any], Any], items: Sequence[Any],
+                    on_error: Optional[Callable[[Any, Exception], Any]] = None) -> List[Any]:
+        """
+        Apply func to each item on the pool, returning results in input order.
+
+        A chunk whose future fails as a whole (a worker died, or a result
+        could not be pickled) fails only its own items; results of the
+        other chunks are kept.
+
+        Args:
+            func: Callable applied to every item (must be picklable for processes)
+            items: Items to process
+            on_error: Called with (item, exception) for a failed item; its return
+                value takes the item's place. Without it the first error is raised.
+
+        Returns:
+            One result per item, in the same order as items
+        """
+        if self.workers <= 1 or len(items) <= 1:
+            return _collect(items, _apply_chunk(func, items), on_error)
+
+        # Chunk work so process pools are not dominated by pickling overhead
+        chunk_size = max(1, len(items) // (self.workers * 4))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        pool = self._get_pool()
+        apply_chunk = _apply_chunk if self.executor == 'thread' else _apply_chunk_in_process
+        futures = []
+        for chunk in chunks:
+            try:
+                futures.append(pool.submit(apply_chunk, func, chunk))
+            except BrokenExecutor as e:
+                futures.append(e)
+
+        outcomes = []
+        broken = False
+        for chunk, future in zip(chunks, futures):
+            try:
+                if isinstance(future, Exception):
+                    raise future
+                outcomes.extend(future.result())
+            except Exception as e:
+                broken = broken or isinstance(e, BrokenExecutor)
+                outcomes.extend((False, e) for _ in chunk)
+        if broken:
+            self._discard(pool)
+
+        return _collect(items, outcomes, on_error)
+
+    def close(self):
+        """Shut the pool down; a later call starts a new one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+def map_ordered(func: Callable[[Any], Any], items: Sequence[Any], workers: int = 1,
+                executor: str = 'thread',
+                on_error: Optional[Callable[[Any, Exception], Any]] = None) -> List[Any]:
+    """
+    Apply func to each item on a pool used for this call only.
+
+    See WorkerPool.map_ordered; callers mapping repeatedly should keep a
+    WorkerPool instead.
+    """
+    pool = WorkerPool(workers, executor)
+    try:
+        return pool.map_ordered(func, items, on_error)
+    finally:
+        pool.close()
+
+
+def _collect(items: Sequence[Any], outcomes: List[Tuple[bool, Any]],
+             on_error: Optional[Callable[[Any, Exception], Any]]) -> List[Any]:
+    results = []
+    for item, (ok, value) in zip(items, outcomes):
+        if ok:
+            results.append(value)
+        elif on_error is not None:
+            results.append(on_error(item, value))
+        else:
+            raise value
+    return results
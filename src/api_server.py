@@ -2,17 +2,34 @@
 Simple API server for the commit analysis dashboard.
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 import subprocess
-from main import CommitAnalysisApp
+import threading
+from main import CommitAnalysisApp, MultiRepoAnalysisApp, iter_report_markdown, load_repo_manifest, rollup_dashboard
+from agents.commit_index import format_timeframe
+from storage.document_store import DocumentStore
+from storage.retention import BackgroundCompactor, RetentionPolicy, DEFAULT_KEEP_LAST
+from storage.export import ColumnarExporter
+from storage.result_cache import ResultCache
 
 app = Flask(__name__, static_folder='../frontend')
 CORS(app)
 
+# Entries per response when paging through a per-commit report section
+DEFAULT_SECTION_LIMIT = 100
+
+# Where analyses are stored
+DEFAULT_STORAGE_PATH = "./data"
+
 # Global app instance
 analysis_app = None
+result_cache = None
+
+# One store per storage path for the life of the process, so requests share its connection pool
+document_stores = {}
+document_stores_lock = threading.Lock()
 
 @app.route('/')
 def serve_frontend():
@@ -28,23 +45,31 @@ def analyze_repo():
     
     data = request.json
     repo_path = data.get('repoPath')
-    timeframe = data.get('timeframe', 'week')
+    timeframe = format_timeframe(data.get('since'), data.get('until'), default=data.get('timeframe', 'week'))
+    executor = data.get('executor', 'thread')
     
     try:
+        workers = int(data.get('workers', 1))
         if not os.path.exists(repo_path):
             return jsonify({'success': False, 'error': f'Repository path does not exist: {repo_path}'})
         
         if not os.path.exists(os.path.join(repo_path, '.git')):
             return jsonify({'success': False, 'error': f'Not a git repository: {repo_path}'})
         
-        analysis_app = CommitAnalysisApp(repo_path)
-        result = analysis_app.run_analysis(timeframe)
+        analysis_app = CommitAnalysisApp(repo_path, DEFAULT_STORAGE_PATH, workers=workers, executor=executor,
+                                         storage=_document_store(), result_cache=_result_cache())
+        try:
+            result = analysis_app.run_analysis(timeframe)
+        finally:
+            # Stops git processes and worker pools; reports stay readable through the store
+            analysis_app.close()
         
         return jsonify({
             'success': True,
             'report_id': result['report_id'],
             'summary': result['summary'],
-            'commit_count': result['commit_count']
+            'commit_count': result['commit_count'],
+            'cached': result.get('cached', False)
         })
     except IndexError as e:
         import traceback
@@ -59,6 +84,42 @@ def analyze_repo():
         error_details = traceback.format_exc()
         return jsonify({'success': False, 'error': str(e), 'details': error_details})
 
+@app.route('/api/analyze/multi', methods=['POST'])
+def analyze_repos():
+    global analysis_app
+    
+    data = request.json
+    repo_paths = list(data.get('repoPaths', []))
+    timeframe = format_timeframe(data.get('since'), data.get('until'), default=data.get('timeframe', 'week'))
+    
+    try:
+        concurrency = int(data.get('concurrency', 8))
+        if data.get('manifest'):
+            repo_paths.extend(load_repo_manifest(data['manifest']))
+        
+        if not repo_paths:
+            return jsonify({'success': False, 'error': 'No repositories given'})
+        
+        invalid = [path for path in repo_paths if not os.path.exists(os.path.join(path, '.git'))]
+        if invalid:
+            return jsonify({'success': False, 'error': f'Not git repositories: {", ".join(invalid)}'})
+        
+        analysis_app = MultiRepoAnalysisApp(repo_paths, DEFAULT_STORAGE_PATH, concurrency=concurrency,
+                                            storage=_document_store())
+        result = analysis_app.run_analysis(timeframe)
+        
+        return jsonify({
+            'success': True,
+            'report_id': result['report_id'],
+            'summary': result['summary'],
+            'commit_count': result['commit_count'],
+            'repositories': result['repositories']
+        })
+    except Exception as e:
+        import traceback
+        error_details = traceback.format_exc()
+        return jsonify({'success': False, 'error': str(e), 'details': error_details})
+
 @app.route('/api/reports/recent', methods=['GET'])
 def get_recent_reports():
     global analysis_app
@@ -76,11 +137,181 @@ def get_report(report_id):
     if not analysis_app:
         return jsonify({'error': 'No analysis app initialized'}), 404
     
-    report = analysis_app.get_report(report_id)
-    if report:
+    # ?section=<name> returns one section; per-commit sections are paginated
+    # with ?offset= and ?limit=
+    section = request.args.get('section')
+    if section:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', DEFAULT_SECTION_LIMIT))
+        result = analysis_app.get_report_section(report_id, section, offset, limit)
+        if result is None:
+            return jsonify({'error': 'Report section not found'}), 404
+        return jsonify(result)
+    
+    # ?fields=a,b returns only the listed top-level sections
+    fields = request.args.get('fields')
+    fields = [field for field in fields.split(',') if field] if fields else None
+    
+    report = analysis_app.get_report(report_id, fields)
+    if report is not None:
         return jsonify(report)
     else:
         return jsonify({'error': 'Report not found'}), 404
 
+@app.route('/api/reports/<report_id>/sections', methods=['GET'])
+def get_report_sections(report_id):
+    global analysis_app
+    
+    if not analysis_app:
+        return jsonify({'error': 'No analysis app initialized'}), 404
+    
+    return jsonify(analysis_app.storage.get_report_sections(report_id))
+
+@app.route('/api/reports/<report_id>/markdown', methods=['GET'])
+def stream_report_markdown(report_id):
+    # The report text is sent in chunks instead of one JSON document
+    chunks = iter_report_markdown(_stats_storage(), report_id)
+    if chunks is None:
+        return jsonify({'error': 'Report not found'}), 404
+    return Response(chunks, mimetype='text/markdown')
+
+def _document_store(storage_path: str = DEFAULT_STORAGE_PATH) -> DocumentStore:
+    """Process-wide store for a storage path, opened on first use."""
+    with document_stores_lock:
+        if storage_path not in document_stores:
+            document_stores[storage_path] = DocumentStore(storage_path)
+        return document_stores[storage_path]
+
+def _stats_storage() -> DocumentStore:
+    """Store queried by stats endpoints, usable before any analysis has run."""
+    if analysis_app:
+        return analysis_app.storage
+    return _document_store()
+
+def _result_cache() -> ResultCache:
+    """Result cache shared by every analysis request, so recent results stay in memory."""
+    global result_cache
+    
+    if result_cache is None:
+        result_cache = ResultCache(_stats_storage())
+    return result_cache
+
+def _stats_filters():
+    args = request.args
+    filters = {
+        'repo_path': args.get('repo'),
+        'since': args.get('since'),
+        'until': args.get('until'),
+        'author': args.get('author'),
+        'category': args.get('category'),
+        'risk': args.get('risk')
+    }
+    return {key: value for key, value in filters.items() if value}
+
+@app.route('/api/stats/commits', methods=['GET'])
+def get_commit_stats():
+    group_by = [key for key in request.args.get('groupBy', '').split(',') if key]
+    try:
+        return jsonify(_stats_storage().aggregate_commits(group_by, **_stats_filters()))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/stats/authors', methods=['GET'])
+def get_author_stats():
+    # Commits per author, optionally per period (?period=week)
+    group_by = ['author'] + ([request.args['period']] if request.args.get('period') else [])
+    try:
+        return jsonify(_stats_storage().aggregate_commits(group_by, **_stats_filters()))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/stats/categories', methods=['GET'])
+def get_category_stats():
+    return jsonify(_stats_storage().aggregate_commits(['category'], **_stats_filters()))
+
+@app.route('/api/stats/high-risk', methods=['GET'])
+def get_high_risk_commits():
+    filters = _stats_filters()
+    filters['risk'] = 'high'
+    try:
+        limit = int(request.args.get('limit', 50))
+        return jsonify(_stats_storage().list_commits(limit, order_by='impact', **filters))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/stats/files', methods=['GET'])
+def get_file_history():
+    # Commits that changed one file, newest first (?path=src/app.py)
+    path = request.args.get('path')
+    if not path:
+        return jsonify({'error': 'path is required'}), 400
+    try:
+        limit = int(request.args.get('limit', 50))
+        return jsonify(_stats_storage().list_file_changes(path, limit, repo_path=request.args.get('repo')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/stats/dashboard', methods=['GET'])
+def get_dashboard_rollup():
+    # Dashboard for ?since=&until= (ISO days) merged from stored daily partials
+    repo_paths = [path for path in request.args.get('repo', '').split(',') if path]
+    try:
+        return jsonify(rollup_dashboard(_stats_storage(), request.args.get('since'),
+                                        request.args.get('until'), repo_paths or None))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/export', methods=['POST'])
+def export_analyses():
+    data = request.json or {}
+    output_dir = data.get('outputDir', './data/export')
+    export_format = data.get('format', 'parquet')
+    
+    try:
+        result = ColumnarExporter(_stats_storage(), output_dir, export_format).export()
+        return jsonify({'success': True, **result})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ImportError as e:
+        return jsonify({'success': False, 'error': f'Export requires pyarrow: {e}'}), 500
+
+@app.route('/api/similar', methods=['POST'])
+def search_similar():
+    global analysis_app
+    
+    if not analysis_app:
+        return jsonify({'error': 'No analysis app initialized'}), 404
+    
+    data = request.json or {}
+    k = int(data.get('k', 5))
+    document_id = data.get('documentId')
+    vector = data.get('vector')
+    # Commit embeddings live in one namespace per embedding model version
+    namespace = data.get('namespace')
+    
+    try:
+        if vector is None and document_id:
+            # "Find commits like this one": search with the document's own embedding
+            vector = analysis_app.storage.retrieve_vector_embeddings(document_id, namespace)
+            if vector is None:
+                return jsonify({'error': f'No embedding stored for {document_id}'}), 404
+        if vector is None:
+            return jsonify({'error': 'Either vector or documentId is required'}), 400
+        
+        results = analysis_app.storage.search_similar(vector, k, exclude=document_id, namespace=namespace)
+        return jsonify({'success': True, 'results': results})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
 if __name__ == '__main__':
+    # Keep ./data bounded while analyses keep arriving
+    keep_days = os.environ.get('REPORT_KEEP_DAYS')
+    compactor = BackgroundCompactor(
+        _document_store(),
+        RetentionPolicy(int(os.environ.get('REPORT_KEEP_LAST', DEFAULT_KEEP_LAST)),
+                        float(keep_days) if keep_days else None)
+    )
+    # The reloader imports this module twice; only its child process serves requests
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        compactor.start()
     app.run(debug=True, port=5000)
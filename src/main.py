@@ -2,12 +2,27 @@
 Main application orchestrating the commit analysis workflow.
 """
 import argparse
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List, Optional  # Add this line
-from agents.commit_analyzer import CommitAnalyzerAgent
-from storage.document_store import DocumentStore
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional, Tuple  # Add this line
+from agents.base_agent import CommitAnalysis
+from agents.commit_analyzer import CommitAnalyzerAgent, DEFAULT_MAX_FILES_PER_COMMIT
+from agents.commit_index import complete_days, format_timeframe, resolve_dates
+from agents.commit_embedder import CommitEmbedder, DEFAULT_EMBEDDING_MODEL, DEFAULT_EMBEDDING_BATCH
+from agents.enhanced_report_generator import (DashboardPartial, EnhancedReportGenerator, ReportAccumulator, Writer,
+                                              iter_rendered, render_to_string)
+from agents.git_log import read_numstat_commits_async
+from storage.document_store import DocumentStore, REPORT_PAGE_SIZE
+from storage.retention import RetentionPolicy, run_maintenance
+from storage.export import ColumnarExporter, EXPORT_FORMATS
+from storage.result_cache import ResultCache, result_cache_key
+
+
+# Characters per chunk when streaming a stored report
+REPORT_CHUNK_CHARS = 64 * 1024
 
 
 class CommitAnalysisApp:
@@ -15,60 +30,577 @@ class CommitAnalysisApp:
     Main application class that orchestrates the entire workflow.
     """
     
-    def __init__(self, repo_path: str, storage_path: str = "./data"):
+    def __init__(self, repo_path: str, storage_path: str = "./data", extraction_mode: str = "per_commit",
+                 workers: int = 1, executor: str = "thread",
+                 max_files_per_commit: Optional[int] = DEFAULT_MAX_FILES_PER_COMMIT,
+                 storage: Optional[DocumentStore] = None, embedder: Optional[CommitEmbedder] = None,
+                 result_cache: Optional[ResultCache] = None):
         self.repo_path = Path(repo_path)
-        self.storage = DocumentStore(storage_path)
-        self.analyzer = CommitAnalyzerAgent(repo_path)
+        # A shared store lets several apps reuse one connection pool
+        self.storage = storage or DocumentStore(storage_path)
+        # A shared cache keeps recent results in memory across apps
+        self.result_cache = result_cache or ResultCache(self.storage)
+        self.analyzer = CommitAnalyzerAgent(repo_path, extraction_mode=extraction_mode,
+                                            workers=workers, executor=executor,
+                                            max_files_per_commit=max_files_per_commit,
+                                            index_dir=str(Path(storage_path) / "indexes"))
+        # Optional stage embedding commit messages and summaries for similarity search
+        self.embedder = embedder
+        
+        # Incremental state: commits are immutable, so stored analyses are reused
+        self.repo_key = str(self.repo_path.resolve())
+        self.known_hashes = self.storage.get_known_commit_hashes(self.repo_key, self.analyzer.analysis_settings)
     
-    def run_analysis(self, timeframe: str = "week") -> Dict[str, Any]:
+    def run_analysis(self, timeframe: str = "week", incremental: bool = True,
+                     streaming: bool = False) -> Dict[str, Any]:
         """
         Run complete analysis workflow.
+        
+        With incremental analysis only commits without a stored analysis are
+        processed; the rest are rehydrated from storage. Streaming analysis
+        writes commit analyses to storage batch by batch and keeps only
+        aggregates in memory.
+        
+        Results are cached by repository, HEAD, the window's commits and the
+        days its bounds cover, analyzer version and settings, so repeating an
+        unchanged analysis returns the stored report. A full (non-incremental)
+        run always reanalyzes and refreshes the cache.
+        """
+        fingerprint = self.analyzer.window_fingerprint(timeframe)
+        cache_key = None
+        if fingerprint is not None:
+            cache_key = result_cache_key(self.repo_key, fingerprint, self._resolve_window_bounds(timeframe),
+                                         streaming=streaming)
+            if incremental:
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    print(f"Reusing cached analysis for timeframe {timeframe}: report {cached['report_id']}")
+                    cached['cached'] = True
+                    return cached
+        
+        report_id, analysis_result = self._analyze_and_store(timeframe, incremental, streaming)
+        
+        result = {
+            'report_id': report_id,
+            'summary': analysis_result['report'],
+            'commit_count': analysis_result['commits_analyzed']
+        }
+        if cache_key is not None:
+            self.result_cache.put(cache_key, self.repo_key, fingerprint['head'], result)
+        return result
+    
+    def _analyze_and_store(self, timeframe: str, incremental: bool = True, streaming: bool = False,
+                           records: Optional[List[Dict[str, Any]]] = None) -> Tuple[str, Dict[str, Any]]:
+        """
+        Analyze the repository and store the report and new commit analyses.
+        
+        Args:
+            records: Commit records already extracted with numstat counts;
+                when given, git is not run again and no daily partials are
+                stored
+        
+        Returns:
+            The stored report ID and the full analysis result
         """
         print(f"Starting commit analysis for timeframe: {timeframe}")
         
+        known_hashes = self.known_hashes if incremental else None
+        stored_count = 0
+        write_timings = []
+        embedding_stats = []
+        
+        def store_batch(analyses: List[CommitAnalysis]):
+            nonlocal stored_count
+            stored, timings = self._store_new_analyses(analyses, incremental)
+            stored_count += len(stored)
+            write_timings.extend(timings)
+            if self.embedder is not None:
+                stats = self._embed_analyses(analyses)
+                if stats:
+                    embedding_stats.append(stats)
+        
+        # A relative window end moves during the run; resolving it first keeps coverage conservative
+        window_end = self._resolve_window_bounds(timeframe)[1]
+        
         # Step 1: Run analysis
-        analysis_result = self.analyzer.process(timeframe)
+        if records is not None:
+            analysis_result = self.analyzer.process_records(records, timeframe, known_hashes, self._load_known_analyses)
+            store_batch(analysis_result['detailed_analysis'])
+        elif streaming:
+            analysis_result = self.analyzer.process_stream(
+                timeframe, store_batch, known_hashes, self._load_known_analyses
+            )
+        else:
+            analysis_result = self.analyzer.process(timeframe, known_hashes, self._load_known_analyses)
+            store_batch(analysis_result['detailed_analysis'])
         
-        # Step 2: Store results
-        report_id = self.storage.store_analysis_report(analysis_result)
+        # Step 2: Store results; daily partials go to their own table
+        dashboard_partials = analysis_result.pop('dashboard_partials', {})
+        report_id = self.storage.store_analysis_report(analysis_result, self.repo_key)
+        analysis_result['dashboard_partials'] = dashboard_partials
+        # `git log --since` stops at the first commit older than the window, so
+        # only windows read from the commit index are known to be complete
+        if records is None and self.analyzer.commit_index is not None:
+            self._store_dashboard_partials(timeframe, dashboard_partials, window_end)
         
-        # Store individual commit analyses
-        for commit_analysis in analysis_result['detailed_analysis']:
-            self.storage.store_commit_analysis(commit_analysis)
+        print(f"Analysis complete. Report ID: {report_id} "
+              f"({stored_count} new, {analysis_result['commits_analyzed'] - stored_count} reused)")
+        if write_timings:
+            print(f"Stored {stored_count} commit analyses in {len(write_timings)} batches "
+                  f"({sum(t['seconds'] for t in write_timings):.2f}s)")
+        if embedding_stats:
+            # The search index is only written once per run, not per batch
+            self.storage.vector_store(self.embedder.namespace).flush()
+            embedded = sum(s['embedded'] for s in embedding_stats)
+            seconds = sum(s['seconds'] for s in embedding_stats)
+            rate = embedded / seconds if seconds else 0.0
+            print(f"Embedded {embedded} commits ({sum(s['cached'] for s in embedding_stats)} cached), "
+                  f"{rate:.1f} embeddings/s")
         
-        print(f"Analysis complete. Report ID: {report_id}")
+        return report_id, analysis_result
+    
+    def _resolve_window_bounds(self, timeframe: str) -> Tuple[Optional[int], Optional[int]]:
+        """Resolve the analysis window to Unix timestamps, or (None, None) if git cannot."""
+        try:
+            return resolve_dates(self.repo_path, *self.analyzer._resolve_window(timeframe))
+        except Exception as e:
+            print(f"Could not resolve timeframe {timeframe}: {e}")
+            return None, None
+    
+    def _store_dashboard_partials(self, timeframe: str, partials: Dict[date, DashboardPartial],
+                                  window_end: Optional[int]):
+        """
+        Store the dashboard partials of days the analysis window wholly covers.
+        
+        Days at the edges of the window may be missing commits and are
+        skipped; covered days without commits get an empty partial.
+        """
+        since_ts = self._resolve_window_bounds(timeframe)[0]
+        first_day, last_day = complete_days(since_ts, window_end)
+        if first_day is None:
+            # The window starts at the first commit
+            if not partials:
+                return
+            first_day = min(partials)
+        
+        covered = {}
+        day = first_day
+        while day <= last_day:
+            covered[day.isoformat()] = (partials.get(day) or DashboardPartial()).to_dict()
+            day += timedelta(days=1)
+        if covered:
+            self.storage.store_dashboard_partials(self.repo_key, covered)
+    
+    def _store_new_analyses(self, analyses: List[CommitAnalysis],
+                            incremental: bool) -> Tuple[List[CommitAnalysis], List[Dict[str, Any]]]:
+        """
+        Store commit analyses that are not already stored.
+        
+        Returns:
+            The newly stored analyses and the per-batch write timings
+        """
+        new_analyses = [
+            commit_analysis for commit_analysis in analyses
+            if not incremental or commit_analysis.commit_hash not in self.known_hashes
+        ]
+        timings = self.storage.store_commit_analyses(new_analyses, self.repo_key,
+                                                     settings=self.analyzer.analysis_settings)
+        
+        self.known_hashes.update(
+            commit_analysis.commit_hash for commit_analysis in new_analyses
+            if commit_analysis.category != 'unknown'
+        )
+        return new_analyses, timings
+    
+    def _embed_analyses(self, analyses: List[CommitAnalysis]) -> Optional[Dict[str, Any]]:
+        """Embed analyzed commits missing from the embedding cache."""
+        usable = [analysis for analysis in analyses if analysis.category != 'unknown']
+        try:
+            return self.embedder.embed(usable, self.storage.vector_store(self.embedder.namespace))
+        except ImportError as e:
+            print(f"Skipping embeddings: {e}")
+            self.embedder = None
+            return None
+    
+    def _load_known_analyses(self, commit_hashes: List[str]) -> Dict[str, CommitAnalysis]:
+        """Rehydrate stored analyses for the given commits."""
+        records = self.storage.load_commit_analyses(commit_hashes, self.repo_key)
+        return {commit_hash: CommitAnalysis.from_dict(record) for commit_hash, record in records.items()}
+    
+    def get_recent_reports(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get recently generated reports."""
+        return self.storage.get_recent_reports(limit)
+    
+    def get_report(self, report_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve a specific report, optionally only some of its sections."""
+        return self.storage.retrieve_report(report_id, fields=fields)
+    
+    def get_report_section(self, report_id: str, section: str, offset: int = 0,
+                           limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve one section of a report, paginating per-commit entries."""
+        return self.storage.retrieve_report_section(report_id, section, offset, limit)
+    
+    def close(self):
+        """
+        Stop the analyzer's git processes and worker pools.
+        
+        The store stays open, since it may be shared; stored reports can
+        still be read afterwards.
+        """
+        self.analyzer.close()
+
+
+class MultiRepoAnalysisApp:
+    """
+    Analyzes many repositories in one run and builds a combined dashboard.
+    
+    Git extraction for every repository runs as an asyncio subprocess under
+    a global concurrency limit. Analysis and storage of each repository run
+    on a thread pool, overlapping with extraction of the others.
+    """
+    
+    def __init__(self, repo_paths: List[str], storage_path: str = "./data", concurrency: int = 8,
+                 max_files_per_commit: Optional[int] = DEFAULT_MAX_FILES_PER_COMMIT,
+                 embedder: Optional[CommitEmbedder] = None, storage: Optional[DocumentStore] = None):
+        self.repo_paths = list(repo_paths)
+        self.storage_path = storage_path
+        self.storage = storage or DocumentStore(storage_path)
+        self.concurrency = max(1, concurrency)
+        self.max_files_per_commit = max_files_per_commit
+        # Shared so the embedding model is loaded once for all repositories
+        self.embedder = embedder
+        self.report_generator = EnhancedReportGenerator()
+    
+    def run_analysis(self, timeframe: str = "week", incremental: bool = True) -> Dict[str, Any]:
+        """
+        Analyze every repository and store one report per repository plus a
+        combined cross-repository report.
+        """
+        return asyncio.run(self._run_all(timeframe, incremental))
+    
+    async def _run_all(self, timeframe: str, incremental: bool) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        dashboard = DashboardPartial()
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            repositories = await asyncio.gather(*(
+                self._analyze_repo(repo_path, timeframe, incremental, semaphore, executor, dashboard)
+                for repo_path in self.repo_paths
+            ))
+        
+        dashboard_summary = dashboard.summary()
+        report = self._generate_combined_report(dashboard_summary, repositories)
+        
+        report_id = self.storage.store_analysis_report({
+            'timeframe': timeframe,
+            'commits_analyzed': dashboard.total_commits,
+            'report': report,
+            'detailed_analysis': [],
+            'dashboard_summary': dashboard_summary,
+            'non_technical_summaries': [],
+            'repositories': repositories
+        })
         
         return {
             'report_id': report_id,
-            'summary': analysis_result['report'],
-            'commit_count': analysis_result['commits_analyzed']
+            'summary': report,
+            'commit_count': dashboard.total_commits,
+            'repositories': repositories
         }
     
+    async def _analyze_repo(self, repo_path: str, timeframe: str, incremental: bool,
+                            semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor,
+                            dashboard: DashboardPartial) -> Dict[str, Any]:
+        """Extract, analyze and store one repository, isolating its failures."""
+        app = None
+        try:
+            app = CommitAnalysisApp(repo_path, self.storage_path, extraction_mode="bulk",
+                                    max_files_per_commit=self.max_files_per_commit,
+                                    storage=self.storage, embedder=self.embedder)
+            
+            since, until = app.analyzer._resolve_window(timeframe)
+            async with semaphore:
+                records = await read_numstat_commits_async(
+                    repo_path, since, self.max_files_per_commit, until=until
+                )
+            
+            loop = asyncio.get_running_loop()
+            report_id, analysis_result = await loop.run_in_executor(
+                executor, app._analyze_and_store, timeframe, incremental, False, records
+            )
+        except Exception as e:
+            print(f"Error analyzing repository {repo_path}: {e}")
+            return {'repo_path': repo_path, 'error': str(e)}
+        finally:
+            if app is not None:
+                app.close()
+        
+        # Runs on the event loop thread, so merging needs no locking
+        for partial in analysis_result.get('dashboard_partials', {}).values():
+            dashboard.merge(partial)
+        
+        dashboard_summary = analysis_result.get('dashboard_summary', {})
+        return {
+            'repo_path': repo_path,
+            'report_id': report_id,
+            'commit_count': analysis_result['commits_analyzed'],
+            'high_risk_commits': dashboard_summary.get('high_risk_commits', 0),
+            'active_contributors': dashboard_summary.get('active_contributors', 0)
+        }
+    
+    def _generate_combined_report(self, dashboard_summary: Dict[str, Any],
+                                  repositories: List[Dict[str, Any]]) -> str:
+        """Build the cross-repository summary report."""
+        return render_to_string(self._write_combined_report, dashboard_summary, repositories)
+    
+    def _write_combined_report(self, dashboard_summary: Dict[str, Any],
+                               repositories: List[Dict[str, Any]], write: Writer):
+        """Write the cross-repository summary report."""
+        if not dashboard_summary['total_commits']:
+            write("No commits found in the specified timeframe.\n\n")
+        else:
+            self.report_generator.write_executive_summary(dashboard_summary, write)
+            write("\n")
+        
+        write("## Repositories\n")
+        for repo in sorted(repositories, key=lambda r: r.get('commit_count', 0), reverse=True):
+            if 'error' in repo:
+                write(f"- **{repo['repo_path']}**: failed ({repo['error']})\n")
+            else:
+                write(f"- **{repo['repo_path']}**: {repo['commit_count']} commits, "
+                      f"{repo['high_risk_commits']} high-risk, report `{repo['report_id']}`\n")
+    
     def get_recent_reports(self, limit: int = 5) -> List[Dict[str, Any]]:
         """Get recently generated reports."""
         return self.storage.get_recent_reports(limit)
     
-    def get_report(self, report_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a specific report."""
-        return self.storage.retrieve_report(report_id)
+    def get_report(self, report_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve a specific report, optionally only some of its sections."""
+        return self.storage.retrieve_report(report_id, fields=fields)
+    
+    def get_report_section(self, report_id: str, section: str, offset: int = 0,
+                           limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Retrieve one section of a report, paginating per-commit entries."""
+        return self.storage.retrieve_report_section(report_id, section, offset, limit)
+
+
+def load_repo_manifest(manifest_path: str) -> List[str]:
+    """
+    Read repository paths from a manifest.
+    
+    JSON manifests hold a list of paths (or {"path": ...} objects), optionally
+    under a "repos" key; any other file lists one path per line, with blank
+    lines and '#' comments ignored. Relative paths are resolved against the
+    manifest's directory.
+    """
+    manifest = Path(manifest_path)
+    with open(manifest, 'r') as f:
+        if manifest.suffix == '.json':
+            data = json.load(f)
+            entries = data.get('repos', []) if isinstance(data, dict) else data
+            paths = [entry['path'] if isinstance(entry, dict) else entry for entry in entries]
+        else:
+            paths = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    
+    return [str((manifest.parent / path).resolve()) for path in paths]
+
+
+def maintain_storage(storage: DocumentStore, retention: RetentionPolicy, compact: bool = False):
+    """Apply the retention policy and compact storage when requested."""
+    if not retention.enabled and not compact:
+        return
+    
+    result = run_maintenance(storage, retention)
+    print(f"Storage maintenance: {result['expired_reports']} reports rolled up, "
+          f"{result['removed_files']} files removed ({result['freed_bytes']} bytes)"
+          f"{', database vacuumed' if result['vacuumed'] else ''}")
+
+
+def export_analyses(storage: DocumentStore, output_dir: str, export_format: str = 'parquet'):
+    """Export new commit analyses to columnar files."""
+    result = ColumnarExporter(storage, output_dir, export_format).export()
+    print(f"Exported {result['commit_rows']} commits and {result['file_rows']} file changes "
+          f"in {result['partitions_written']} partitions to {output_dir}")
+
+
+def iter_report_markdown(storage: DocumentStore, report_id: str,
+                         chunk_size: int = REPORT_CHUNK_CHARS) -> Optional[Iterator[str]]:
+    """
+    Stream the markdown of a stored report in chunks, e.g. to an HTTP response.
+    
+    Reports that kept their per-commit summaries are rendered again from
+    the stored sections through the report writers, so the text is written
+    out as it is rendered rather than loaded as one string. Streamed and
+    cross-repository reports keep no summaries and are sent as stored.
+    
+    Returns:
+        An iterator of chunks, or None if the report does not exist
+    """
+    report = storage.retrieve_report(report_id, fields=['commits_analyzed', 'dashboard_summary'])
+    if report is None:
+        return None
+    
+    summaries = storage.retrieve_report_section(report_id, 'non_technical_summaries', limit=0)
+    if report.get('dashboard_summary') and summaries and summaries['total'] == report.get('commits_analyzed'):
+        # The timeline needs every summary; they are read one stored page at a time
+        accumulator = ReportAccumulator(keep_timeline=True)
+        for offset in range(0, summaries['total'], REPORT_PAGE_SIZE):
+            page = storage.retrieve_report_section(report_id, 'non_technical_summaries', offset, REPORT_PAGE_SIZE)
+            for summary in page['items']:
+                accumulator.add(summary)
+        return iter_rendered(EnhancedReportGenerator().write_report, report['dashboard_summary'], accumulator,
+                             chunk_size=chunk_size)
+    
+    text = (storage.retrieve_report(report_id, fields=['report']) or {}).get('report') or ''
+    return (text[offset:offset + chunk_size] for offset in range(0, len(text), chunk_size))
+
+
+def rollup_dashboard(storage: DocumentStore, since_day: Optional[str] = None, until_day: Optional[str] = None,
+                     repo_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Build a dashboard summary by merging stored daily partials, without running git.
+    
+    Args:
+        storage: Store holding the partials
+        since_day: First ISO day of the window; defaults to the first stored day
+        until_day: Last ISO day of the window; defaults to the last stored day
+        repo_paths: Repositories to include; all stored repositories by default
+    
+    Returns:
+        The merged dashboard_summary, the number of repository-days merged
+        and, per repository, the days in the window that have no stored
+        partial (their commits are not in the summary)
+    """
+    # Normalizes the bounds and rejects anything that is not an ISO day
+    since_day = date.fromisoformat(since_day).isoformat() if since_day else None
+    until_day = date.fromisoformat(until_day).isoformat() if until_day else None
+    
+    rows = []
+    for repo_path in repo_paths or [None]:
+        rows.extend(storage.load_dashboard_partials(repo_path, since_day, until_day))
+    
+    dashboard = DashboardPartial.merged(DashboardPartial.from_dict(row['partial']) for row in rows)
+    
+    stored_days = {}
+    for row in rows:
+        stored_days.setdefault(row['repo_path'], set()).add(row['day'])
+    all_days = [row['day'] for row in rows]
+    first_day = date.fromisoformat(since_day or min(all_days, default=date.today().isoformat()))
+    last_day = date.fromisoformat(until_day or max(all_days, default=first_day.isoformat()))
+    
+    missing_days = {}
+    for repo_path in repo_paths or sorted(stored_days):
+        days = stored_days.get(repo_path, set())
+        missing = []
+        day = first_day
+        while day <= last_day:
+            if day.isoformat() not in days:
+                missing.append(day.isoformat())
+            day += timedelta(days=1)
+        if missing:
+            missing_days[repo_path] = missing
+    
+    return {
+        'since': first_day.isoformat(),
+        'until': last_day.isoformat(),
+        'days_merged': len(rows),
+        'missing_days': missing_days,
+        'dashboard_summary': dashboard.summary()
+    }
 
 
 def main():
     parser = argparse.ArgumentParser(description='Commit Analysis Agent')
-    parser.add_argument('repo_path', help='Path to the git repository')
+    parser.add_argument('repo_paths', nargs='*', help='Path(s) to the git repositories')
+    parser.add_argument('--manifest',
+                        help='File listing repositories to analyze together (JSON list or one path per line)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Maximum repositories extracted at once in multi-repository mode')
     parser.add_argument('--timeframe', default='week', 
-                        help='Analysis timeframe (week, month, or specific date range)')
+                        help='Analysis timeframe (week, month, a git date or a SINCE..UNTIL range)')
+    parser.add_argument('--since',
+                        help='Start of an explicit date range (overrides --timeframe)')
+    parser.add_argument('--until',
+                        help='End of an explicit date range (overrides --timeframe)')
     parser.add_argument('--storage', default='./data',
                         help='Path to store analysis results')
+    parser.add_argument('--extraction', default='per_commit', choices=['per_commit', 'bulk'],
+                        help='Commit extraction mode (bulk streams a single git log --numstat)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of parallel workers for per-commit analysis; '
+                             'each extraction thread runs its own git diff-tree process')
+    parser.add_argument('--executor', default='thread', choices=['thread', 'process'],
+                        help='Pool used for summaries (process suits CPU-bound heuristics)')
+    parser.add_argument('--max-files', type=int, default=DEFAULT_MAX_FILES_PER_COMMIT,
+                        help='Maximum file paths kept per commit; 0 keeps every path')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream commits through the pipeline with bounded memory')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-analyze every commit instead of reusing stored analyses')
+    parser.add_argument('--embed', nargs='?', const=DEFAULT_EMBEDDING_MODEL, metavar='MODEL',
+                        help='Embed commit messages and summaries with a local sentence-transformers '
+                             f'model (default: {DEFAULT_EMBEDDING_MODEL})')
+    parser.add_argument('--embed-batch', type=int, default=DEFAULT_EMBEDDING_BATCH,
+                        help='Texts per embedding batch')
+    parser.add_argument('--keep-last', type=int,
+                        help='Reports kept per repository and timeframe; older ones are rolled up')
+    parser.add_argument('--keep-days', type=float,
+                        help='Roll up and remove reports older than this many days')
+    parser.add_argument('--compact', action='store_true',
+                        help='Delete unreferenced report files and optimize the database after the run')
+    parser.add_argument('--export', metavar='DIR',
+                        help='Export commit analyses as columnar files partitioned by repo and month '
+                             '(runs alone when no repository is given)')
+    parser.add_argument('--export-format', default='parquet', choices=EXPORT_FORMATS,
+                        help='File format for --export')
+    parser.add_argument('--rollup', action='store_true',
+                        help='Print a dashboard for --since/--until (ISO days) merged from stored daily '
+                             'summaries of the given repositories, or all of them, without running git')
     
     args = parser.parse_args()
     
-    app = CommitAnalysisApp(args.repo_path, args.storage)
-    result = app.run_analysis(args.timeframe)
+    repo_paths = list(args.repo_paths)
+    if args.manifest:
+        repo_paths.extend(load_repo_manifest(args.manifest))
+    if args.rollup:
+        result = rollup_dashboard(DocumentStore(args.storage), args.since, args.until,
+                                  [str(Path(path).resolve()) for path in repo_paths] or None)
+        print(json.dumps(result, indent=2))
+        return
+    if not repo_paths and args.export:
+        export_analyses(DocumentStore(args.storage), args.export, args.export_format)
+        return
+    if not repo_paths:
+        parser.error('at least one repository path or --manifest is required')
+    
+    timeframe = format_timeframe(args.since, args.until, default=args.timeframe)
+    embedder = CommitEmbedder(args.embed, batch_size=args.embed_batch) if args.embed else None
+    retention = RetentionPolicy(args.keep_last, args.keep_days)
+    
+    if len(repo_paths) > 1 or args.manifest:
+        multi_app = MultiRepoAnalysisApp(repo_paths, args.storage, concurrency=args.concurrency,
+                                         max_files_per_commit=args.max_files or None, embedder=embedder)
+        result = multi_app.run_analysis(timeframe, incremental=not args.full)
+        
+        print("\n=== Cross-Repository Summary ===")
+        print(result['summary'])
+        print(f"\nCombined report saved with ID: {result['report_id']}")
+        maintain_storage(multi_app.storage, retention, args.compact)
+        if args.export:
+            export_analyses(multi_app.storage, args.export, args.export_format)
+        return
+    
+    app = CommitAnalysisApp(repo_paths[0], args.storage, extraction_mode=args.extraction,
+                            workers=args.workers, executor=args.executor,
+                            max_files_per_commit=args.max_files or None, embedder=embedder)
+    result = app.run_analysis(timeframe, incremental=not args.full, streaming=args.stream)
     
     print("\n=== Analysis Summary ===")
     print(result['summary'])
     print(f"\nDetailed report saved with ID: {result['report_id']}")
+    maintain_storage(app.storage, retention, args.compact)
+    if args.export:
+        export_analyses(app.storage, args.export, args.export_format)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+"""
+Pooled SQLite connections shared by the storage layer.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+
+# Applied to every new connection; journal_mode=WAL is persisted in the file
+# and lets readers (e.g. API requests) proceed while a writer is active
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+class ConnectionManager:
+    """
+    Small pool of SQLite connections to one database file.
+
+    A connection is checked out for the duration of a `cursor()` or
+    `transaction()` block and returned to the pool afterwards, so the
+    Flask server's request threads share a few long-lived connections
+    instead of reconnecting on every call. Nested blocks on the same
+    thread reuse the connection already checked out.
+    """
+
+    def __init__(self, db_path: Union[str, Path], pool_size: int = 4, timeout: float = 30.0):
+        self.db_path = Path(db_path)
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections move between threads through the pool but are only
+        # ever used by the thread that checked them out
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the current thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            if conn.in_transaction:
+                conn.rollback()
+            if self._pool.qsize() < self.pool_size:
+                self._pool.put(conn)
+            else:
+                conn.close()
+
+    @contextmanager
+    def cursor(self) -> Iterator[sqlite3.Cursor]:
+        """Cursor for read queries."""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """
+        Cursor whose writes are committed together when the block exits.
+
+        The transaction is rolled back if the block raises. Nested blocks
+        join the outermost transaction.
+        """
+        with self.connection() as conn:
+            outermost = not getattr(self._local, 'in_transaction', False)
+            self._local.in_transaction = True
+            cursor = conn.cursor()
+            try:
+                if outermost and not conn.in_transaction:
+                    # Explicit BEGIN so schema changes are transactional too
+                    cursor.execute("BEGIN")
+                yield cursor
+                if outermost:
+                    conn.commit()
+            except Exception:
+                if outermost:
+                    conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                if outermost:
+                    self._local.in_transaction = False
+
+    def close(self):
+        """Close every pooled connection."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
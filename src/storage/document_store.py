@@ -2,12 +2,55 @@
 Document storage system for commit analysis results.
 """
 
+import gzip
+import hashlib
 import json
+import os
 import pickle
+import threading
+import time
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from datetime import datetime
-import sqlite3
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from datetime import datetime, timedelta
+from .connection import ConnectionManager
+from . import serialization
+
+
+# Commit analyses written per transaction by store_commit_analyses
+DEFAULT_WRITE_BATCH = 1000
+
+# Unreferenced report files younger than this are left alone by compaction,
+# since a concurrent run may be about to insert the row pointing at them
+ORPHAN_GRACE_SECONDS = 3600
+
+# Free pages, as a share of the database, that make automatic compaction VACUUM
+VACUUM_FREE_RATIO = 0.2
+
+# Report sections holding one entry per commit; they are stored in pages so
+# a slice can be read without loading the rest of the list
+PAGED_SECTIONS = ('detailed_analysis', 'non_technical_summaries')
+
+# Entries per stored page of a paged report section
+REPORT_PAGE_SIZE = 500
+
+# Commit dates are stored in ISO format with the author's own UTC offset, so
+# their first ten characters are the author's local day. Grouping on this
+# instead of date(), which converts to UTC, puts each commit on the same day
+# the since/until filters and the columnar export see
+LOCAL_DAY = "substr(date, 1, 10)"
+
+# SQL expressions commit statistics can be grouped by
+STAT_GROUPS = {
+    'author': "authors.name",
+    'category': "category",
+    'risk': "risk_assessment",
+    'repo': "repo_path",
+    'day': LOCAL_DAY,
+    # Monday of the commit's week; date() of a bare day applies no offset
+    'week': f"date({LOCAL_DAY}, 'weekday 0', '-6 days')",
+    'month': "substr(date, 1, 7)",
+}
 
 
 class DocumentStore:
@@ -21,14 +64,21 @@ class DocumentStore:
         
         # Initialize SQLite database for metadata
         self.db_path = self.storage_path / "analysis_db.sqlite"
+        self.db = ConnectionManager(self.db_path)
         self._init_database()
+        
+        self._vector_stores = {}
+        # Author and file path IDs, filled as analyses are stored
+        self._id_cache = {'authors': {}, 'files': {}}
     
     def _init_database(self):
         """Initialize SQLite database for metadata storage."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables
+        with self.db.transaction() as cursor:
+            self._create_tables(cursor)
+            self._migrate(cursor)
+    
+    def _create_tables(self, cursor):
+        """Create tables and add columns missing from older databases."""
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS analysis_reports (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -54,117 +104,988 @@ class DocumentStore:
             )
         """)
         
-        conn.commit()
-        conn.close()
+        # Columns added after the original schema
+        self._ensure_column(cursor, 'commit_analyses', 'repo_path', 'TEXT')
     
-    def store_analysis_report(self, report: Dict[str, Any]) -> str:
-        """Store complete analysis report."""
-        report_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        report_path = self.storage_path / f"{report_id}.json"
+    def _ensure_column(self, cursor, table: str, column: str, definition: str):
+        """Add a column to an existing table if it is not there yet."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    
+    def _migrate(self, cursor):
+        """
+        Upgrade the schema in place.
         
-        # Save full report to file with custom serialization
-        with open(report_path, 'w') as f:
-            # Convert any non-serializable objects to dicts
-            serializable_report = self._make_serializable(report)
-            json.dump(serializable_report, f, indent=2, default=str)
+        PRAGMA user_version records the last migration applied, so each
+        migration runs exactly once per database file, inside the same
+        transaction as the version bump.
+        """
+        migrations = [
+            self._migration_indexed_lookups,
+            self._migration_report_blobs,
+            self._migration_report_retention,
+            self._migration_commit_stats,
+            self._migration_report_sections,
+            self._migration_normalized_commits,
+            self._migration_dashboard_partials,
+            self._migration_result_cache,
+            self._migration_analysis_settings,
+            self._migration_repo_commit_key,
+        ]
         
-        # Store metadata in database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        for target, migration in enumerate(migrations, start=1):
+            if version < target:
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {target}")
+    
+    def _migration_indexed_lookups(self, cursor):
+        """Promote report_id to an indexed column and index dashboard queries."""
+        self._ensure_column(cursor, 'analysis_reports', 'report_id', 'TEXT')
+        
+        # Backfill report IDs that older versions only kept in the metadata JSON
+        cursor.execute("SELECT id, metadata FROM analysis_reports WHERE report_id IS NULL")
+        backfill = []
+        for row_id, metadata in cursor.fetchall():
+            try:
+                report_id = json.loads(metadata or '{}').get('report_id')
+            except (ValueError, AttributeError):
+                report_id = None
+            if report_id:
+                backfill.append((report_id, row_id))
+        cursor.executemany("UPDATE analysis_reports SET report_id = ? WHERE id = ?", backfill)
+        
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_reports_report_id ON analysis_reports (report_id)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reports_created_at
+            ON analysis_reports (created_at, timeframe, commit_count)
+        """)
+        
+        # Covers the known-hash lookup for incremental runs
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_commits_repo_category
+            ON commit_analyses (repo_path, category, commit_hash)
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_author ON commit_analyses (author, date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_date ON commit_analyses (date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_category ON commit_analyses (category, impact_score)")
+    
+    def _migration_report_blobs(self, cursor):
+        """Track the content hash of reports stored as compressed blobs."""
+        self._ensure_column(cursor, 'analysis_reports', 'content_hash', 'TEXT')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reports_content_hash ON analysis_reports (content_hash)")
+    
+    def _migration_report_retention(self, cursor):
+        """Attribute reports to repositories and add rollups for expired reports."""
+        self._ensure_column(cursor, 'analysis_reports', 'repo_path', 'TEXT')
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_reports_repo_timeframe
+            ON analysis_reports (repo_path, timeframe, created_at)
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS report_rollups (
+                repo_path TEXT NOT NULL DEFAULT '',
+                timeframe TEXT NOT NULL,
+                day TEXT NOT NULL,
+                report_count INTEGER NOT NULL,
+                commit_count INTEGER NOT NULL,
+                max_commit_count INTEGER NOT NULL,
+                first_created_at TIMESTAMP,
+                last_created_at TIMESTAMP,
+                PRIMARY KEY (repo_path, timeframe, day)
+            )
+        """)
+    
+    def _migration_commit_stats(self, cursor):
+        """Index the filters used by commit statistics."""
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_repo_date ON commit_analyses (repo_path, date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_risk_date ON commit_analyses (risk_assessment, date)")
+    
+    def _migration_report_sections(self, cursor):
+        """Store reports as separately addressable sections."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS report_sections (
+                report_id TEXT NOT NULL,
+                section TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                item_count INTEGER,
+                content_hash TEXT NOT NULL,
+                PRIMARY KEY (report_id, section, page)
+            ) WITHOUT ROWID
+        """)
+    
+    def _migration_normalized_commits(self, cursor):
+        """
+        Move authors and changed files of commit analyses into lookup tables.
         
+        Author names and file paths are stored once and referenced by
+        integer ID; per-file line counts become commit_files rows. Existing
+        analyses are converted and their raw_data no longer repeats paths.
+        """
         cursor.execute("""
-            INSERT INTO analysis_reports 
-            (timeframe, created_at, commit_count, report_path, metadata)
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS commit_files (
+                commit_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                file_id INTEGER NOT NULL,
+                insertions INTEGER,
+                deletions INTEGER,
+                PRIMARY KEY (commit_id, position)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commit_files_file ON commit_files (file_id, commit_id)")
+        self._ensure_column(cursor, 'commit_analyses', 'author_id', 'INTEGER')
+        
+        cursor.execute("SELECT id, author, raw_data FROM commit_analyses WHERE author_id IS NULL")
+        rows = [(commit_id, author, serialization.loads(raw_data) if raw_data else {})
+                for commit_id, author, raw_data in cursor.fetchall()]
+        author_ids = self._intern(cursor, 'authors', 'name', [row[1] for row in rows if row[1] is not None])
+        file_ids = self._intern(cursor, 'files', 'path',
+                                [path for _, _, record in rows for path in record.get('files_changed', [])])
+        
+        updates = []
+        file_rows = []
+        for commit_id, author, record in rows:
+            files_changed = record.pop('files_changed', [])
+            file_stats = record.pop('file_stats', {})
+            file_rows.extend(self._commit_file_rows(commit_id, files_changed, file_stats, file_ids))
+            updates.append((author_ids.get(author), serialization.dumps(record).decode('utf-8'), commit_id))
+        
+        # The author column stays, since older SQLite versions cannot drop
+        # columns, but is emptied and no longer written
+        cursor.executemany("UPDATE commit_analyses SET author_id = ?, author = NULL, raw_data = ? WHERE id = ?", updates)
+        cursor.executemany("""
+            INSERT OR REPLACE INTO commit_files (commit_id, position, file_id, insertions, deletions)
             VALUES (?, ?, ?, ?, ?)
-        """, (
-            report['timeframe'],
-            datetime.now().isoformat(),
-            report['commits_analyzed'],
-            str(report_path),
-            json.dumps({'report_id': report_id})
-        ))
+        """, file_rows)
+        
+        cursor.execute("DROP INDEX IF EXISTS idx_commits_author")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_author_id ON commit_analyses (author_id, date)")
+    
+    def _migration_dashboard_partials(self, cursor):
+        """Keep mergeable dashboard aggregates per repository and day."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS dashboard_partials (
+                repo_path TEXT NOT NULL,
+                day TEXT NOT NULL,
+                commit_count INTEGER NOT NULL,
+                partial TEXT NOT NULL,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (repo_path, day)
+            ) WITHOUT ROWID
+        """)
+    
+    def _migration_result_cache(self, cursor):
+        """Remember which stored report answers a repeated analysis."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                cache_key TEXT PRIMARY KEY,
+                repo_path TEXT NOT NULL,
+                head TEXT,
+                report_id TEXT NOT NULL,
+                commit_count INTEGER NOT NULL,
+                created_at TIMESTAMP,
+                last_used_at TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_last_used ON result_cache (last_used_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_repo ON result_cache (repo_path, head)")
+    
+    def _migration_analysis_settings(self, cursor):
+        """
+        Record the analyzer settings each commit analysis was made with.
+        
+        Existing rows have none, so incremental runs analyze them again.
+        The unused repo_watermarks table is dropped.
+        """
+        self._ensure_column(cursor, 'commit_analyses', 'analysis_settings', 'TEXT')
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_commits_repo_settings
+            ON commit_analyses (repo_path, analysis_settings, category, commit_hash)
+        """)
+        cursor.execute("DROP TABLE IF EXISTS repo_watermarks")
+    
+    def _migration_repo_commit_key(self, cursor):
+        """
+        Key commit analyses by repository and commit hash.
+        
+        Forks and clones share commits, and a globally unique hash let each
+        repository overwrite the other's rows. SQLite cannot drop a column
+        constraint, so the table is rebuilt; row IDs are kept, so
+        commit_files rows still point at their commits.
+        """
+        columns = ("id, commit_hash, author, date, category, impact_score, risk_assessment, summary, raw_data, "
+                   "repo_path, author_id, analysis_settings")
+        cursor.execute("""
+            CREATE TABLE commit_analyses_keyed (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                commit_hash TEXT NOT NULL,
+                author TEXT,
+                date TIMESTAMP,
+                category TEXT,
+                impact_score REAL,
+                risk_assessment TEXT,
+                summary TEXT,
+                raw_data JSON,
+                repo_path TEXT,
+                author_id INTEGER,
+                analysis_settings TEXT
+            )
+        """)
+        cursor.execute(f"INSERT INTO commit_analyses_keyed ({columns}) SELECT {columns} FROM commit_analyses")
+        cursor.execute("DROP TABLE commit_analyses")
+        cursor.execute("ALTER TABLE commit_analyses_keyed RENAME TO commit_analyses")
+        
+        # Analyses stored without a repository share one key space
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_commits_repo_hash
+            ON commit_analyses (COALESCE(repo_path, ''), commit_hash)
+        """)
+        # Indexes of earlier migrations were dropped with the old table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_commits_repo_category
+            ON commit_analyses (repo_path, category, commit_hash)
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_date ON commit_analyses (date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_category ON commit_analyses (category, impact_score)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_repo_date ON commit_analyses (repo_path, date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_risk_date ON commit_analyses (risk_assessment, date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_commits_author_id ON commit_analyses (author_id, date)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_commits_repo_settings
+            ON commit_analyses (repo_path, analysis_settings, category, commit_hash)
+        """)
+    
+    def store_analysis_report(self, report: Dict[str, Any], repo_path: Optional[str] = None) -> str:
+        """
+        Store complete analysis report.
+        
+        Every top-level section is stored as its own blob, and per-commit
+        lists are split into pages of REPORT_PAGE_SIZE entries, so sections
+        can be read back individually (see retrieve_report_section).
         
-        conn.commit()
-        conn.close()
+        Args:
+            report: Analysis result to store
+            repo_path: Repository the report covers; retention keeps the
+                latest reports per repository and timeframe
+        """
+        # Microseconds keep IDs unique when several reports are stored in the same second
+        report_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        
+        # Each section is its own blob, so a reader fetches only the sections
+        # it needs; a canonical encoding lets unchanged sections share blobs
+        sections = []
+        for section, value in serialization.encode_report(report).items():
+            if section in PAGED_SECTIONS and isinstance(value, list):
+                # An empty list still gets one page so the section exists
+                for page, offset in enumerate(range(0, max(len(value), 1), REPORT_PAGE_SIZE)):
+                    items = value[offset:offset + REPORT_PAGE_SIZE]
+                    content_hash, _ = self._write_blob(serialization.dumps(items))
+                    sections.append((report_id, section, page, len(items), content_hash))
+            else:
+                content_hash, _ = self._write_blob(serialization.dumps(value))
+                sections.append((report_id, section, 0, None, content_hash))
+        
+        # Store metadata in database
+        with self.db.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO analysis_reports 
+                (report_id, repo_path, timeframe, created_at, commit_count, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                report_id,
+                repo_path,
+                report['timeframe'],
+                datetime.now().isoformat(),
+                report['commits_analyzed'],
+                json.dumps({'report_id': report_id})
+            ))
+            cursor.executemany("""
+                INSERT INTO report_sections (report_id, section, page, item_count, content_hash)
+                VALUES (?, ?, ?, ?, ?)
+            """, sections)
         
         return report_id
     
-    def _make_serializable(self, obj):
-        """Convert non-serializable objects to dictionaries."""
-        if isinstance(obj, dict):
-            return {k: self._make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        elif hasattr(obj, '__dict__'):
-            return self._make_serializable(obj.__dict__)
-        elif hasattr(obj, '_asdict'):
-            return self._make_serializable(obj._asdict())
-        else:
-            return obj
+    def _blob_path(self, content_hash: str) -> Path:
+        """Location of a report blob, fanned out by the first two hex digits."""
+        return self.storage_path / "blobs" / content_hash[:2] / f"{content_hash}.json.gz"
+    
+    def _write_blob(self, payload: bytes) -> Tuple[str, Path]:
+        """
+        Store a payload gzip-compressed under its SHA-256 digest.
+        
+        Identical payloads share one blob, so an unchanged rerun writes
+        nothing but its metadata row.
+        
+        Returns:
+            The content hash and the blob path
+        """
+        content_hash = hashlib.sha256(payload).hexdigest()
+        blob_path = self._blob_path(content_hash)
+        if blob_path.exists():
+            try:
+                # Refresh the mtime so compaction treats a reused blob as recent
+                os.utime(blob_path)
+                return content_hash, blob_path
+            except FileNotFoundError:
+                pass
+        
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial blob
+        tmp_path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(payload, mtime=0))
+        os.replace(tmp_path, blob_path)
+        
+        return content_hash, blob_path
+    
+    def _read_report_file(self, report_path: Path) -> Any:
+        """Load a report or section from a compressed blob or a legacy JSON file."""
+        if report_path.suffix == '.gz':
+            with gzip.open(report_path, 'rb') as f:
+                return serialization.loads(f.read())
+        
+        with open(report_path, 'rb') as f:
+            return serialization.loads(f.read())
     
-    def store_commit_analysis(self, analysis):
+    def store_commit_analysis(self, analysis, repo_path: Optional[str] = None):
         """Store individual commit analysis."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.store_commit_analyses([analysis], repo_path)
+    
+    def store_commit_analyses(self, analyses: Iterable, repo_path: Optional[str] = None,
+                              batch_size: int = DEFAULT_WRITE_BATCH,
+                              settings: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Store commit analyses in batches, one transaction per batch.
         
-        cursor.execute("""
-            INSERT OR REPLACE INTO commit_analyses
-            (commit_hash, author, date, category, impact_score, risk_assessment, summary, raw_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        The iterable is consumed lazily, so streaming producers never need
+        to materialize the full list.
+        
+        Args:
+            analyses: CommitAnalysis objects to store
+            repo_path: Repository the commits belong to
+            batch_size: Rows written per executemany call and transaction
+            settings: Analyzer version and settings the analyses were made
+                with; see get_known_commit_hashes
+        
+        Returns:
+            Timing for each batch written, with row count and seconds
+        """
+        timings = []
+        iterator = iter(analyses)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            
+            start = time.perf_counter()
+            with self.db.transaction() as cursor:
+                author_ids = self._cached_ids(cursor, 'authors', 'name', [analysis.author for analysis in batch])
+                file_ids = self._cached_ids(cursor, 'files', 'path',
+                                            [path for analysis in batch for path in analysis.files_changed])
+                
+                # A re-analyzed commit keeps its row but gets new file rows.
+                # Explicit deletes instead of foreign keys keep per-row
+                # constraint checks out of bulk writes
+                commit_hashes = [analysis.commit_hash for analysis in batch]
+                self._delete_commit_files(cursor, repo_path, commit_hashes)
+                cursor.executemany("""
+                    INSERT INTO commit_analyses
+                    (commit_hash, repo_path, author_id, date, category, impact_score, risk_assessment, summary, raw_data,
+                     analysis_settings)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (COALESCE(repo_path, ''), commit_hash) DO UPDATE SET
+                        author_id = excluded.author_id,
+                        date = excluded.date,
+                        category = excluded.category,
+                        impact_score = excluded.impact_score,
+                        risk_assessment = excluded.risk_assessment,
+                        summary = excluded.summary,
+                        raw_data = excluded.raw_data,
+                        analysis_settings = excluded.analysis_settings
+                """, [self._commit_analysis_row(analysis, repo_path, author_ids) + (settings,) for analysis in batch])
+                
+                commit_ids = self._commit_ids(cursor, repo_path, commit_hashes)
+                file_rows = []
+                for analysis in batch:
+                    file_rows.extend(self._commit_file_rows(commit_ids[analysis.commit_hash], analysis.files_changed,
+                                                            getattr(analysis, 'file_stats', {}), file_ids))
+                cursor.executemany("""
+                    INSERT OR REPLACE INTO commit_files (commit_id, position, file_id, insertions, deletions)
+                    VALUES (?, ?, ?, ?, ?)
+                """, file_rows)
+            
+            # Only IDs from committed transactions are remembered
+            self._id_cache['authors'].update(author_ids)
+            self._id_cache['files'].update(file_ids)
+            timings.append({'rows': len(batch), 'seconds': time.perf_counter() - start})
+        
+        return timings
+    
+    def _intern(self, cursor, table: str, column: str, values: Iterable[str]) -> Dict[str, int]:
+        """Insert missing lookup values and return the ID of every value."""
+        values = list(set(values))
+        cursor.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", [(value,) for value in values])
+        
+        ids = {}
+        # Stay below SQLite's bound parameter limit
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            cursor.execute(f"SELECT {column}, id FROM {table} WHERE {column} IN ({', '.join('?' * len(chunk))})", chunk)
+            ids.update(cursor.fetchall())
+        return ids
+    
+    def _cached_ids(self, cursor, table: str, column: str, values: Iterable[str]) -> Dict[str, int]:
+        """IDs of lookup values, resolved from the in-memory cache where possible."""
+        cache = self._id_cache[table]
+        ids = {}
+        missing = []
+        for value in values:
+            value_id = cache.get(value)
+            if value_id is None:
+                missing.append(value)
+            else:
+                ids[value] = value_id
+        if missing:
+            ids.update(self._intern(cursor, table, column, missing))
+        return ids
+    
+    def _commit_ids(self, cursor, repo_path: Optional[str], commit_hashes: List[str]) -> Dict[str, int]:
+        """Row IDs of a repository's stored commit analyses keyed by commit hash."""
+        ids = {}
+        for start in range(0, len(commit_hashes), 500):
+            chunk = commit_hashes[start:start + 500]
+            cursor.execute(f"""
+                SELECT commit_hash, id FROM commit_analyses
+                WHERE COALESCE(repo_path, '') = COALESCE(?, '')
+                  AND commit_hash IN ({', '.join('?' * len(chunk))})
+            """, [repo_path] + chunk)
+            ids.update(cursor.fetchall())
+        return ids
+    
+    def _delete_commit_files(self, cursor, repo_path: Optional[str], commit_hashes: List[str]):
+        """Delete the commit_files rows of a repository's stored commit analyses."""
+        for start in range(0, len(commit_hashes), 500):
+            chunk = commit_hashes[start:start + 500]
+            cursor.execute(f"""
+                DELETE FROM commit_files WHERE commit_id IN (
+                    SELECT id FROM commit_analyses
+                    WHERE COALESCE(repo_path, '') = COALESCE(?, '')
+                      AND commit_hash IN ({', '.join('?' * len(chunk))})
+                )
+            """, [repo_path] + chunk)
+    
+    def _commit_file_rows(self, commit_id: int, files_changed: List[str], file_stats: Dict[str, Any],
+                          file_ids: Dict[str, int]) -> List[Tuple]:
+        """commit_files values for one commit, keeping the order of files_changed."""
+        rows = []
+        for position, path in enumerate(files_changed):
+            stats = file_stats.get(path)
+            rows.append((commit_id, position, file_ids[path],
+                         stats[0] if stats else None, stats[1] if stats else None))
+        return rows
+    
+    def _commit_analysis_row(self, analysis, repo_path: Optional[str], author_ids: Dict[str, int]) -> Tuple:
+        """Column values for one commit_analyses row; files are stored in commit_files."""
+        return (
             analysis.commit_hash,
-            analysis.author,
+            repo_path,
+            author_ids[analysis.author],
             analysis.date.isoformat(),
             analysis.category,
             analysis.impact_score,
             analysis.risk_assessment,
             analysis.summary,
-            json.dumps({
-                'files_changed': analysis.files_changed,
+            serialization.dumps({
                 'insertions': analysis.insertions,
                 'deletions': analysis.deletions,
-                'message': analysis.message
-            })
-        ))
+                'message': analysis.message,
+                'omitted_files': getattr(analysis, 'omitted_files', 0),
+                'committed_at': analysis.committed_at.isoformat() if getattr(analysis, 'committed_at', None) else None
+            }).decode('utf-8')
+        )
+    
+    def get_known_commit_hashes(self, repo_path: str, settings: Optional[str] = None) -> Set[str]:
+        """
+        Get hashes of commits in a repository that already have a usable analysis.
         
-        conn.commit()
-        conn.close()
+        Args:
+            repo_path: Repository to look up
+            settings: Only count analyses made with these analyzer settings;
+                analyses made with other settings are treated as missing
+        """
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT commit_hash FROM commit_analyses
+                WHERE repo_path = ? AND category != 'unknown'
+                  AND (? IS NULL OR analysis_settings = ?)
+            """, (repo_path, settings, settings))
+            
+            hashes = {row[0] for row in cursor.fetchall()}
+        
+        return hashes
     
-    def retrieve_report(self, report_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve a stored report by ID."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def load_commit_analyses(self, commit_hashes: List[str],
+                             repo_path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Load stored commit analyses as flat records keyed by commit hash.
         
-        cursor.execute("""
-            SELECT report_path FROM analysis_reports
-            WHERE metadata LIKE ?
-        """, (f'%"{report_id}"%',))
+        Args:
+            commit_hashes: Commits to load
+            repo_path: Repository the analyses were stored for; None loads
+                analyses stored without one
+        """
+        with self.db.cursor() as cursor:
+            records = {}
+            # Stay below SQLite's bound parameter limit
+            for start in range(0, len(commit_hashes), 500):
+                chunk = commit_hashes[start:start + 500]
+                cursor.execute(f"""
+                    SELECT commit_analyses.id, commit_hash, authors.name, date, category, impact_score,
+                           risk_assessment, summary, raw_data
+                    FROM commit_analyses
+                    LEFT JOIN authors ON authors.id = commit_analyses.author_id
+                    WHERE COALESCE(repo_path, '') = COALESCE(?, '')
+                      AND commit_hash IN ({', '.join('?' * len(chunk))})
+                """, [repo_path] + chunk)
+                rows = cursor.fetchall()
+                files = self._load_commit_files(cursor, [row[0] for row in rows])
+            
+                for row in rows:
+                    record = serialization.loads(row[8]) if row[8] else {}
+                    commit_files = files.get(row[0], [])
+                    record.update({
+                        'commit_hash': row[1],
+                        'author': row[2],
+                        'date': row[3],
+                        'category': row[4],
+                        'impact_score': row[5],
+                        'risk_assessment': row[6],
+                        'summary': row[7],
+                        'files_changed': [path for path, _, _ in commit_files],
+                        'file_stats': {path: (insertions, deletions) for path, insertions, deletions in commit_files
+                                       if insertions is not None}
+                    })
+                    records[row[1]] = record
+        
+        return records
+    
+    def _load_commit_files(self, cursor, commit_ids: List[int]) -> Dict[int, List[Tuple[str, Optional[int], Optional[int]]]]:
+        """Changed files of commit_analyses rows, in stored order, as (path, insertions, deletions)."""
+        files = {}
+        for start in range(0, len(commit_ids), 500):
+            chunk = commit_ids[start:start + 500]
+            cursor.execute(f"""
+                SELECT commit_id, files.path, insertions, deletions
+                FROM commit_files
+                JOIN files ON files.id = commit_files.file_id
+                WHERE commit_id IN ({', '.join('?' * len(chunk))})
+                ORDER BY commit_id, position
+            """, chunk)
+            for commit_id, path, insertions, deletions in cursor.fetchall():
+                files.setdefault(commit_id, []).append((path, insertions, deletions))
+        return files
+    
+    def _commit_filters(self, repo_path: Optional[str] = None, since: Optional[str] = None,
+                        until: Optional[str] = None, author: Optional[str] = None,
+                        category: Optional[str] = None, risk: Optional[str] = None) -> Tuple[str, List[Any]]:
+        """
+        Build a WHERE clause over commit_analyses.
+        
+        since and until are ISO days or times, compared with each commit's
+        local time as stored, like the day groups of STAT_GROUPS.
+        """
+        columns = [
+            ('repo_path = ?', repo_path),
+            ('date >= ?', since),
+            ('date < ?', until),
+            ('author_id = (SELECT id FROM authors WHERE name = ?)', author),
+            ('category = ?', category),
+            ('risk_assessment = ?', risk),
+        ]
+        conditions = [condition for condition, value in columns if value is not None]
+        params = [value for _, value in columns if value is not None]
+        return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+    
+    def aggregate_commits(self, group_by: List[str], **filters) -> List[Dict[str, Any]]:
+        """
+        Aggregate stored commit analyses inside SQLite.
+        
+        Args:
+            group_by: Keys of STAT_GROUPS, e.g. ['author', 'week']
+            **filters: repo_path, since, until, author, category, risk
+        
+        Returns:
+            One row per group with commit count, average and maximum impact
+            score and the number of high risk commits
+        """
+        unknown = [key for key in group_by if key not in STAT_GROUPS]
+        if unknown:
+            raise ValueError(f"Unknown group: {', '.join(unknown)}")
+        
+        where, params = self._commit_filters(**filters)
+        group_columns = ''.join(f"{STAT_GROUPS[key]} AS {key}, " for key in group_by)
+        # Positions, since an alias such as author also names a table column
+        positions = ', '.join(str(i) for i in range(1, len(group_by) + 1))
+        group = f"GROUP BY {positions}" if group_by else ""
+        order = f"ORDER BY {positions}" if group_by else ""
+        
+        with self.db.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT {group_columns}
+                       COUNT(*) AS commits,
+                       AVG(impact_score) AS avg_impact,
+                       MAX(impact_score) AS max_impact,
+                       SUM(risk_assessment = 'high') AS high_risk
+                FROM commit_analyses
+                LEFT JOIN authors ON authors.id = commit_analyses.author_id
+                {where}
+                {group}
+                {order}
+            """, params)
+            columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+        
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def list_commits(self, limit: int = 50, order_by: str = 'date', **filters) -> List[Dict[str, Any]]:
+        """
+        List stored commit analyses matching filters without loading reports.
+        
+        Args:
+            limit: Maximum number of commits
+            order_by: 'date' (newest first) or 'impact' (highest first)
+            **filters: repo_path, since, until, author, category, risk
+        """
+        orderings = {'date': "date DESC", 'impact': "impact_score DESC, date DESC"}
+        if order_by not in orderings:
+            raise ValueError(f"Unknown ordering: {order_by}")
+        
+        where, params = self._commit_filters(**filters)
+        with self.db.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT commit_hash, repo_path, authors.name, date, category, impact_score, risk_assessment, summary
+                FROM commit_analyses
+                LEFT JOIN authors ON authors.id = commit_analyses.author_id
+                {where}
+                ORDER BY {orderings[order_by]}
+                LIMIT ?
+            """, params + [limit])
+            rows = cursor.fetchall()
+        
+        return [{
+            'commit_hash': row[0],
+            'repo_path': row[1],
+            'author': row[2],
+            'date': row[3],
+            'category': row[4],
+            'impact_score': row[5],
+            'risk_assessment': row[6],
+            'summary': row[7]
+        } for row in rows]
+    
+    def list_file_changes(self, path: str, limit: int = 50, repo_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        List stored commits that changed a file, newest first.
+        
+        Args:
+            path: File path relative to the repository root
+            limit: Maximum number of commits
+            repo_path: Only commits of this repository
+        """
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT commit_hash, repo_path, authors.name, date, category, impact_score,
+                       commit_files.insertions, commit_files.deletions
+                FROM commit_files
+                JOIN commit_analyses ON commit_analyses.id = commit_files.commit_id
+                LEFT JOIN authors ON authors.id = commit_analyses.author_id
+                WHERE commit_files.file_id = (SELECT id FROM files WHERE path = ?)
+                  AND (? IS NULL OR repo_path = ?)
+                ORDER BY date DESC
+                LIMIT ?
+            """, (path, repo_path, repo_path, limit))
+            rows = cursor.fetchall()
+        
+        return [{
+            'commit_hash': row[0],
+            'repo_path': row[1],
+            'author': row[2],
+            'date': row[3],
+            'category': row[4],
+            'impact_score': row[5],
+            'insertions': row[6],
+            'deletions': row[7]
+        } for row in rows]
+    
+    def store_dashboard_partials(self, repo_path: str, partials: Dict[str, Dict[str, Any]]):
+        """
+        Store dashboard partials of complete days, replacing earlier ones.
+        
+        Args:
+            repo_path: Repository the partials cover
+            partials: Serialized partial per ISO day; days without commits
+                are stored too, so they count as covered
+        """
+        updated_at = datetime.now().isoformat()
+        with self.db.transaction() as cursor:
+            cursor.executemany("""
+                INSERT OR REPLACE INTO dashboard_partials (repo_path, day, commit_count, partial, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (repo_path, day, partial.get('total_commits', 0),
+                 serialization.dumps(partial).decode('utf-8'), updated_at)
+                for day, partial in partials.items()
+            ])
+    
+    def load_dashboard_partials(self, repo_path: Optional[str] = None, since_day: Optional[str] = None,
+                                until_day: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Load stored dashboard partials, oldest day first.
+        
+        Args:
+            repo_path: Only this repository
+            since_day: First ISO day to include
+            until_day: Last ISO day to include
+        
+        Returns:
+            repo_path, day and the serialized partial of every stored day
+        """
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT repo_path, day, partial
+                FROM dashboard_partials
+                WHERE (? IS NULL OR repo_path = ?)
+                  AND (? IS NULL OR day >= ?)
+                  AND (? IS NULL OR day <= ?)
+                ORDER BY day, repo_path
+            """, (repo_path, repo_path, since_day, since_day, until_day, until_day))
+            rows = cursor.fetchall()
+        
+        return [{
+            'repo_path': row[0],
+            'day': row[1],
+            'partial': serialization.loads(row[2])
+        } for row in rows]
+    
+    def get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis result and mark it as recently used.
+        
+        Entries whose report has since been expired are dropped and
+        reported as missing.
+        """
+        with self.db.transaction() as cursor:
+            cursor.execute("""
+                SELECT c.repo_path, c.head, c.report_id, c.commit_count, c.created_at, r.report_id
+                FROM result_cache c
+                LEFT JOIN analysis_reports r ON r.report_id = c.report_id
+                WHERE c.cache_key = ?
+            """, (cache_key,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            if row[5] is None:
+                cursor.execute("DELETE FROM result_cache WHERE cache_key = ?", (cache_key,))
+                return None
+            cursor.execute("UPDATE result_cache SET last_used_at = ? WHERE cache_key = ?",
+                           (datetime.now().isoformat(), cache_key))
+        
+        return {
+            'repo_path': row[0],
+            'head': row[1],
+            'report_id': row[2],
+            'commit_count': row[3],
+            'created_at': row[4]
+        }
+    
+    def store_cached_result(self, cache_key: str, repo_path: str, head: Optional[str], report_id: str,
+                            commit_count: int, max_entries: Optional[int] = None):
+        """
+        Cache the report that answers an analysis.
+        
+        Entries of the same repository at other HEADs can no longer be hit
+        and are dropped; beyond max_entries the least recently used entries
+        are evicted.
+        """
+        now = datetime.now().isoformat()
+        with self.db.transaction() as cursor:
+            cursor.execute("DELETE FROM result_cache WHERE repo_path = ? AND head IS NOT ?", (repo_path, head))
+            cursor.execute("""
+                INSERT OR REPLACE INTO result_cache
+                (cache_key, repo_path, head, report_id, commit_count, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (cache_key, repo_path, head, report_id, commit_count, now, now))
+            if max_entries is not None:
+                cursor.execute("""
+                    DELETE FROM result_cache
+                    WHERE cache_key IN (
+                        SELECT cache_key FROM result_cache
+                        ORDER BY last_used_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (max_entries,))
+    
+    def delete_cached_result(self, cache_key: str):
+        """Drop a cached result, e.g. once its report has been removed."""
+        with self.db.transaction() as cursor:
+            cursor.execute("DELETE FROM result_cache WHERE cache_key = ?", (cache_key,))
+    
+    def retrieve_report(self, report_id: str, typed: bool = False,
+                        fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a stored report by ID.
+        
+        With typed=True, detailed_analysis entries are returned as
+        CommitAnalysis objects with datetime dates instead of plain dicts.
         
-        result = cursor.fetchone()
-        conn.close()
+        Args:
+            report_id: Report to load
+            typed: Decode commit analyses into CommitAnalysis objects
+            fields: Top-level sections to return; all sections by default.
+                Sections that are not requested are never read from disk
+        """
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT report_path FROM analysis_reports
+                WHERE report_id = ?
+            """, (report_id,))
+            
+            result = cursor.fetchone()
+            if not result:
+                return None
+            
+            cursor.execute("""
+                SELECT section, content_hash FROM report_sections
+                WHERE report_id = ?
+                ORDER BY section, page
+            """, (report_id,))
+            sections = cursor.fetchall()
         
-        if result:
+        wanted = set(fields) if fields is not None else None
+        if result[0]:
+            # Reports stored before sections existed are a single file
             report_path = Path(result[0])
-            if report_path.exists():
-                with open(report_path, 'r') as f:
-                    return json.load(f)
+            if not report_path.exists():
+                return None
+            report = self._read_report_file(report_path)
+            if wanted is not None:
+                report = {key: value for key, value in report.items() if key in wanted}
+        else:
+            report = {}
+            try:
+                for section, content_hash in sections:
+                    if wanted is not None and section not in wanted:
+                        continue
+                    value = self._read_report_file(self._blob_path(content_hash))
+                    if section in PAGED_SECTIONS and isinstance(value, list):
+                        report.setdefault(section, []).extend(value)
+                    else:
+                        report[section] = value
+            except FileNotFoundError:
+                return None
         
-        return None
+        return serialization.decode_report(report) if typed else report
     
-    def get_recent_reports(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent analysis reports."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def retrieve_report_section(self, report_id: str, section: str, offset: int = 0,
+                                limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve one section of a stored report.
         
-        cursor.execute("""
-            SELECT timeframe, created_at, commit_count, metadata
-            FROM analysis_reports
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
+        Paged sections (see PAGED_SECTIONS) are sliced, and only the pages
+        overlapping the slice are read.
+        
+        Args:
+            report_id: Report to read from
+            section: Top-level section name, e.g. 'dashboard_summary'
+            offset: First entry returned from a paged section
+            limit: Maximum entries returned from a paged section; all by default
+        
+        Returns:
+            For paged sections the entries with the total, offset and limit;
+            for other sections the section value. None if the report or
+            section does not exist
+        """
+        offset = max(0, offset)
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT item_count, content_hash FROM report_sections
+                WHERE report_id = ? AND section = ?
+                ORDER BY page
+            """, (report_id, section))
+            pages = cursor.fetchall()
+        
+        if not pages:
+            # Legacy single-file reports are loaded whole and sliced
+            report = self.retrieve_report(report_id, fields=[section])
+            if not report or section not in report:
+                return None
+            value = report[section]
+            if section not in PAGED_SECTIONS or not isinstance(value, list):
+                return {'report_id': report_id, 'section': section, 'value': value}
+            end = len(value) if limit is None else offset + max(0, limit)
+            return {'report_id': report_id, 'section': section, 'total': len(value),
+                    'offset': offset, 'limit': limit, 'items': value[offset:end]}
         
-        results = cursor.fetchall()
-        conn.close()
+        try:
+            if section not in PAGED_SECTIONS:
+                value = self._read_report_file(self._blob_path(pages[0][1]))
+                return {'report_id': report_id, 'section': section, 'value': value}
+            
+            total = sum(item_count for item_count, _ in pages)
+            end = total if limit is None else min(total, offset + max(0, limit))
+            items = []
+            page_start = 0
+            for item_count, content_hash in pages:
+                page_end = page_start + item_count
+                if page_start < end and page_end > offset:
+                    page_items = self._read_report_file(self._blob_path(content_hash))
+                    items.extend(page_items[max(0, offset - page_start):end - page_start])
+                page_start = page_end
+        except FileNotFoundError:
+            return None
+        
+        return {'report_id': report_id, 'section': section, 'total': total,
+                'offset': offset, 'limit': limit, 'items': items}
+    
+    def get_report_sections(self, report_id: str) -> List[Dict[str, Any]]:
+        """List the sections of a stored report with entry counts of paged sections."""
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT section, COUNT(*), SUM(item_count) FROM report_sections
+                WHERE report_id = ?
+                GROUP BY section
+                ORDER BY section
+            """, (report_id,))
+            rows = cursor.fetchall()
+        
+        return [{'section': row[0], 'pages': row[1], 'items': row[2]} for row in rows]
+    
+    def get_recent_reports(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get recent analysis reports."""
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT timeframe, created_at, commit_count, metadata
+                FROM analysis_reports
+                ORDER BY created_at DESC
+                LIMIT ?
+            """, (limit,))
+            
+            results = cursor.fetchall()
         
         reports = []
         for row in results:
@@ -177,20 +1098,203 @@ class DocumentStore:
         
         return reports
     
+    def apply_retention(self, keep_last: Optional[int] = None,
+                        max_age_days: Optional[float] = None) -> Dict[str, int]:
+        """
+        Expire reports outside the retention policy.
+        
+        Expired reports are folded into per-day rollups (report count and
+        commit totals per repository and timeframe) before their rows are
+        deleted; their files are removed by the next compaction.
+        
+        Args:
+            keep_last: Reports kept per repository and timeframe
+            max_age_days: Reports older than this many days are expired
+        
+        Returns:
+            Number of reports expired
+        """
+        if keep_last is None and max_age_days is None:
+            return {'expired_reports': 0}
+        
+        conditions = []
+        params = []
+        if keep_last is not None:
+            conditions.append("rank > ?")
+            params.append(max(0, keep_last))
+        if max_age_days is not None:
+            conditions.append("created_at < ?")
+            params.append((datetime.now() - timedelta(days=max_age_days)).isoformat())
+        
+        with self.db.transaction() as cursor:
+            cursor.execute("CREATE TEMP TABLE IF NOT EXISTS expired_reports (id INTEGER PRIMARY KEY)")
+            cursor.execute("DELETE FROM expired_reports")
+            cursor.execute(f"""
+                INSERT INTO expired_reports (id)
+                SELECT id FROM (
+                    SELECT id, created_at, ROW_NUMBER() OVER (
+                        PARTITION BY COALESCE(repo_path, ''), timeframe
+                        ORDER BY created_at DESC
+                    ) AS rank
+                    FROM analysis_reports
+                )
+                WHERE {' OR '.join(conditions)}
+            """, params)
+            
+            cursor.execute("""
+                INSERT INTO report_rollups
+                (repo_path, timeframe, day, report_count, commit_count, max_commit_count,
+                 first_created_at, last_created_at)
+                SELECT COALESCE(repo_path, ''), timeframe, substr(created_at, 1, 10), COUNT(*),
+                       SUM(commit_count), MAX(commit_count), MIN(created_at), MAX(created_at)
+                FROM analysis_reports
+                WHERE id IN (SELECT id FROM expired_reports)
+                GROUP BY 1, 2, 3
+                ON CONFLICT (repo_path, timeframe, day) DO UPDATE SET
+                    report_count = report_count + excluded.report_count,
+                    commit_count = commit_count + excluded.commit_count,
+                    max_commit_count = MAX(max_commit_count, excluded.max_commit_count),
+                    first_created_at = MIN(first_created_at, excluded.first_created_at),
+                    last_created_at = MAX(last_created_at, excluded.last_created_at)
+            """)
+            
+            cursor.execute("""
+                DELETE FROM report_sections WHERE report_id IN (
+                    SELECT report_id FROM analysis_reports
+                    WHERE id IN (SELECT id FROM expired_reports)
+                )
+            """)
+            cursor.execute("DELETE FROM analysis_reports WHERE id IN (SELECT id FROM expired_reports)")
+            expired = cursor.rowcount
+            cursor.execute("DELETE FROM expired_reports")
+        
+        return {'expired_reports': expired}
+    
+    def compact(self, vacuum: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Delete unreferenced report files and optimize the database.
+        
+        Args:
+            vacuum: True always runs VACUUM, False never does; by default it
+                runs once free pages exceed VACUUM_FREE_RATIO of the file
+        
+        Returns:
+            Files removed, bytes freed and whether VACUUM ran
+        """
+        with self.db.cursor() as cursor:
+            cursor.execute("SELECT report_path FROM analysis_reports")
+            referenced = {Path(row[0]).resolve() for row in cursor.fetchall() if row[0]}
+            cursor.execute("SELECT DISTINCT content_hash FROM report_sections")
+            referenced.update(self._blob_path(row[0]).resolve() for row in cursor.fetchall())
+        
+        cutoff = time.time() - ORPHAN_GRACE_SECONDS
+        candidates = list(self.storage_path.glob("report_*.json"))
+        candidates.extend(self.storage_path.glob("blobs/*/*.json.gz"))
+        candidates.extend(self.storage_path.glob("blobs/*/*.tmp"))
+        
+        removed_files = 0
+        freed_bytes = 0
+        for path in candidates:
+            try:
+                stat = path.stat()
+                if stat.st_mtime >= cutoff or path.resolve() in referenced:
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            removed_files += 1
+            freed_bytes += stat.st_size
+        
+        with self.db.connection() as conn:
+            conn.execute("ANALYZE")
+            if vacuum is None:
+                page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+                free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                vacuum = page_count > 0 and free_pages / page_count > VACUUM_FREE_RATIO
+            if vacuum:
+                conn.execute("VACUUM")
+            # Fold the write-ahead log back into the database file
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        
+        return {'removed_files': removed_files, 'freed_bytes': freed_bytes, 'vacuumed': bool(vacuum)}
+    
+    def get_report_rollups(self, repo_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get per-day summaries of expired reports, newest first."""
+        with self.db.cursor() as cursor:
+            cursor.execute("""
+                SELECT repo_path, timeframe, day, report_count, commit_count, max_commit_count,
+                       first_created_at, last_created_at
+                FROM report_rollups
+                WHERE ? IS NULL OR repo_path = ?
+                ORDER BY day DESC, repo_path, timeframe
+            """, (repo_path, repo_path))
+            rows = cursor.fetchall()
+        
+        return [{
+            'repo_path': row[0] or None,
+            'timeframe': row[1],
+            'day': row[2],
+            'report_count': row[3],
+            'commit_count': row[4],
+            'max_commit_count': row[5],
+            'first_created_at': row[6],
+            'last_created_at': row[7]
+        } for row in rows]
+    
+    def close(self):
+        """Close pooled database connections and opened embedding stores."""
+        self.db.close()
+        for store in self._vector_stores.values():
+            store.close()
+        self._vector_stores.clear()
+    
+    @property
+    def vectors(self):
+        """Default embedding matrix."""
+        return self.vector_store()
+    
+    def vector_store(self, namespace: Optional[str] = None):
+        """
+        Embedding matrix for a namespace, e.g. one embedding model version.
+        
+        Stores are opened on first use so numpy is only loaded when needed.
+        """
+        if namespace not in self._vector_stores:
+            from .vector_store import VectorStore
+            path = self.storage_path / "embeddings"
+            self._vector_stores[namespace] = VectorStore(path / namespace if namespace else path)
+        return self._vector_stores[namespace]
+    
     def store_vector_embeddings(self, document_id: str, embeddings: List[float]):
         """Store vector embeddings for RAG."""
-        embeddings_path = self.storage_path / "embeddings" / f"{document_id}.pkl"
-        embeddings_path.parent.mkdir(exist_ok=True)
-        
-        with open(embeddings_path, 'wb') as f:
-            pickle.dump(embeddings, f)
+        self.vectors.add(document_id, embeddings)
     
-    def retrieve_vector_embeddings(self, document_id: str) -> Optional[List[float]]:
+    def retrieve_vector_embeddings(self, document_id: str, namespace: Optional[str] = None) -> Optional[List[float]]:
         """Retrieve vector embeddings."""
-        embeddings_path = self.storage_path / "embeddings" / f"{document_id}.pkl"
+        embeddings = self.vector_store(namespace).get(document_id)
+        if embeddings is not None or namespace:
+            return embeddings
         
+        # Embeddings pickled individually by earlier versions
+        embeddings_path = self.storage_path / "embeddings" / f"{document_id}.pkl"
         if embeddings_path.exists():
             with open(embeddings_path, 'rb') as f:
                 return pickle.load(f)
         
         return None
+    
+    def search_similar(self, vector: List[float], k: int = 5, exclude: Optional[str] = None,
+                       namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find the stored documents whose embeddings are closest to a vector.
+        
+        Args:
+            vector: Query embedding
+            k: Maximum number of results
+            exclude: Document ID left out of the results
+            namespace: Embedding namespace to search instead of the default
+        
+        Returns:
+            Matches with document_id and cosine similarity score, best first
+        """
+        return self.vector_store(namespace).search(vector, k, exclude)
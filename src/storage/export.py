@@ -0,0 +1,207 @@
+"""
+Incremental columnar export of commit analyses for analytics.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+from .document_store import DocumentStore
+from . import serialization
+
+
+EXPORT_FORMATS = ('parquet', 'arrow')
+
+
+def partition_name(repo_path: str) -> str:
+    """Readable, collision-free directory name for a repository partition."""
+    if not repo_path:
+        return 'unknown'
+    base = re.sub(r'[^A-Za-z0-9_.-]+', '_', Path(repo_path).name).strip('_.') or 'repo'
+    digest = hashlib.sha1(repo_path.encode('utf-8')).hexdigest()[:8]
+    return f"{base}-{digest}"
+
+
+def _next_month(month: str) -> str:
+    year, month_number = int(month[:4]), int(month[5:7])
+    return f"{year + month_number // 12:04d}-{month_number % 12 + 1:02d}"
+
+
+class ColumnarExporter:
+    """
+    Writes commit analyses as Parquet or Arrow files partitioned by repo and month.
+
+    Two datasets are produced, each laid out as
+    <dataset>/repo=<name>/month=<YYYY-MM>/part.<ext>:
+
+    - commits: one row per commit with typed counts and scores
+    - files: one row per changed file with its line counts
+
+    A manifest records the highest commit_analyses row exported. Later
+    runs only rewrite the partitions that received new or updated rows.
+    """
+
+    def __init__(self, store: DocumentStore, output_dir: Union[str, Path], export_format: str = 'parquet'):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        self.store = store
+        self.output_dir = Path(output_dir)
+        self.export_format = export_format
+        self.manifest_path = self.output_dir / "manifest.json"
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            # Changing format rewrites every partition
+            if manifest.get('format') == self.export_format:
+                return manifest
+        return {'format': self.export_format, 'last_row_id': 0, 'partitions': {}}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Export partitions changed since the last run.
+
+        Returns:
+            Number of partitions written, commit and file rows written, and
+            the manifest path
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+
+        with self.store.db.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM commit_analyses")
+            max_row_id = cursor.fetchone()[0]
+            # Month is taken from the commit's own local date
+            cursor.execute("""
+                SELECT DISTINCT repo_path, substr(date, 1, 7)
+                FROM commit_analyses
+                WHERE id > ?
+            """, (manifest['last_row_id'],))
+            changed = cursor.fetchall()
+
+        commit_rows = 0
+        file_rows = 0
+        for repo_path, month in changed:
+            commits, files = self._write_partition(repo_path, month)
+            manifest['partitions'][f"{partition_name(repo_path)}/{month}"] = {
+                'repo_path': repo_path,
+                'month': month,
+                'commits': commits,
+                'files': files,
+                'exported_at': datetime.now().isoformat()
+            }
+            commit_rows += commits
+            file_rows += files
+
+        manifest['last_row_id'] = max_row_id
+        self._save_manifest(manifest)
+
+        return {
+            'partitions_written': len(changed),
+            'commit_rows': commit_rows,
+            'file_rows': file_rows,
+            'manifest': str(self.manifest_path)
+        }
+
+    def _read_partition(self, repo_path: str, month: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        with self.store.db.cursor() as cursor:
+            # A date range rather than substr() keeps the (repo_path, date) index usable
+            cursor.execute("""
+                SELECT commit_analyses.id, commit_hash, authors.name, date, category, impact_score,
+                       risk_assessment, summary, raw_data
+                FROM commit_analyses
+                LEFT JOIN authors ON authors.id = commit_analyses.author_id
+                WHERE repo_path IS ? AND date >= ? AND date < ?
+                ORDER BY date, commit_hash
+            """, (repo_path, month, _next_month(month)))
+            rows = cursor.fetchall()
+            commit_files = self.store._load_commit_files(cursor, [row[0] for row in rows])
+
+        commits = []
+        files = []
+        for commit_id, commit_hash, author, date, category, impact_score, risk, summary, raw_data in rows:
+            raw = serialization.loads(raw_data) if raw_data else {}
+            changed = commit_files.get(commit_id, [])
+            commits.append({
+                'commit_hash': commit_hash,
+                'repo_path': repo_path,
+                'author': author,
+                'date': date,
+                'message': raw.get('message', ''),
+                'category': category,
+                'impact_score': impact_score,
+                'risk_assessment': risk,
+                'summary': summary,
+                'insertions': raw.get('insertions', 0),
+                'deletions': raw.get('deletions', 0),
+                'files_changed': len(changed) + raw.get('omitted_files', 0),
+                'omitted_files': raw.get('omitted_files', 0)
+            })
+
+            for path, insertions, deletions in changed:
+                files.append({
+                    'commit_hash': commit_hash,
+                    'repo_path': repo_path,
+                    'date': date,
+                    'path': path,
+                    'insertions': insertions,
+                    'deletions': deletions
+                })
+
+        return commits, files
+
+    def _write_partition(self, repo_path: str, month: str) -> Tuple[int, int]:
+        import pandas as pd
+
+        commits, files = self._read_partition(repo_path, month)
+        commit_frame = pd.DataFrame(commits, columns=[
+            'commit_hash', 'repo_path', 'author', 'date', 'message', 'category', 'impact_score',
+            'risk_assessment', 'summary', 'insertions', 'deletions', 'files_changed', 'omitted_files'
+        ]).astype({
+            'impact_score': 'float64', 'insertions': 'int64', 'deletions': 'int64',
+            'files_changed': 'int32', 'omitted_files': 'int32'
+        })
+        file_frame = pd.DataFrame(files, columns=[
+            'commit_hash', 'repo_path', 'date', 'path', 'insertions', 'deletions'
+        ]).astype({'insertions': 'Int64', 'deletions': 'Int64'})
+
+        for frame in (commit_frame, file_frame):
+            frame['date'] = pd.to_datetime(frame['date'], utc=True, format='ISO8601')
+            for column in ('repo_path', 'author', 'category', 'risk_assessment'):
+                if column in frame:
+                    frame[column] = frame[column].astype('category')
+
+        partition = Path(f"repo={partition_name(repo_path)}") / f"month={month}"
+        self._write_frame(commit_frame, self.output_dir / "commits" / partition)
+        self._write_frame(file_frame, self.output_dir / "files" / partition)
+
+        return len(commit_frame), len(file_frame)
+
+    def _write_frame(self, frame, directory: Path):
+        import pyarrow as pa
+
+        directory.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        path = directory / f"part.{self.export_format}"
+        tmp_path = directory / f".part.{self.export_format}.tmp"
+
+        if self.export_format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, tmp_path, compression='zstd')
+        else:
+            with pa.OSFile(str(tmp_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        os.replace(tmp_path, path)
@@ -0,0 +1,116 @@
+"""
+Cache of analysis results, so repeated runs over an unchanged window return at once.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from agents.commit_index import complete_days
+from .document_store import DocumentStore
+
+
+# Results kept in memory; each holds the full report text
+DEFAULT_MEMORY_ENTRIES = 32
+
+# Results remembered in the database across restarts
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def result_cache_key(repo_path: str, fingerprint: Dict[str, Any],
+                     window: Tuple[Optional[int], Optional[int]] = (None, None), **options: Any) -> str:
+    """
+    Digest of a repository, the fingerprint of its analysis window, the
+    complete days of its resolved since/until timestamps and run options.
+
+    The fingerprint already identifies the window's commits. Of the bounds
+    themselves a run only depends on the days whose dashboard partials it
+    stores, so a relative window such as 'week' keeps hitting until the
+    bounds move to another day or a commit enters or leaves the window.
+    """
+    if window[0] is None and window[1] is None:
+        bounds = [None, None]
+    else:
+        bounds = [None if day is None else day.isoformat() for day in complete_days(*window)]
+    payload = json.dumps({'repo_path': repo_path, 'fingerprint': fingerprint, 'window': bounds,
+                          'options': options},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-level LRU cache of run_analysis results.
+
+    Recent results are kept in memory. The database remembers which stored
+    report answered each key, so entries survive restarts; every hit is
+    checked against it, and when the result is not in memory the report
+    text is read back from storage. Keys include the HEAD commit, so moving
+    HEAD invalidates a repository's entries.
+    """
+
+    def __init__(self, store: DocumentStore, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.store = store
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        # Key -> (repo_path, head, result), least recently used first
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a key, or None once its report has been removed."""
+        # The database is checked on every hit, since retention may have
+        # expired the report since it was remembered
+        cached = self.store.get_cached_result(cache_key)
+        if cached is None:
+            self._forget(cache_key)
+            return None
+
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                self._memory.move_to_end(cache_key)
+                return dict(entry[2])
+
+        report = self.store.retrieve_report(cached['report_id'], fields=['report'])
+        if report is None:
+            self.store.delete_cached_result(cache_key)
+            return None
+
+        result = {
+            'report_id': cached['report_id'],
+            'summary': report.get('report', ''),
+            'commit_count': cached['commit_count']
+        }
+        self._remember(cache_key, cached['repo_path'], cached['head'], result)
+        return dict(result)
+
+    def put(self, cache_key: str, repo_path: str, head: Optional[str], result: Dict[str, Any]):
+        """Cache a run_analysis result with report_id, summary and commit_count."""
+        self.store.store_cached_result(cache_key, repo_path, head, result['report_id'],
+                                       result['commit_count'], self.max_entries)
+        self._remember(cache_key, repo_path, head, result)
+
+    def _remember(self, cache_key: str, repo_path: str, head: Optional[str], result: Dict[str, Any]):
+        with self._lock:
+            # Entries of the repository at another HEAD can no longer be hit
+            for key in [key for key, (repo, entry_head, _) in self._memory.items()
+                        if repo == repo_path and entry_head != head]:
+                del self._memory[key]
+
+            self._memory[cache_key] = (repo_path, head, dict(result))
+            self._memory.move_to_end(cache_key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _forget(self, cache_key: str):
+        with self._lock:
+            self._memory.pop(cache_key, None)
+
+    def clear(self):
+        """Forget results held in memory."""
+        with self._lock:
+            self._memory.clear()
@@ -0,0 +1,71 @@
+"""
+Retention policies and periodic compaction for the document store.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .document_store import DocumentStore
+
+
+# Reports kept per repository and timeframe by the API server: one day of
+# analyses scheduled every 15 minutes
+DEFAULT_KEEP_LAST = 96
+
+
+@dataclass
+class RetentionPolicy:
+    """Which reports to keep; reports outside the policy are rolled up and removed."""
+    keep_last: Optional[int] = None
+    max_age_days: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.keep_last is not None or self.max_age_days is not None
+
+
+def run_maintenance(store: DocumentStore, policy: RetentionPolicy,
+                    vacuum: Optional[bool] = None) -> Dict[str, Any]:
+    """Apply a retention policy, then compact the store."""
+    result = store.apply_retention(policy.keep_last, policy.max_age_days)
+    result.update(store.compact(vacuum))
+    return result
+
+
+class BackgroundCompactor:
+    """
+    Runs retention and compaction on a daemon thread at a fixed interval.
+
+    Intended for long-running processes such as the API server, where
+    analyses keep arriving and storage would otherwise grow without bound.
+    """
+
+    def __init__(self, store: DocumentStore, policy: RetentionPolicy, interval_seconds: float = 3600):
+        self.store = store
+        self.policy = policy
+        self.interval_seconds = interval_seconds
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                self.last_result = run_maintenance(self.store, self.policy)
+            except Exception as e:
+                print(f"Storage compaction failed: {e}")
+            if self._stop.wait(self.interval_seconds):
+                break
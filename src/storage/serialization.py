@@ -0,0 +1,103 @@
+"""
+JSON encoding for analysis results.
+
+Uses orjson when it is installed and the standard library otherwise; both
+produce the same compact, key-sorted output so content hashes stay stable.
+"""
+
+import json
+from dataclasses import fields
+from datetime import date, datetime
+from typing import Any, Dict
+
+from agents.base_agent import CommitAnalysis
+from agents.advanced_analyzer import CodeExplanation
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+
+_CODE_EXPLANATION_FIELDS = [f.name for f in fields(CodeExplanation)]
+
+
+def encode_commit_analysis(analysis: CommitAnalysis) -> Dict[str, Any]:
+    """Encode a CommitAnalysis with ISO formatted dates."""
+    return {
+        'commit_hash': analysis.commit_hash,
+        'author': analysis.author,
+        'date': analysis.date.isoformat(),
+        'message': analysis.message,
+        'files_changed': analysis.files_changed,
+        'insertions': analysis.insertions,
+        'deletions': analysis.deletions,
+        'summary': analysis.summary,
+        'category': analysis.category,
+        'impact_score': analysis.impact_score,
+        'risk_assessment': analysis.risk_assessment,
+        'file_stats': {path: list(stats) for path, stats in analysis.file_stats.items()},
+        'omitted_files': analysis.omitted_files,
+        'committed_at': analysis.committed_at.isoformat() if analysis.committed_at else None
+    }
+
+
+def encode_code_explanation(explanation: CodeExplanation) -> Dict[str, Any]:
+    """Encode a CodeExplanation without the recursion of dataclasses.asdict."""
+    return {name: getattr(explanation, name) for name in _CODE_EXPLANATION_FIELDS}
+
+
+def encode_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Encode an analysis report.
+
+    Only detailed_analysis holds objects; every other section is already
+    made of JSON types and is passed through untouched.
+    """
+    encoded = dict(report)
+    if 'detailed_analysis' in encoded:
+        encoded['detailed_analysis'] = [
+            encode_commit_analysis(item) if isinstance(item, CommitAnalysis) else item
+            for item in encoded['detailed_analysis']
+        ]
+    return encoded
+
+
+def decode_report(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild CommitAnalysis objects, including datetimes, in a decoded report."""
+    decoded = dict(data)
+    decoded['detailed_analysis'] = [
+        CommitAnalysis.from_dict(item) if isinstance(item, dict) and 'commit_hash' in item else item
+        for item in data.get('detailed_analysis', [])
+    ]
+    return decoded
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for values the encoders above did not convert."""
+    if isinstance(obj, CommitAnalysis):
+        return encode_commit_analysis(obj)
+    if isinstance(obj, CodeExplanation):
+        return encode_code_explanation(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with sorted keys."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Parse JSON produced by dumps (or any other JSON document)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
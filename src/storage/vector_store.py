@@ -0,0 +1,335 @@
+"""
+Append-only embedding matrix with similarity search.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    faiss = None
+    HAS_FAISS = False
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows): only threads of one process are serialized
+    fcntl = None
+
+
+class VectorStore:
+    """
+    Embeddings stored as rows of one float32 matrix file.
+
+    Rows are only ever appended: vectors.f32 holds the raw matrix, read
+    through numpy.memmap, and ids.txt names the document of each row.
+    Storing a document again appends a new row that supersedes the old one.
+    Search uses cosine similarity through a persisted FAISS index when
+    faiss is installed and a brute-force numpy scan of the memory map
+    otherwise.
+
+    Several processes may share a store: appends hold an exclusive lock on
+    a lock file and reads a shared one, and rows appended by other writers
+    are picked up when ids.txt changes on disk. The FAISS index is kept up
+    to date in memory and written by flush() or close().
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.matrix_path = self.path / "vectors.f32"
+        self.ids_path = self.path / "ids.txt"
+        self.meta_path = self.path / "meta.json"
+        self.index_path = self.path / "index.faiss"
+        self.lock_path = self.path / ".lock"
+
+        self._lock = threading.Lock()
+        self._lock_file = open(self.lock_path, 'a')
+        self.dimension: Optional[int] = None
+
+        # Row numbers per document; the last row stored for an ID wins
+        self._row_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # Bytes of ids.txt read so far and the file state they were read from
+        self._ids_offset = 0
+        self._ids_state = None
+
+        self._index = None
+        # Rows [0, _indexed_rows) have been added to the loaded index
+        self._indexed_rows = 0
+        self._index_dirty = False
+
+        with self._locked(exclusive=True):
+            self._refresh()
+            self._truncate_to_consistent_rows()
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the thread lock and, where supported, the cross-process file lock."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _refresh(self):
+        """Pick up rows appended by other writers since ids.txt was last read."""
+        try:
+            stat = self.ids_path.stat()
+            state = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            stat = state = None
+        if state == self._ids_state:
+            return
+
+        if self.dimension is None and self.meta_path.exists():
+            with open(self.meta_path, 'r') as f:
+                self.dimension = json.load(f)['dimension']
+
+        if stat is None or stat.st_size < self._ids_offset or (
+                self._ids_state is not None and stat.st_ino != self._ids_state[0]):
+            # Rewritten, e.g. trimmed after an interrupted append: read it again
+            self._row_ids, self._rows = [], {}
+            self._ids_offset = 0
+            self._index = None
+
+        if stat is not None:
+            with open(self.ids_path, 'rb') as f:
+                f.seek(self._ids_offset)
+                data = f.read()
+            # Only whole lines; a line still being written is read next time
+            complete = data[:data.rfind(b'\n') + 1]
+            for line in complete.decode('utf-8').splitlines():
+                self._append_row_id(line)
+            self._ids_offset += len(complete)
+        self._ids_state = state
+
+        if self._index is not None:
+            self._sync_index()
+
+    def _append_row_id(self, document_id: str):
+        self._rows[document_id] = len(self._row_ids)
+        self._row_ids.append(document_id)
+
+    def _truncate_to_consistent_rows(self):
+        """Drop a half-written trailing row left by an interrupted append."""
+        if self.dimension is None or not self.matrix_path.exists():
+            return
+        row_bytes = self.dimension * 4
+        rows = min(self.matrix_path.stat().st_size // row_bytes, len(self._row_ids))
+        if self.matrix_path.stat().st_size != rows * row_bytes:
+            os.truncate(self.matrix_path, rows * row_bytes)
+        if len(self._row_ids) > rows:
+            row_ids = self._row_ids[:rows]
+            self._row_ids, self._rows = [], {}
+            for document_id in row_ids:
+                self._append_row_id(document_id)
+            with open(self.ids_path, 'w') as f:
+                f.writelines(f"{document_id}\n" for document_id in row_ids)
+            self._ids_offset = self.ids_path.stat().st_size
+            self._ids_state = None
+
+    def __len__(self) -> int:
+        with self._locked(exclusive=False):
+            self._refresh()
+            return len(self._rows)
+
+    def __contains__(self, document_id: str) -> bool:
+        with self._locked(exclusive=False):
+            self._refresh()
+            return document_id in self._rows
+
+    def _matrix(self) -> np.ndarray:
+        """Memory-map the stored rows read-only."""
+        if not self._row_ids:
+            return np.empty((0, self.dimension or 0), dtype=np.float32)
+        return np.memmap(self.matrix_path, dtype=np.float32, mode='r',
+                         shape=(len(self._row_ids), self.dimension))
+
+    def add(self, document_id: str, vector: Sequence[float]):
+        """Append the embedding of a document."""
+        self.add_many([document_id], [vector])
+
+    def add_many(self, document_ids: Sequence[str], vectors: Any):
+        """Append several embeddings in one write."""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if len(document_ids) != len(matrix):
+            raise ValueError("document_ids and vectors must have the same length")
+        if '\n' in ''.join(document_ids):
+            raise ValueError("Document IDs cannot contain newlines")
+
+        with self._locked(exclusive=True):
+            # Rows of other writers come first, so ours line up with ids.txt
+            self._refresh()
+            if self.dimension is None:
+                self.dimension = int(matrix.shape[1])
+                with open(self.meta_path, 'w') as f:
+                    json.dump({'dimension': self.dimension}, f)
+            elif matrix.shape[1] != self.dimension:
+                raise ValueError(f"Expected vectors of dimension {self.dimension}, got {matrix.shape[1]}")
+
+            first_row = len(self._row_ids)
+            superseded = [self._rows[document_id] for document_id in document_ids if document_id in self._rows]
+
+            # Matrix first, then IDs: a crash in between leaves an extra
+            # matrix row that is trimmed on the next load
+            with open(self.matrix_path, 'ab') as f:
+                f.write(np.ascontiguousarray(matrix).tobytes())
+            with open(self.ids_path, 'a') as f:
+                f.writelines(f"{document_id}\n" for document_id in document_ids)
+            for document_id in document_ids:
+                self._append_row_id(document_id)
+            stat = self.ids_path.stat()
+            self._ids_offset = stat.st_size
+            self._ids_state = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            # A document listed twice in one call keeps only its last row
+            superseded.extend(
+                first_row + i for i, document_id in enumerate(document_ids)
+                if self._rows[document_id] != first_row + i
+            )
+
+            if self._index is not None:
+                if superseded:
+                    self._index.remove_ids(np.asarray(superseded, dtype=np.int64))
+                self._add_to_index(matrix, first_row)
+
+    def get(self, document_id: str) -> Optional[List[float]]:
+        """Return the latest embedding stored for a document."""
+        with self._locked(exclusive=False):
+            self._refresh()
+            row = self._rows.get(document_id)
+            if row is None:
+                return None
+            return self._matrix()[row].tolist()
+
+    def search(self, vector: Sequence[float], k: int = 5,
+               exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Find the documents most similar to a vector.
+
+        Args:
+            vector: Query embedding
+            k: Maximum number of results
+            exclude: Document ID left out of the results (e.g. the query itself)
+
+        Returns:
+            Results ordered by descending cosine similarity, each with
+            document_id and score
+        """
+        with self._locked(exclusive=False):
+            self._refresh()
+            if not self._rows or k <= 0:
+                return []
+
+            query = self._normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+            if query.shape[1] != self.dimension:
+                raise ValueError(f"Expected a vector of dimension {self.dimension}, got {query.shape[1]}")
+
+            wanted = k + (1 if exclude else 0)
+            if HAS_FAISS:
+                scores, rows = self._load_index().search(query, min(wanted, len(self._rows)))
+                hits = [(int(row), float(score)) for row, score in zip(rows[0], scores[0]) if row >= 0]
+            else:
+                hits = self._search_numpy(query[0], wanted)
+
+            row_ids = self._row_ids
+
+        results = []
+        for row, score in hits:
+            document_id = row_ids[row]
+            if document_id != exclude:
+                results.append({'document_id': document_id, 'score': score})
+        return results[:k]
+
+    def flush(self):
+        """Write the FAISS index if it changed since it was loaded or last written."""
+        with self._locked(exclusive=True):
+            self._refresh()
+            if self._index is None or not self._index_dirty:
+                return
+            # Write then rename, so readers never load a half-written index
+            temporary = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            faiss.write_index(self._index, str(temporary))
+            os.replace(temporary, self.index_path)
+            self._index_dirty = False
+
+    def close(self):
+        """Write pending index changes and release the lock file."""
+        if self._lock_file.closed:
+            return
+        self.flush()
+        self._lock_file.close()
+
+    def _live_rows(self) -> np.ndarray:
+        return np.fromiter(sorted(self._rows.values()), dtype=np.int64, count=len(self._rows))
+
+    def _search_numpy(self, query: np.ndarray, k: int) -> List:
+        live_rows = self._live_rows()
+        matrix = self._matrix()
+        scores = np.empty(len(live_rows), dtype=np.float32)
+        # Scan in blocks so only a slice of the memory map is resident at once
+        for start in range(0, len(live_rows), 65536):
+            block = self._normalize(np.asarray(matrix[live_rows[start:start + 65536]]))
+            scores[start:start + len(block)] = block @ query
+
+        top = np.argsort(-scores)[:k]
+        return [(int(live_rows[i]), float(scores[i])) for i in top]
+
+    def _load_index(self):
+        """Open the persisted FAISS index, adding rows appended since it was written."""
+        if self._index is not None:
+            return self._index
+
+        if self.index_path.exists():
+            index = faiss.read_index(str(self.index_path))
+        else:
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+
+        self._index = index
+        self._indexed_rows = int(faiss.vector_to_array(index.id_map).max()) + 1 if index.ntotal else 0
+        self._index_dirty = False
+        self._sync_index()
+        return index
+
+    def _sync_index(self):
+        """
+        Catch the loaded index up with rows appended since it was written,
+        then drop rows superseded by a later store of the same document.
+        """
+        if self._indexed_rows > len(self._row_ids):
+            # Written for rows that were trimmed since: rebuild
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+            self._indexed_rows = 0
+            self._index_dirty = True
+        if self._indexed_rows < len(self._row_ids):
+            self._add_to_index(np.asarray(self._matrix()[self._indexed_rows:]), self._indexed_rows)
+        if self._index.ntotal > len(self._rows):
+            stale = sorted(set(range(len(self._row_ids))) - set(self._rows.values()))
+            self._index.remove_ids(np.asarray(stale, dtype=np.int64))
+            self._index_dirty = True
+
+    def _add_to_index(self, matrix: np.ndarray, first_row: int):
+        rows = np.arange(first_row, first_row + len(matrix), dtype=np.int64)
+        self._index.add_with_ids(self._normalize(matrix), rows)
+        self._indexed_rows = first_row + len(matrix)
+        self._index_dirty = True
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return np.ascontiguousarray(matrix / norms, dtype=np.float32)
@@ -0,0 +1,64 @@
+"""
+Shared test fixtures: the src tree on the import path and throwaway git repositories.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+
+class GitRepo:
+    """A git repository in a temporary directory with a helper to commit files."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.git('init', '-q')
+
+    def git(self, *args: str, env: Optional[Dict[str, str]] = None) -> str:
+        return subprocess.check_output(
+            ['git', '-C', str(self.path), *args],
+            env={**os.environ, **(env or {})},
+            stderr=subprocess.DEVNULL
+        ).decode('utf-8').strip()
+
+    def commit(self, files: Dict[str, Optional[str]], message: str, author: str = 'Alice',
+               date: str = '2023-06-01T12:00:00+00:00', committer_date: Optional[str] = None) -> str:
+        """
+        Write (or, for None contents, delete) files and commit them.
+
+        Returns:
+            The new commit hash
+        """
+        for name, contents in files.items():
+            target = self.path / name
+            if contents is None:
+                self.git('rm', '-q', name)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(contents, bytes):
+                target.write_bytes(contents)
+            else:
+                target.write_text(contents)
+            self.git('add', name)
+
+        self.git('commit', '-q', '--allow-empty', '-m', message, env={
+            'GIT_AUTHOR_NAME': author,
+            'GIT_AUTHOR_EMAIL': f'{author.lower()}@example.com',
+            'GIT_AUTHOR_DATE': date,
+            'GIT_COMMITTER_NAME': author,
+            'GIT_COMMITTER_EMAIL': f'{author.lower()}@example.com',
+            'GIT_COMMITTER_DATE': committer_date or date
+        })
+        return self.git('rev-parse', 'HEAD')
+
+
+@pytest.fixture
+def git_repo(tmp_path) -> GitRepo:
+    return GitRepo(tmp_path / 'repo')
@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+
+import api_server
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # The server stores analyses under ./data
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(api_server, 'analysis_app', None)
+    monkeypatch.setattr(api_server, 'result_cache', None)
+    monkeypatch.setattr(api_server, 'document_stores', {})
+    yield api_server.app.test_client()
+    for store in api_server.document_stores.values():
+        store.close()
+
+
+def test_requests_share_one_store_and_close_their_analyzer(client, git_repo):
+    git_repo.commit({'a.py': 'print(1)\n'}, 'Add a')
+    request = {'repoPath': str(git_repo.path), 'since': '2023-01-01', 'until': '2023-12-31'}
+
+    first = client.post('/api/analyze', json=request).get_json()
+    first_app = api_server.analysis_app
+    second = client.post('/api/analyze', json=request).get_json()
+
+    assert first['success'] and first['commit_count'] == 1
+    assert second['cached']
+    assert list(api_server.document_stores) == [api_server.DEFAULT_STORAGE_PATH]
+    assert api_server.analysis_app.storage is first_app.storage is api_server._document_store()
+    # The git reader was shut down once the request finished
+    assert api_server.analysis_app.analyzer.object_reader.running_processes == 0
+    assert first_app.analyzer.object_reader.running_processes == 0
+
+
+def test_stats_use_the_shared_store_before_any_analysis(client):
+    assert client.get('/api/stats/commits').status_code == 200
+    assert list(api_server.document_stores) == [api_server.DEFAULT_STORAGE_PATH]
+
+
+def test_invalid_worker_count_returns_a_json_error(client, git_repo):
+    git_repo.commit({'a.py': 'print(1)\n'}, 'Add a')
+
+    response = client.post('/api/analyze', json={'repoPath': str(git_repo.path), 'workers': 'many'})
+
+    assert response.is_json
+    assert response.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('payload, error', [
+    ({}, 'No repositories given'),
+    ({'repoPaths': ['/no/such/repo']}, 'Not git repositories: /no/such/repo'),
+    ({'repoPaths': ['/no/such/repo'], 'concurrency': 'lots'}, 'invalid literal'),
+])
+def test_multi_repository_requests_are_validated(client, payload, error):
+    response = client.post('/api/analyze/multi', json=payload)
+
+    assert response.is_json
+    assert response.get_json()['success'] is False
+    assert error in response.get_json()['error']
+
+
+def test_multi_repository_analysis(client, git_repo):
+    git_repo.commit({'a.py': 'print(1)\n'}, 'Add a')
+
+    result = client.post('/api/analyze/multi', json={'repoPaths': [str(git_repo.path)],
+                                                     'since': '2023-01-01', 'until': '2023-12-31'}).get_json()
+
+    assert result['success'] and result['commit_count'] == 1
+    assert result['repositories'][0]['repo_path'] == str(git_repo.path)
+
+
+@pytest.mark.parametrize('url', ['/api/stats/high-risk?limit=ten', '/api/stats/files?path=a.py&limit=ten'])
+def test_invalid_stats_limits_are_rejected(client, url):
+    response = client.get(url)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+    assert client.get(url.replace('ten', '10')).status_code == 200
+
+
+def test_report_markdown_is_streamed(client, git_repo):
+    git_repo.commit({'a.py': 'print(1)\n'}, 'Add a')
+    request = {'repoPath': str(git_repo.path), 'since': '2023-01-01', 'until': '2023-12-31'}
+    report_id = client.post('/api/analyze', json=request).get_json()['report_id']
+
+    response = client.get(f'/api/reports/{report_id}/markdown')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/markdown'
+    assert response.is_streamed
+    assert response.get_data(as_text=True).startswith('# Development Activity Executive Summary')
+    assert client.get('/api/reports/report_missing/markdown').status_code == 404
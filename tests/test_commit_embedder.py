@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from agents.base_agent import CommitAnalysis
+from agents.commit_embedder import CommitEmbedder
+from storage.vector_store import VectorStore
+
+
+class FakeModel:
+    """Stands in for a sentence-transformers model; one vector per text."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size, convert_to_numpy, show_progress_bar):
+        self.calls.append(list(texts))
+        return np.asarray([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def make_analysis(i):
+    return CommitAnalysis(commit_hash=f'{i:040x}', author='Alice', date=datetime(2023, 6, 1), message=f'Commit {i}',
+                          files_changed=[], insertions=0, deletions=0, summary='Summary', category='feature',
+                          impact_score=0.1, risk_assessment='low')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = VectorStore(tmp_path / 'vectors')
+    yield store
+    store.close()
+
+
+def embedder_with_fake_model(**options):
+    embedder = CommitEmbedder(**options)
+    embedder._model = FakeModel()
+    return embedder
+
+
+def test_commits_are_embedded_in_batches(store):
+    embedder = embedder_with_fake_model(batch_size=2)
+
+    stats = embedder.embed([make_analysis(i) for i in range(5)], store)
+
+    assert (stats['embedded'], stats['cached']) == (5, 0)
+    assert [len(call) for call in embedder._model.calls] == [2, 2, 1]
+    assert embedder._model.calls[0][0] == 'Commit 0\nSummary'
+    assert store.get(f'{0:040x}') == [len('Commit 0\nSummary'), 1.0]
+
+
+def test_stored_commits_are_not_embedded_again(store):
+    embedder = embedder_with_fake_model()
+    embedder.embed([make_analysis(i) for i in range(3)], store)
+
+    stats = embedder.embed([make_analysis(i) for i in range(4)], store)
+
+    assert (stats['embedded'], stats['cached']) == (1, 3)
+    assert embedder._model.calls[-1] == ['Commit 3\nSummary']
+
+
+def test_the_model_is_only_loaded_when_needed(store):
+    embedder = embedder_with_fake_model()
+    embedder.embed([make_analysis(0)], store)
+    embedder._model = None
+
+    assert embedder.embed([make_analysis(0)], store)['cached'] == 1
+    assert embedder._model is None
+
+
+def test_namespace_is_filesystem_safe():
+    assert CommitEmbedder('sentence-transformers/all-MiniLM-L6-v2').namespace == \
+        'sentence-transformers_all-MiniLM-L6-v2'
+    assert CommitEmbedder(model_version='../..').namespace == 'default'
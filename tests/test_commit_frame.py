@@ -0,0 +1,95 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('pandas')
+
+from agents.advanced_analyzer import AdvancedCommitAnalyzer
+from agents.base_agent import CommitAnalysis
+from agents.commit_frame import CommitFrame
+from agents.enhanced_report_generator import EnhancedReportGenerator
+
+MESSAGES = ['Add login page', 'Fix crash on start', 'Refactor parser', 'Update docs', 'Bump version']
+FILES = ['src/app.py', 'web/style.css', 'README.md', 'web/page.jsx']
+
+
+def make_analyses(count, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2023, 6, 1, tzinfo=timezone.utc)
+    analyses = []
+    for i in range(count):
+        offset = timezone(timedelta(hours=rng.choice([-7, 0, 2, 9])))
+        authored = (start + timedelta(minutes=rng.randrange(20 * 24 * 60))).astimezone(offset)
+        # Some commits are committed days after they were written, e.g. rebased
+        committed = authored + timedelta(days=rng.choice([0, 0, 0, 3]), hours=rng.randrange(12))
+        files = rng.sample(FILES, rng.randint(1, 3))
+        analyses.append(CommitAnalysis(
+            commit_hash=f'{i:040x}',
+            author=rng.choice(['Alice', 'Bob', 'Carol']),
+            date=authored,
+            message=rng.choice(MESSAGES),
+            files_changed=files,
+            insertions=rng.randrange(100),
+            deletions=rng.randrange(50),
+            summary='',
+            category='',
+            impact_score=rng.choice([0.1, 0.3, 0.5, 0.7, 0.9]),
+            risk_assessment=rng.choice(['low', 'medium', 'high']),
+            committed_at=committed.astimezone(timezone(timedelta(hours=rng.choice([-7, 0, 2]))))
+        ))
+    return analyses
+
+
+@pytest.fixture
+def commits():
+    analyses = make_analyses(300)
+    analyzer = AdvancedCommitAnalyzer()
+    return analyses, [analyzer.generate_non_technical_summary(analysis) for analysis in analyses]
+
+
+def test_daily_partials_match_the_accumulator(commits):
+    analyses, summaries = commits
+    expected = EnhancedReportGenerator().accumulate(summaries).daily
+
+    daily = CommitFrame.from_commits(analyses, summaries).daily_partials()
+
+    assert {day: partial.to_dict() for day, partial in daily.items()} == \
+        {day: partial.to_dict() for day, partial in expected.items()}
+
+
+def test_dashboard_summary_matches_the_accumulator(commits):
+    analyses, summaries = commits
+    expected = EnhancedReportGenerator().accumulate(summaries).dashboard_summary()
+
+    assert CommitFrame.from_commits(analyses, summaries).dashboard_summary() == expected
+
+
+def test_timeline_matches_the_accumulator(commits):
+    analyses, summaries = commits
+    expected = EnhancedReportGenerator().accumulate(summaries, keep_timeline=True).timeline
+
+    timeline = CommitFrame.from_commits(analyses, summaries).timeline(summaries)
+
+    assert set(timeline) == set(expected)
+    for day, day_commits in expected.items():
+        assert [commit['commit_id'] for commit in timeline[day]] == [commit['commit_id'] for commit in day_commits]
+
+
+def test_stored_summaries_give_the_same_partials(commits):
+    analyses, summaries = commits
+    # Once a report is stored, typed timestamps come back as ISO strings
+    stored = [dict(summary, timestamp=summary['timestamp'].isoformat(),
+                   committed_at=summary['committed_at'].isoformat()) for summary in summaries]
+
+    typed = CommitFrame.from_commits(analyses, summaries).daily_partials()
+    parsed = CommitFrame.from_commits(analyses, stored).daily_partials()
+
+    assert {day: partial.to_dict() for day, partial in parsed.items()} == \
+        {day: partial.to_dict() for day, partial in typed.items()}
+
+
+def test_mismatched_lengths_are_rejected(commits):
+    analyses, summaries = commits
+    with pytest.raises(ValueError):
+        CommitFrame.from_commits(analyses, summaries[1:])
@@ -0,0 +1,93 @@
+from datetime import date, datetime
+
+import pytest
+
+from agents.commit_index import CommitDateIndex, complete_days, format_timeframe, parse_timeframe, resolve_dates
+
+
+def timestamp(text):
+    return int(datetime.fromisoformat(text).timestamp())
+
+
+@pytest.fixture
+def index(git_repo, tmp_path):
+    return CommitDateIndex(git_repo.path, tmp_path / 'indexes')
+
+
+@pytest.mark.parametrize('timeframe, expected', [
+    ('week', ('1 week ago', None)),
+    ('month', ('1 month ago', None)),
+    ('2023-01-01..2023-02-01', ('2023-01-01', '2023-02-01')),
+    ('..2023-02-01', (None, '2023-02-01')),
+    ('3 days ago', ('3 days ago', None)),
+])
+def test_parse_timeframe(timeframe, expected):
+    assert parse_timeframe(timeframe) == expected
+
+
+def test_format_timeframe_round_trips():
+    assert format_timeframe() == 'week'
+    assert parse_timeframe(format_timeframe('2023-01-01', None)) == ('2023-01-01', None)
+
+
+def test_resolve_dates_uses_git_date_parser(git_repo):
+    since, until = resolve_dates(git_repo.path, '2023-06-01T00:00:00+00:00', '2023-06-02T00:00:00+00:00')
+    assert until - since == 86400
+    assert resolve_dates(git_repo.path, None, None) == (None, None)
+
+
+def test_complete_days_allow_for_every_utc_offset():
+    first, last = complete_days(timestamp('2023-06-01T00:00:00+00:00'), timestamp('2023-06-10T00:00:00+00:00'))
+
+    # In UTC+14 June 1 begins before the window (May 31, 10:00 UTC);
+    # in UTC-12 June 9 ends after it (June 10, 12:00 UTC)
+    assert first == date(2023, 6, 2)
+    assert last == date(2023, 6, 8)
+
+
+def test_complete_days_without_a_start():
+    first, last = complete_days(None, timestamp('2023-06-10T12:00:00+00:00'))
+    assert first is None
+    assert last == date(2023, 6, 9)
+
+
+def test_queries_return_commits_in_range_newest_first(git_repo, index):
+    hashes = [git_repo.commit({f'{day}.txt': 'x\n'}, f'Day {day}', date=f'2023-06-0{day}T12:00:00+00:00')
+              for day in range(1, 6)]
+
+    assert index.update() == 5
+    assert index.query() == hashes[::-1]
+    assert index.query(timestamp('2023-06-02T00:00:00+00:00'),
+                       timestamp('2023-06-04T00:00:00+00:00')) == [hashes[2], hashes[1]]
+    assert index.commits_in_range('2023-06-04T00:00:00+00:00') == [hashes[4], hashes[3]]
+
+
+def test_ranges_select_by_committer_date(git_repo, index):
+    late = git_repo.commit({'a.txt': 'a\n'}, 'Rebased', date='2023-01-01T12:00:00+00:00',
+                           committer_date='2023-06-15T12:00:00+00:00')
+
+    assert index.commits_in_range('2023-06-01', '2023-06-30') == [late]
+    assert index.commits_in_range('2022-12-01', '2023-01-31') == []
+
+
+def test_update_adds_only_new_commits(git_repo, index):
+    git_repo.commit({'a.txt': 'a\n'}, 'First')
+    index.update()
+    head = git_repo.commit({'b.txt': 'b\n'}, 'Second', date='2023-06-02T12:00:00+00:00')
+
+    assert index.update() == 1
+    assert index.update() == 0
+    assert index.indexed_head() == head
+
+
+def test_rewritten_history_rebuilds_the_index(git_repo, index):
+    first = git_repo.commit({'a.txt': 'a\n'}, 'First')
+    dropped = git_repo.commit({'b.txt': 'b\n'}, 'Second', date='2023-06-02T12:00:00+00:00')
+    index.update()
+
+    git_repo.git('reset', '-q', '--hard', first)
+    replacement = git_repo.commit({'c.txt': 'c\n'}, 'Replacement', date='2023-06-03T12:00:00+00:00')
+
+    assert index.update() == 2
+    assert dropped not in index.query()
+    assert index.query() == [replacement, first]
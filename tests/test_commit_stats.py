@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.base_agent import CommitAnalysis
+from storage.document_store import DocumentStore
+
+
+def make_analysis(name, when, author='Alice', risk='low', impact=0.5, files=('src/app.py',)):
+    return CommitAnalysis(commit_hash=name * 40, author=author, date=when, message=f'Commit {name}',
+                          files_changed=list(files), insertions=1, deletions=0, summary='Summary',
+                          category='feature', impact_score=impact, risk_assessment=risk,
+                          file_stats={path: (1, 0) for path in files})
+
+
+def local(day, hour, minute, hours):
+    return datetime(2023, 6, day, hour, minute, tzinfo=timezone(timedelta(hours=hours)))
+
+
+# Each commit falls on a different UTC day than its author's local day
+COMMITS = [
+    # Local Thursday June 1, UTC June 2
+    make_analysis('a', local(1, 23, 30, -5), impact=0.2),
+    # Local Friday June 2, UTC June 1
+    make_analysis('b', local(2, 0, 30, 2), author='Bob', risk='high', impact=0.9),
+    # Local Sunday June 4, UTC Monday June 5
+    make_analysis('c', local(4, 23, 0, -5), files=('src/app.py', 'README.md')),
+    # Local June 30, UTC July 1
+    make_analysis('d', local(30, 22, 0, -4), author='Bob'),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / 'data'))
+    store.store_commit_analyses(COMMITS, '/repo')
+    yield store
+    store.close()
+
+
+def counts(rows, key):
+    return {row[key]: row['commits'] for row in rows}
+
+
+def test_commits_are_grouped_by_the_authors_local_day(store):
+    assert counts(store.aggregate_commits(['day']), 'day') == {
+        '2023-06-01': 1, '2023-06-02': 1, '2023-06-04': 1, '2023-06-30': 1
+    }
+    assert counts(store.aggregate_commits(['week']), 'week') == {'2023-05-29': 3, '2023-06-26': 1}
+    assert counts(store.aggregate_commits(['month']), 'month') == {'2023-06': 4}
+
+
+def test_day_filters_select_the_commits_of_their_day_group(store):
+    for day in ('2023-06-01', '2023-06-02', '2023-06-04'):
+        next_day = (datetime.fromisoformat(day) + timedelta(days=1)).date().isoformat()
+        rows = store.aggregate_commits(['day'], since=day, until=next_day)
+        assert counts(rows, 'day') == {day: 1}
+
+    rows = store.aggregate_commits(['author'], since='2023-06-02', until='2023-07-01')
+    assert counts(rows, 'author') == {'Alice': 1, 'Bob': 2}
+
+
+def test_aggregates_per_group(store):
+    rows = store.aggregate_commits(['author', 'risk'])
+
+    assert [(row['author'], row['risk'], row['commits'], row['high_risk']) for row in rows] == [
+        ('Alice', 'low', 2, 0), ('Bob', 'high', 1, 1), ('Bob', 'low', 1, 0)
+    ]
+    assert store.aggregate_commits([])[0]['max_impact'] == 0.9
+    with pytest.raises(ValueError):
+        store.aggregate_commits(['hour'])
+
+
+def test_list_commits_uses_the_same_day_bounds(store):
+    listed = store.list_commits(since='2023-06-02', until='2023-06-05')
+
+    assert [commit['commit_hash'][0] for commit in listed] == ['c', 'b']
+    assert [commit['commit_hash'][0] for commit in store.list_commits(order_by='impact', limit=2)] == ['b', 'd']
+    assert store.list_commits(risk='high', author='Bob')[0]['date'] == COMMITS[1].date.isoformat()
+    with pytest.raises(ValueError):
+        store.list_commits(order_by='size')
+
+
+def test_list_file_changes(store):
+    store.store_commit_analyses([make_analysis('e', local(3, 12, 0, 0))], '/other')
+
+    changes = store.list_file_changes('src/app.py', repo_path='/repo')
+
+    assert [change['commit_hash'][0] for change in changes] == ['d', 'c', 'b', 'a']
+    assert (changes[0]['insertions'], changes[0]['deletions']) == (1, 0)
+    assert [change['commit_hash'][0] for change in store.list_file_changes('README.md')] == ['c']
+    assert len(store.list_file_changes('src/app.py', limit=2)) == 2
+    assert len(store.list_file_changes('src/app.py')) == 5
+    assert store.list_file_changes('missing.py') == []
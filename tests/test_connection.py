@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from storage.connection import ConnectionManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = ConnectionManager(tmp_path / 'test.sqlite', pool_size=2)
+    with manager.transaction() as cursor:
+        cursor.execute("CREATE TABLE items (name TEXT)")
+    yield manager
+    manager.close()
+
+
+def names(db):
+    with db.cursor() as cursor:
+        cursor.execute("SELECT name FROM items ORDER BY name")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def test_connections_use_wal(db):
+    with db.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        assert cursor.fetchone()[0] == 'wal'
+
+
+def test_nested_blocks_share_the_thread_connection(db):
+    with db.connection() as outer:
+        with db.connection() as inner:
+            assert inner is outer
+
+    with db.connection() as again:
+        assert again is outer
+
+
+def test_transaction_commits_and_rolls_back(db):
+    with db.transaction() as cursor:
+        cursor.execute("INSERT INTO items VALUES ('kept')")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO items VALUES ('discarded')")
+            raise RuntimeError("abort")
+
+    assert names(db) == ['kept']
+
+
+def test_nested_transactions_join_the_outermost(db):
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO items VALUES ('outer')")
+            with db.transaction() as inner:
+                inner.execute("INSERT INTO items VALUES ('inner')")
+            raise RuntimeError("abort")
+
+    assert names(db) == []
+
+
+def test_threads_check_out_separate_connections(db):
+    checked_out = []
+    barrier = threading.Barrier(3)
+
+    def worker(name):
+        with db.transaction() as cursor:
+            checked_out.append(cursor.connection)
+            barrier.wait(timeout=5)
+            cursor.execute("INSERT INTO items VALUES (?)", (name,))
+
+    threads = [threading.Thread(target=worker, args=(f'item{i}',)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(conn) for conn in checked_out}) == 3
+    assert names(db) == ['item0', 'item1', 'item2']
+    # Only pool_size connections are kept once the threads are done
+    assert db._pool.qsize() == 2
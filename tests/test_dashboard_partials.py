@@ -0,0 +1,143 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+from itertools import permutations
+
+import pytest
+
+from agents.enhanced_report_generator import DashboardPartial, ReportAccumulator, commit_day
+from main import CommitAnalysisApp, rollup_dashboard
+
+# Whole UTC days June 2 to June 8 are covered in every time zone
+TIMEFRAME = '2023-06-01T00:00:00+00:00..2023-06-10T00:00:00+00:00'
+COMPLETE_DAYS = [f'2023-06-0{day}' for day in range(2, 9)]
+
+
+def summary(author, category, timestamp, committed_at=None, impact='Low impact', risk='Low risk',
+            visual=False):
+    return {
+        'author': author,
+        'category': category,
+        'timestamp': timestamp,
+        'committed_at': committed_at,
+        'impact_score': f'{impact} - details',
+        'risk_level': f'{risk} - details',
+        'visual_changes': visual,
+    }
+
+
+COMMITS = [
+    summary('Alice', 'feature', datetime(2023, 6, 1, 9, 0), impact='High impact'),
+    summary('Bob', 'bugfix', datetime(2023, 6, 1, 17, 30), risk='High risk'),
+    summary('Alice', 'docs', datetime(2023, 6, 2, 8, 15), visual=True),
+    summary('Carol', 'feature', datetime(2023, 6, 4, 23, 59), impact='Medium impact'),
+]
+
+
+def partial_of(commits):
+    partial = DashboardPartial()
+    for commit in commits:
+        partial.add(commit)
+    return partial
+
+
+def test_merging_in_any_order_equals_one_pass():
+    expected = partial_of(COMMITS).to_dict()
+
+    for order in permutations([COMMITS[:1], COMMITS[1:3], COMMITS[3:]]):
+        assert DashboardPartial.merged(partial_of(part) for part in order).to_dict() == expected
+
+
+def test_summary_of_a_merged_partial():
+    result = DashboardPartial.merged(partial_of([commit]) for commit in COMMITS).summary()
+
+    assert result['total_commits'] == 4
+    assert result['time_span_days'] == 4
+    assert result['most_active_contributor'] == 'Alice'
+    assert result['commit_categories'] == {'feature': 2, 'bugfix': 1, 'docs': 1}
+    assert result['impact_distribution'] == {'high': 1, 'medium': 1, 'low': 2}
+    assert (result['high_risk_commits'], result['visual_changes_count']) == (1, 1)
+    assert [day['date'] for day in result['activity_timeline']] == ['2023-06-01', '2023-06-02', '2023-06-04']
+
+
+def test_stored_form_round_trips():
+    partial = partial_of(COMMITS)
+    stored = json.loads(json.dumps(partial.to_dict()))
+
+    assert DashboardPartial.from_dict(stored).to_dict() == partial.to_dict()
+    assert DashboardPartial.from_dict(stored).summary() == partial.summary()
+
+
+def test_empty_partial():
+    assert DashboardPartial.from_dict(DashboardPartial().to_dict()).summary()['total_commits'] == 0
+    assert DashboardPartial().summary()['time_span_days'] == 0
+
+
+def test_partials_follow_the_committer_day():
+    # Written on June 1, rebased and committed on June 3 at 00:30 in UTC+2
+    rebased = summary('Alice', 'feature', datetime(2023, 6, 1, 9, 0),
+                      committed_at=datetime(2023, 6, 3, 0, 30, tzinfo=timezone(timedelta(hours=2))))
+    accumulator = ReportAccumulator(keep_timeline=True)
+    accumulator.add(rebased)
+
+    assert commit_day(rebased) == date(2023, 6, 3)
+    assert commit_day(dict(rebased, committed_at=rebased['committed_at'].isoformat())) == date(2023, 6, 3)
+    assert list(accumulator.daily) == [date(2023, 6, 3)]
+    # The timeline still shows when the change was written
+    assert list(accumulator.timeline) == [date(2023, 6, 1)]
+
+
+@pytest.fixture
+def history(git_repo):
+    git_repo.commit({'a.py': 'a\n'}, 'Add edge feature', date='2023-06-01T12:00:00+00:00')
+    git_repo.commit({'b.py': 'b\n'}, 'Add parser', date='2023-06-03T12:00:00+00:00')
+    git_repo.commit({'c.py': 'c\n'}, 'Fix rebased bug', date='2023-05-20T12:00:00+00:00',
+                    committer_date='2023-06-05T12:00:00+00:00')
+    return git_repo
+
+
+def stored_counts(app):
+    return {row['day']: row['partial']['total_commits'] for row in app.storage.load_dashboard_partials()}
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_analysis_stores_partials_of_complete_days(history, tmp_path, streaming):
+    app = CommitAnalysisApp(str(history.path), str(tmp_path / 'data'))
+    try:
+        app._analyze_and_store(TIMEFRAME, streaming=streaming)
+        counts = stored_counts(app)
+    finally:
+        app.close()
+
+    # June 1 is at the edge of the window; days without commits are stored empty
+    assert list(counts) == COMPLETE_DAYS
+    assert counts['2023-06-03'] == 1
+    assert counts['2023-06-05'] == 1
+    assert sum(counts.values()) == 2
+
+
+def test_reused_analyses_keep_their_committer_day(history, tmp_path):
+    for _ in range(2):
+        app = CommitAnalysisApp(str(history.path), str(tmp_path / 'data'))
+        try:
+            app._analyze_and_store(TIMEFRAME)
+            counts = stored_counts(app)
+        finally:
+            app.close()
+
+    assert counts['2023-06-05'] == 1
+    assert sum(counts.values()) == 2
+
+
+def test_rollup_merges_stored_days(history, tmp_path):
+    app = CommitAnalysisApp(str(history.path), str(tmp_path / 'data'))
+    try:
+        app._analyze_and_store(TIMEFRAME)
+        result = rollup_dashboard(app.storage, '2023-06-01', '2023-06-08')
+        with pytest.raises(ValueError):
+            rollup_dashboard(app.storage, 'last week')
+    finally:
+        app.close()
+
+    assert result['days_merged'] == 7
+    assert result['missing_days'] == {app.repo_key: ['2023-06-01']}
+    assert result['dashboard_summary']['total_commits'] == 2
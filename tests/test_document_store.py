@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from agents.base_agent import CommitAnalysis
+from storage.document_store import DocumentStore
+
+
+def make_analysis(i, author='Alice', files=None):
+    files = files if files is not None else {f'src/module{i}.py': (i, 1)}
+    return CommitAnalysis(
+        commit_hash=f'{i:040x}',
+        author=author,
+        date=datetime(2023, 6, 1, 12, 0) + timedelta(minutes=i),
+        message=f'Commit {i}',
+        files_changed=list(files),
+        insertions=sum(added for added, _ in files.values()),
+        deletions=sum(removed for _, removed in files.values()),
+        summary=f'Summary {i}',
+        category='feature',
+        impact_score=0.5,
+        risk_assessment='low',
+        file_stats=files
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / 'data'))
+    yield store
+    store.close()
+
+
+def test_writes_are_split_into_timed_batches(store):
+    timings = store.store_commit_analyses((make_analysis(i) for i in range(25)), '/repo', batch_size=10)
+
+    assert [timing['rows'] for timing in timings] == [10, 10, 5]
+    assert all(timing['seconds'] >= 0 for timing in timings)
+
+    hashes = [f'{i:040x}' for i in range(25)]
+    records = store.load_commit_analyses(hashes, '/repo')
+    assert store.get_known_commit_hashes('/repo') == set(hashes)
+    assert [records[commit_hash]['summary'] for commit_hash in hashes] == [f'Summary {i}' for i in range(25)]
+    assert records[hashes[24]]['file_stats'] == {'src/module24.py': (24, 1)}
+
+
+def test_batches_are_read_lazily_and_committed_one_by_one(store, monkeypatch):
+    produced = []
+    committed = []
+    transaction = store.db.transaction
+
+    def analyses():
+        for i in range(7):
+            produced.append(i)
+            yield make_analysis(i)
+
+    def recording_transaction():
+        committed.append(len(produced))
+        return transaction()
+
+    monkeypatch.setattr(store.db, 'transaction', recording_transaction)
+    store.store_commit_analyses(analyses(), '/repo', batch_size=3)
+
+    # Each transaction only sees the analyses produced so far
+    assert committed == [3, 6, 7]
+
+
+def test_rewriting_a_batch_updates_rows_in_place(store):
+    store.store_commit_analyses([make_analysis(i) for i in range(5)], '/repo', batch_size=2)
+    rewritten = make_analysis(3, files={'docs/new.md': (7, 0)})
+    rewritten.summary = 'Rewritten'
+
+    store.store_commit_analyses([rewritten], '/repo', batch_size=2)
+
+    record = store.load_commit_analyses([f'{3:040x}'], '/repo')[f'{3:040x}']
+    assert (record['summary'], record['files_changed']) == ('Rewritten', ['docs/new.md'])
+    with store.db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM commit_analyses")
+        assert cursor.fetchone()[0] == 5
+
+
+def table_count(store, table):
+    with store.db.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        return cursor.fetchone()[0]
+
+
+def test_shared_authors_and_paths_are_stored_once(store):
+    analyses = [
+        make_analysis(0, 'Alice', {'src/z.py': (3, 1), 'README.md': (1, 0), 'src/a.py': (2, 2)}),
+        make_analysis(1, 'Bob', {'src/a.py': (5, 0), 'src/z.py': (0, 4)}),
+        make_analysis(2, 'Alice', {'README.md': (1, 1)}),
+        make_analysis(3, 'Bob', {}),
+    ]
+    # Binary files have no line counts
+    analyses[2].files_changed.append('logo.png')
+
+    store.store_commit_analyses(analyses, '/repo', batch_size=2)
+    records = store.load_commit_analyses([analysis.commit_hash for analysis in analyses], '/repo')
+
+    assert (table_count(store, 'authors'), table_count(store, 'files'), table_count(store, 'commit_files')) == (2, 4, 7)
+    for analysis in analyses:
+        record = records[analysis.commit_hash]
+        assert record['author'] == analysis.author
+        # Paths come back in the order git reported them, not sorted or by file ID
+        assert record['files_changed'] == analysis.files_changed
+        assert record['file_stats'] == analysis.file_stats
+        assert (record['insertions'], record['deletions']) == (analysis.insertions, analysis.deletions)
+        assert CommitAnalysis.from_dict(record).files_changed == analysis.files_changed
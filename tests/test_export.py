@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+
+from agents.base_agent import CommitAnalysis
+from storage.document_store import DocumentStore
+from storage.export import ColumnarExporter, partition_name
+
+
+def make_analysis(commit_hash, day, files=None):
+    files = files or {'src/parser.py': (10, 2)}
+    return CommitAnalysis(
+        commit_hash=commit_hash * 40,
+        author='Alice',
+        date=datetime(2023, 6, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))) + timedelta(days=day),
+        message=f'Commit {commit_hash}',
+        files_changed=list(files),
+        insertions=sum(added for added, _ in files.values()),
+        deletions=sum(removed for _, removed in files.values()),
+        summary='Summary',
+        category='feature',
+        impact_score=0.5,
+        risk_assessment='low',
+        file_stats=files
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / 'data'))
+    yield store
+    store.close()
+
+
+def read_partition(output_dir, dataset, month, extension='parquet'):
+    path = output_dir / dataset / f"repo={partition_name('/repo')}" / f"month={month}" / f"part.{extension}"
+    if extension == 'parquet':
+        return pd.read_parquet(path)
+    import pyarrow as pa
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def test_partition_names_are_readable_and_distinct():
+    assert partition_name('/work/my repo').startswith('my_repo-')
+    assert partition_name('/a/repo') != partition_name('/b/repo')
+    assert partition_name(None) == 'unknown'
+
+
+def test_export_writes_typed_partitions_per_month(store, tmp_path):
+    store.store_commit_analyses([
+        make_analysis('a', 0, {'src/parser.py': (10, 2), 'README.md': (1, 0)}),
+        make_analysis('b', 1),
+        make_analysis('c', 30),
+    ], '/repo')
+
+    result = ColumnarExporter(store, tmp_path / 'export').export()
+
+    assert result['partitions_written'] == 2
+    assert (result['commit_rows'], result['file_rows']) == (3, 4)
+
+    commits = read_partition(tmp_path / 'export', 'commits', '2023-06')
+    assert list(commits['commit_hash']) == ['a' * 40, 'b' * 40]
+    assert list(commits['files_changed']) == [2, 1]
+    assert str(commits['insertions'].dtype) == 'int64'
+    assert str(commits['category'].dtype) == 'category'
+    assert commits['date'][0] == pd.Timestamp('2023-06-01T10:00:00Z')
+
+    files = read_partition(tmp_path / 'export', 'files', '2023-06')
+    assert sorted(files['path']) == ['README.md', 'src/parser.py', 'src/parser.py']
+    assert len(read_partition(tmp_path / 'export', 'commits', '2023-07')) == 1
+
+
+def test_later_exports_rewrite_only_changed_partitions(store, tmp_path):
+    store.store_commit_analyses([make_analysis('a', 0), make_analysis('c', 30)], '/repo')
+    exporter = ColumnarExporter(store, tmp_path / 'export')
+    exporter.export()
+
+    assert exporter.export()['partitions_written'] == 0
+
+    store.store_commit_analyses([make_analysis('b', 1)], '/repo')
+    result = exporter.export()
+
+    assert result['partitions_written'] == 1
+    assert result['commit_rows'] == 2
+    assert len(read_partition(tmp_path / 'export', 'commits', '2023-06')) == 2
+
+
+def test_arrow_export_and_format_change(store, tmp_path):
+    store.store_commit_analyses([make_analysis('a', 0)], '/repo')
+    ColumnarExporter(store, tmp_path / 'export').export()
+
+    # Switching format exports every partition again
+    result = ColumnarExporter(store, tmp_path / 'export', 'arrow').export()
+
+    assert result['partitions_written'] == 1
+    assert list(read_partition(tmp_path / 'export', 'commits', '2023-06', 'arrow')['commit_hash']) == ['a' * 40]
+    with pytest.raises(ValueError):
+        ColumnarExporter(store, tmp_path / 'export', 'csv')
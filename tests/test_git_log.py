@@ -0,0 +1,109 @@
+from agents.commit_analyzer import EXTRACTION_MODES, CommitAnalyzerAgent
+from agents.git_log import (
+    FIELD_SEPARATOR, RECORD_SEPARATOR, NumstatLogParser, iter_numstat_commits, parse_numstat_log
+)
+
+
+def header(commit_hash, author='Alice', message='Change', committer_date='Thu Jun 1 12:00:00 2023 +0000'):
+    fields = [commit_hash, author, 'Thu Jun 1 12:00:00 2023 +0000', message, committer_date]
+    return RECORD_SEPARATOR + FIELD_SEPARATOR.join(fields) + '\n'
+
+
+def test_parse_numstat_log_splits_commits_and_sums_counts():
+    lines = [
+        header('a' * 40, message='Add parser'),
+        '\n',
+        '10\t2\tsrc/parser.py\n',
+        '3\t0\tREADME.md\n',
+        header('b' * 40, author='Bob', message='Add logo'),
+        '\n',
+        '-\t-\tassets/logo.png\n',
+    ]
+
+    first, second = parse_numstat_log(lines)
+
+    assert first['hash'] == 'a' * 40
+    assert first['message'] == 'Add parser'
+    assert first['files_changed'] == ['src/parser.py', 'README.md']
+    assert first['file_stats'] == {'src/parser.py': (10, 2), 'README.md': (3, 0)}
+    assert (first['insertions'], first['deletions']) == (13, 2)
+    assert first['committer_date'] == 'Thu Jun 1 12:00:00 2023 +0000'
+    # Binary files count as changed without line counts
+    assert second['author'] == 'Bob'
+    assert second['files_changed'] == ['assets/logo.png']
+    assert (second['insertions'], second['deletions']) == (0, 0)
+
+
+def test_parser_returns_a_commit_only_once_the_next_one_starts():
+    parser = NumstatLogParser()
+
+    assert parser.feed(header('a' * 40)) is None
+    assert parser.feed('1\t1\tfile.txt\n') is None
+    finished = parser.feed(header('b' * 40))
+    assert finished['hash'] == 'a' * 40
+    assert parser.close()['hash'] == 'b' * 40
+    assert parser.close() is None
+
+
+def test_max_files_keeps_totals_and_counts_omitted_files():
+    lines = [header('a' * 40)] + [f'{i}\t1\tfile{i}.txt\n' for i in range(1, 6)]
+
+    commit, = parse_numstat_log(lines, max_files=2)
+
+    assert commit['files_changed'] == ['file1.txt', 'file2.txt']
+    assert commit['omitted_files'] == 3
+    assert (commit['insertions'], commit['deletions']) == (15, 5)
+
+
+def test_iter_numstat_commits_reads_a_repository(git_repo):
+    first = git_repo.commit({'a.txt': 'one\ntwo\n'}, 'Add a')
+    second = git_repo.commit({'a.txt': 'one\n', 'b.txt': 'new\n'}, 'Edit a, add b', author='Bob',
+                             date='2023-06-02T12:00:00+00:00')
+
+    commits = list(iter_numstat_commits(git_repo.path))
+
+    # git log order: newest first
+    assert [commit['hash'] for commit in commits] == [second, first]
+    assert commits[0]['author'] == 'Bob'
+    assert commits[0]['file_stats'] == {'a.txt': (0, 1), 'b.txt': (1, 0)}
+    assert commits[1]['file_stats'] == {'a.txt': (2, 0)}
+
+
+def test_iter_numstat_commits_selects_given_hashes_in_order(git_repo):
+    hashes = [git_repo.commit({f'{i}.txt': f'{i}\n'}, f'Commit {i}') for i in range(3)]
+
+    commits = list(iter_numstat_commits(git_repo.path, commit_hashes=[hashes[0], hashes[2]]))
+
+    assert [commit['hash'] for commit in commits] == [hashes[0], hashes[2]]
+    assert list(iter_numstat_commits(git_repo.path, commit_hashes=[])) == []
+
+
+def test_iter_numstat_commits_without_numstat_has_no_files(git_repo):
+    git_repo.commit({'a.txt': 'a\n'}, 'Add a')
+
+    commit, = iter_numstat_commits(git_repo.path, with_numstat=False)
+
+    assert commit['files_changed'] == []
+    assert commit['message'] == 'Add a'
+
+
+def test_renames_are_counted_the_same_in_both_extraction_modes(git_repo):
+    git_repo.git('config', 'diff.renames', 'true')
+    git_repo.commit({'f1.txt': 'one\ntwo\n', 'other.txt': 'x\n'}, 'Add files')
+    git_repo.git('mv', 'f1.txt', 'g1.txt')
+    renamed = git_repo.commit({'g1.txt': 'one\n'}, 'Rename f1', date='2023-06-02T12:00:00+00:00')
+
+    results = {}
+    for mode in EXTRACTION_MODES:
+        agent = CommitAnalyzerAgent(str(git_repo.path), extraction_mode=mode, max_files_per_commit=10)
+        try:
+            analyses = agent.process('2023-01-01..2023-12-31')['detailed_analysis']
+        finally:
+            agent.close()
+        results[mode] = {analysis.commit_hash: analysis for analysis in analyses}
+
+    bulk, per_commit = results['bulk'], results['per_commit']
+    assert bulk[renamed].file_stats == {'f1.txt': (0, 2), 'g1.txt': (1, 0)}
+    for commit_hash, analysis in per_commit.items():
+        for field in ('files_changed', 'file_stats', 'insertions', 'deletions', 'omitted_files'):
+            assert getattr(bulk[commit_hash], field) == getattr(analysis, field), (commit_hash, field)
@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from agents.git_log import iter_numstat_commits
+from agents.git_object_reader import GitObjectReader
+
+
+@pytest.fixture
+def reader(git_repo):
+    with GitObjectReader(git_repo.path) as reader:
+        yield reader
+
+
+def test_commit_numstat_matches_git_log(git_repo, reader):
+    hashes = [
+        git_repo.commit({'a.txt': 'one\ntwo\n'}, 'Root'),
+        git_repo.commit({'a.txt': 'one\n', 'b.bin': b'\x00\x01'}, 'Edit'),
+        git_repo.commit({f'f{i}.txt': 'x\n' for i in range(4)}, 'Many files'),
+    ]
+
+    logged = {commit['hash']: commit for commit in iter_numstat_commits(git_repo.path, max_files=2)}
+    for commit_hash in hashes:
+        stats = reader.commit_numstat(commit_hash, max_files=2)
+        expected = logged[commit_hash]
+        for key in ('files_changed', 'file_stats', 'insertions', 'deletions', 'omitted_files'):
+            assert stats[key] == expected[key], (commit_hash, key)
+
+
+def test_capped_commits_keep_the_pipe_in_step(git_repo, reader):
+    wide = git_repo.commit({f'f{i:03}.txt': 'x\n' * 2 for i in range(200)}, 'Many files')
+    narrow = git_repo.commit({'a.txt': 'a\n'}, 'Add a')
+
+    stats = reader.commit_numstat(wide, max_files=3)
+
+    assert stats['files_changed'] == ['f000.txt', 'f001.txt', 'f002.txt']
+    assert (stats['omitted_files'], stats['insertions']) == (197, 400)
+    # Lines past the cap were still read up to the sentinel
+    assert reader.commit_numstat(narrow)['files_changed'] == ['a.txt']
+
+
+def test_restarts_a_process_that_died(git_repo, reader):
+    commit_hash = git_repo.commit({'a.txt': 'a\n'}, 'Add a')
+    expected = reader.commit_numstat(commit_hash)
+
+    reader._diff_tree().process.kill()
+    reader._diff_tree().process.wait()
+
+    assert reader.commit_numstat(commit_hash) == expected
+
+
+def test_close_stops_the_process_and_later_lookups_restart(git_repo):
+    commit_hash = git_repo.commit({'a.txt': 'a\n'}, 'Add a')
+    reader = GitObjectReader(git_repo.path)
+    reader.commit_numstat(commit_hash)
+    process = reader._diff_tree().process
+
+    reader.close()
+
+    assert process.poll() is not None
+    assert reader._diff_tree().process is None
+    assert reader.commit_numstat(commit_hash)['files_changed'] == ['a.txt']
+    reader.close()
+
+
+def test_each_thread_reads_from_its_own_process(git_repo, reader):
+    hashes = [git_repo.commit({f'{i}.txt': 'x\n' * (i + 1)}, f'Commit {i}') for i in range(4)]
+    expected = {commit_hash: reader.commit_numstat(commit_hash) for commit_hash in hashes}
+    results = {}
+    barrier = threading.Barrier(2)
+
+    def worker(name):
+        barrier.wait(timeout=5)
+        results[name] = {commit_hash: reader.commit_numstat(commit_hash) for commit_hash in hashes}
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ('first', 'second')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {'first': expected, 'second': expected}
+    # The main thread's process plus one per worker thread
+    assert reader.running_processes == 3
+    reader.close()
+    assert reader.running_processes == 0
@@ -0,0 +1,117 @@
+import subprocess
+
+import pytest
+
+from agents.base_agent import CommitAnalysis
+from main import CommitAnalysisApp
+
+TIMEFRAME = '2023-01-01..2023-12-31'
+
+
+@pytest.fixture
+def history(git_repo):
+    for day in range(1, 4):
+        git_repo.commit({f'file{day}.py': 'print(1)\n' * day, 'README.md': f'v{day}\n'},
+                        f'Add feature {day}', date=f'2023-06-0{day}T12:00:00+00:00')
+    return git_repo
+
+
+def open_app(repo, storage, **options):
+    return CommitAnalysisApp(str(repo.path), str(storage), **options)
+
+
+def stored_settings(app):
+    with app.storage.db.cursor() as cursor:
+        cursor.execute("SELECT DISTINCT analysis_settings FROM commit_analyses")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def test_second_run_reuses_stored_analyses(history, tmp_path, capsys):
+    first = open_app(history, tmp_path / 'data')
+    _, fresh = first._analyze_and_store(TIMEFRAME)
+    first.close()
+
+    second = open_app(history, tmp_path / 'data')
+    assert len(second.known_hashes) == 3
+    _, reused = second._analyze_and_store(TIMEFRAME)
+    second.close()
+
+    assert '(0 new, 3 reused)' in capsys.readouterr().out
+    assert reused['report'] == fresh['report']
+    assert reused['dashboard_summary'] == fresh['dashboard_summary']
+
+
+def test_analyses_made_with_other_settings_are_redone(history, tmp_path, capsys):
+    default = open_app(history, tmp_path / 'data')
+    default._analyze_and_store(TIMEFRAME)
+    assert stored_settings(default) == {default.analyzer.analysis_settings}
+    default.close()
+    capsys.readouterr()
+
+    capped = open_app(history, tmp_path / 'data', max_files_per_commit=1)
+    assert capped.known_hashes == set()
+    capped._analyze_and_store(TIMEFRAME)
+    capped.close()
+
+    assert '(3 new, 0 reused)' in capsys.readouterr().out
+    assert stored_settings(capped) == {capped.analyzer.analysis_settings}
+    assert open_app(history, tmp_path / 'data').known_hashes == set()
+
+
+def test_legacy_rows_without_settings_are_redone(history, tmp_path):
+    app = open_app(history, tmp_path / 'data')
+    app._analyze_and_store(TIMEFRAME)
+    with app.storage.db.transaction() as cursor:
+        cursor.execute("UPDATE commit_analyses SET analysis_settings = NULL")
+    app.close()
+
+    assert open_app(history, tmp_path / 'data').known_hashes == set()
+
+
+def test_analyses_of_the_other_extraction_mode_are_redone(history, tmp_path):
+    per_commit = open_app(history, tmp_path / 'data')
+    per_commit._analyze_and_store(TIMEFRAME)
+    per_commit.close()
+
+    bulk = open_app(history, tmp_path / 'data', extraction_mode='bulk')
+    try:
+        assert bulk.known_hashes == set()
+    finally:
+        bulk.close()
+
+
+def test_repositories_sharing_commits_keep_separate_analyses(history, tmp_path, capsys):
+    clone = tmp_path / 'clone'
+    subprocess.check_call(['git', 'clone', '-q', str(history.path), str(clone)])
+    for repo_path in (history.path, clone):
+        app = CommitAnalysisApp(str(repo_path), str(tmp_path / 'data'))
+        app._analyze_and_store(TIMEFRAME)
+        app.close()
+    capsys.readouterr()
+
+    origin = open_app(history, tmp_path / 'data')
+    try:
+        assert len(origin.known_hashes) == 3
+        origin._analyze_and_store(TIMEFRAME)
+        with origin.storage.db.cursor() as cursor:
+            cursor.execute("SELECT repo_path, COUNT(*) FROM commit_analyses GROUP BY repo_path ORDER BY repo_path")
+            counts = cursor.fetchall()
+        records = origin.storage.load_commit_analyses(sorted(origin.known_hashes), str(clone.resolve()))
+    finally:
+        origin.close()
+
+    assert '(0 new, 3 reused)' in capsys.readouterr().out
+    assert counts == sorted([(origin.repo_key, 3), (str(clone.resolve()), 3)])
+    assert all(len(record['files_changed']) == 2 for record in records.values())
+
+
+@pytest.mark.parametrize('author', [None, 'missing'])
+def test_stored_records_without_an_author_load(author):
+    record = {'commit_hash': 'a' * 40, 'date': '2023-06-01T12:00:00+00:00', 'author': author}
+    if author == 'missing':
+        del record['author']
+
+    analysis = CommitAnalysis.from_dict(record)
+
+    assert analysis.author is None
+    assert analysis.date.isoformat() == '2023-06-01T12:00:00+00:00'
@@ -0,0 +1,133 @@
+import json
+import sqlite3
+
+import pytest
+
+from storage.document_store import DocumentStore
+
+# Tables and indexes each migration adds, in order
+MIGRATION_OBJECTS = [
+    ['idx_reports_report_id', 'idx_reports_created_at', 'idx_commits_repo_category'],
+    ['idx_reports_content_hash'],
+    ['report_rollups', 'idx_reports_repo_timeframe'],
+    ['idx_commits_repo_date', 'idx_commits_risk_date'],
+    ['report_sections'],
+    ['authors', 'files', 'commit_files', 'idx_commit_files_file', 'idx_commits_author_id'],
+    ['dashboard_partials'],
+    ['result_cache', 'idx_result_cache_last_used', 'idx_result_cache_repo'],
+    ['idx_commits_repo_settings'],
+    ['idx_commits_repo_hash'],
+]
+
+
+def schema(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(commit_analyses)")}
+    finally:
+        conn.close()
+    return version, names, columns
+
+
+def create_legacy_database(storage_path):
+    """The schema and rows written before versioned migrations existed."""
+    storage_path.mkdir(parents=True)
+    conn = sqlite3.connect(storage_path / 'analysis_db.sqlite')
+    conn.executescript("""
+        CREATE TABLE analysis_reports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timeframe TEXT,
+            created_at TIMESTAMP,
+            commit_count INTEGER,
+            report_path TEXT,
+            metadata JSON
+        );
+        CREATE TABLE commit_analyses (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            commit_hash TEXT UNIQUE,
+            author TEXT,
+            date TIMESTAMP,
+            category TEXT,
+            impact_score REAL,
+            risk_assessment TEXT,
+            summary TEXT,
+            raw_data JSON
+        );
+        CREATE TABLE repo_watermarks (repo_path TEXT PRIMARY KEY, last_commit_hash TEXT);
+    """)
+    conn.execute("INSERT INTO analysis_reports (timeframe, created_at, commit_count, report_path, metadata) "
+                 "VALUES ('week', '2023-06-01T12:00:00', 1, 'missing.json', ?)",
+                 (json.dumps({'report_id': 'report_legacy'}),))
+    conn.execute("INSERT INTO commit_analyses (commit_hash, author, date, category, impact_score, "
+                 "risk_assessment, summary, raw_data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 ('a' * 40, 'Alice', '2023-06-01T12:00:00', 'feature', 0.4, 'low', 'Adds a parser',
+                  json.dumps({'files_changed': ['src/parser.py', 'README.md'], 'insertions': 12,
+                              'deletions': 2, 'message': 'Add parser'})))
+    conn.commit()
+    conn.close()
+
+
+def test_new_database_has_every_migration(tmp_path):
+    store = DocumentStore(str(tmp_path / 'data'))
+    store.close()
+
+    version, names, columns = schema(tmp_path / 'data' / 'analysis_db.sqlite')
+    assert version == len(MIGRATION_OBJECTS)
+    for objects in MIGRATION_OBJECTS:
+        assert set(objects) <= names
+    assert {'repo_path', 'author_id', 'analysis_settings'} <= columns
+    assert 'repo_watermarks' not in names
+
+
+def test_legacy_database_is_upgraded_in_place(tmp_path):
+    create_legacy_database(tmp_path / 'data')
+
+    store = DocumentStore(str(tmp_path / 'data'))
+    try:
+        version, names, _ = schema(tmp_path / 'data' / 'analysis_db.sqlite')
+        assert version == len(MIGRATION_OBJECTS)
+        assert 'repo_watermarks' not in names
+
+        with store.db.cursor() as cursor:
+            cursor.execute("SELECT report_id FROM analysis_reports")
+            assert cursor.fetchone()[0] == 'report_legacy'
+
+        # Authors and files moved to lookup tables without losing data
+        record = store.load_commit_analyses(['a' * 40])['a' * 40]
+        assert record['author'] == 'Alice'
+        assert record['files_changed'] == ['src/parser.py', 'README.md']
+        assert record['message'] == 'Add parser'
+        assert (record['insertions'], record['deletions']) == (12, 2)
+
+        # Rows without analyzer settings are analyzed again by incremental runs
+        with store.db.cursor() as cursor:
+            cursor.execute("SELECT analysis_settings FROM commit_analyses")
+            assert cursor.fetchone()[0] is None
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize('applied', range(len(MIGRATION_OBJECTS) + 1))
+def test_only_pending_migrations_run(tmp_path, monkeypatch, applied):
+    DocumentStore(str(tmp_path / 'data')).close()
+    conn = sqlite3.connect(tmp_path / 'data' / 'analysis_db.sqlite')
+    conn.execute(f"PRAGMA user_version = {applied}")
+    conn.close()
+
+    calls = []
+
+    def recording(name, migration):
+        def run(self, cursor):
+            calls.append(name)
+            migration(self, cursor)
+        return run
+
+    for name in [name for name in vars(DocumentStore) if name.startswith('_migration_')]:
+        monkeypatch.setattr(DocumentStore, name, recording(name, getattr(DocumentStore, name)))
+
+    DocumentStore(str(tmp_path / 'data')).close()
+
+    assert len(calls) == len(MIGRATION_OBJECTS) - applied
+    assert schema(tmp_path / 'data' / 'analysis_db.sqlite')[0] == len(MIGRATION_OBJECTS)
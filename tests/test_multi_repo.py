@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from conftest import GitRepo
+from main import MultiRepoAnalysisApp, load_repo_manifest
+
+TIMEFRAME = '2023-01-01..2023-12-31'
+
+
+@pytest.fixture
+def repos(tmp_path):
+    first = GitRepo(tmp_path / 'first')
+    first.commit({'a.py': 'print(1)\n'}, 'Add a', author='Alice')
+    first.commit({'b.py': 'print(2)\n'}, 'Fix b', author='Bob', date='2023-06-02T12:00:00+00:00')
+    second = GitRepo(tmp_path / 'second')
+    second.commit({'c.py': 'print(3)\n'}, 'Add c', author='Carol')
+    return [first, second]
+
+
+def run(repo_paths, tmp_path, **options):
+    app = MultiRepoAnalysisApp([str(path) for path in repo_paths], str(tmp_path / 'data'), **options)
+    try:
+        result = app.run_analysis(TIMEFRAME)
+        stored = {repo['repo_path']: app.storage.get_known_commit_hashes(repo['repo_path'])
+                  for repo in result['repositories'] if 'error' not in repo}
+        report = app.get_report(result['report_id'])
+    finally:
+        app.storage.close()
+    return result, stored, report
+
+
+def test_repositories_are_analyzed_into_one_dashboard(repos, tmp_path):
+    result, stored, report = run([repo.path for repo in repos], tmp_path, concurrency=1)
+
+    assert result['commit_count'] == 3
+    assert [repo['commit_count'] for repo in result['repositories']] == [2, 1]
+    assert {path: len(hashes) for path, hashes in stored.items()} == {str(repos[0].path): 2, str(repos[1].path): 1}
+    assert report['dashboard_summary']['active_contributors'] == 3
+    assert f"**{repos[1].path}**: 1 commits" in result['summary']
+
+
+def test_a_failing_repository_does_not_stop_the_others(repos, tmp_path):
+    missing = tmp_path / 'missing'
+
+    result, stored, _ = run([repos[0].path, missing, repos[1].path], tmp_path)
+
+    failed = result['repositories'][1]
+    assert failed['repo_path'] == str(missing) and failed['error']
+    assert list(stored) == [str(repos[0].path), str(repos[1].path)]
+    assert result['commit_count'] == 3
+    assert f"**{missing}**: failed" in result['summary']
+
+
+def test_text_manifests_skip_comments_and_resolve_relative_paths(tmp_path):
+    manifest = tmp_path / 'config' / 'repos.txt'
+    manifest.parent.mkdir()
+    manifest.write_text("# Services\nfirst\n\n  ../second  \n# ../ignored\n/abs/third\n")
+
+    assert load_repo_manifest(str(manifest)) == [
+        str(tmp_path / 'config' / 'first'), str(tmp_path / 'second'), '/abs/third'
+    ]
+
+
+@pytest.mark.parametrize('data', [
+    ['first', {'path': 'second'}],
+    {'repos': ['first', {'path': 'second'}]},
+])
+def test_json_manifests(tmp_path, data):
+    manifest = tmp_path / 'repos.json'
+    manifest.write_text(json.dumps(data))
+
+    assert load_repo_manifest(str(manifest)) == [str(tmp_path / 'first'), str(tmp_path / 'second')]
@@ -0,0 +1,97 @@
+import os
+import time
+
+import pytest
+
+from agents.parallel import WorkerPool, map_ordered
+
+
+def double(x):
+    if x == 7:
+        raise ValueError('seven')
+    return x * 2
+
+
+def exit_on_thirteen(x):
+    if x == 13:
+        # Let the other chunks finish before the worker dies
+        time.sleep(0.5)
+        os._exit(1)
+    return x
+
+
+class UnpicklableError(Exception):
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.code = code
+
+
+def raise_unpicklable_on_five(x):
+    if x == 5:
+        raise UnpicklableError('five', 5)
+    return x
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_results_keep_input_order_and_errors_are_replaced(executor):
+    pool = WorkerPool(3, executor)
+    try:
+        results = pool.map_ordered(double, list(range(20)), on_error=lambda item, e: ('failed', item))
+    finally:
+        pool.close()
+
+    assert results == [('failed', 7) if x == 7 else x * 2 for x in range(20)]
+
+
+def test_first_error_is_raised_without_on_error():
+    with pytest.raises(ValueError, match='seven'):
+        map_ordered(double, list(range(10)), workers=2)
+
+
+def test_pool_is_reused_across_calls():
+    pool = WorkerPool(2, 'process')
+    try:
+        pool.map_ordered(double, [1, 2, 3])
+        executor = pool._pool
+        pool.map_ordered(double, [4, 5, 6])
+        assert pool._pool is executor
+    finally:
+        pool.close()
+    assert pool._pool is None
+
+
+def test_dead_worker_fails_only_its_chunk_and_the_pool_is_replaced():
+    pool = WorkerPool(4, 'process')
+    try:
+        results = pool.map_ordered(exit_on_thirteen, list(range(32)), on_error=lambda item, e: 'failed')
+        assert results[13] == 'failed'
+        # Chunks that finished before the worker died keep their results
+        assert results[:12] == list(range(12))
+        assert results[16:] == list(range(16, 32))
+        assert pool._pool is None
+
+        assert pool.map_ordered(exit_on_thirteen, list(range(8))) == list(range(8))
+    finally:
+        pool.close()
+
+
+def test_unpicklable_worker_error_does_not_break_the_pool():
+    pool = WorkerPool(2, 'process')
+    try:
+        errors = {}
+        results = pool.map_ordered(raise_unpicklable_on_five, list(range(10)),
+                                   on_error=lambda item, e: errors.setdefault(item, e))
+        executor = pool._pool
+        assert pool.map_ordered(double, [1, 2]) == [2, 4]
+        assert pool._pool is executor
+    finally:
+        pool.close()
+
+    assert results[:5] == list(range(5)) and results[6:] == list(range(6, 10))
+    assert isinstance(errors[5], RuntimeError)
+    assert 'UnpicklableError: five' in str(errors[5])
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        WorkerPool(2, 'fiber')
@@ -0,0 +1,110 @@
+import io
+import threading
+
+import pytest
+
+from agents.enhanced_report_generator import EnhancedReportGenerator, iter_rendered, render_to_string
+from main import CommitAnalysisApp, iter_report_markdown
+
+TIMEFRAME = '2023-01-01..2023-12-31'
+
+
+@pytest.fixture
+def history(git_repo):
+    git_repo.commit({'src/app.py': 'print(1)\n' * 40, 'README.md': 'Intro\n'}, 'Add app', author='Alice')
+    git_repo.commit({'src/app.py': 'print(2)\n'}, 'Fix crash in app', author='Bob', date='2023-06-02T12:00:00+00:00')
+    git_repo.commit({'styles/site.css': 'body {}\n'}, 'Update page styles', author='Alice',
+                    date='2023-06-03T09:30:00+02:00')
+    return git_repo
+
+
+@pytest.fixture
+def app(history, tmp_path):
+    app = CommitAnalysisApp(str(history.path), str(tmp_path / 'data'))
+    yield app
+    app.close()
+
+
+def joined_sections(summaries):
+    # The layout of the report before it was written through writers
+    sections = EnhancedReportGenerator().generate_report_sections(summaries)
+    return '\n\n'.join([sections['executive_summary'], sections['timeline'], sections['technical_deep_dive']])
+
+
+def test_every_writer_gets_the_joined_sections(app):
+    summaries = app.analyzer.process(TIMEFRAME)['non_technical_summaries']
+    generator = EnhancedReportGenerator()
+    accumulator = generator.prepare_report(summaries)
+    expected = joined_sections(summaries)
+
+    assert render_to_string(generator.write_report, accumulator.dashboard_summary(), accumulator) == expected
+    buffer = io.StringIO()
+    generator.write_report(accumulator.dashboard_summary(), accumulator, buffer.write)
+    assert buffer.getvalue() == expected
+
+    chunks = list(iter_rendered(generator.write_report, accumulator.dashboard_summary(), accumulator, chunk_size=200))
+    assert ''.join(chunks) == expected
+    assert len(chunks) > 1 and all(len(chunk) >= 200 for chunk in chunks[:-1])
+
+
+def test_stored_reports_are_rendered_from_their_summaries(app):
+    result = app.run_analysis(TIMEFRAME)
+    summaries = app.get_report(result['report_id'])['non_technical_summaries']
+
+    markdown = ''.join(iter_report_markdown(app.storage, result['report_id'], chunk_size=500))
+
+    assert markdown == joined_sections(summaries)
+    # The stored text is the same report after the optimizer pass
+    assert result['summary'].startswith(markdown)
+
+
+def test_summaries_are_read_page_by_page(app, monkeypatch):
+    import main
+
+    monkeypatch.setattr(main, 'REPORT_PAGE_SIZE', 2)
+    result = app.run_analysis(TIMEFRAME)
+    summaries = app.get_report(result['report_id'])['non_technical_summaries']
+
+    assert ''.join(iter_report_markdown(app.storage, result['report_id'])) == joined_sections(summaries)
+
+
+def test_reports_without_summaries_are_sent_as_stored(app):
+    result = app.run_analysis(TIMEFRAME, streaming=True)
+
+    chunks = list(iter_report_markdown(app.storage, result['report_id'], chunk_size=100))
+
+    assert ''.join(chunks) == app.get_report(result['report_id'])['report']
+    assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+def test_missing_reports(app):
+    assert iter_report_markdown(app.storage, 'report_missing') is None
+
+
+def test_closing_the_iterator_stops_the_renderer():
+    written = []
+    finished = threading.Event()
+
+    def render(write):
+        try:
+            for i in range(10000):
+                write(f'line {i}\n')
+                written.append(i)
+        finally:
+            finished.set()
+
+    chunks = iter_rendered(render, chunk_size=10)
+    assert next(chunks) == 'line 0\nline 1\n'
+    chunks.close()
+
+    assert finished.wait(timeout=5)
+    assert len(written) < 100
+
+
+def test_renderer_errors_reach_the_reader():
+    def render(write):
+        write('# Title\n')
+        raise ValueError('broken section')
+
+    with pytest.raises(ValueError, match='broken section'):
+        list(iter_rendered(render, chunk_size=1))
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from storage import document_store
+from storage.document_store import DocumentStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Small pages so a handful of entries spans several of them
+    monkeypatch.setattr(document_store, 'REPORT_PAGE_SIZE', 3)
+    store = DocumentStore(str(tmp_path / 'data'))
+    yield store
+    store.close()
+
+
+def make_report(commits):
+    return {
+        'timeframe': 'week',
+        'commits_analyzed': commits,
+        'report': '# Report',
+        'dashboard_summary': {'total_commits': commits},
+        'detailed_analysis': [{'commit_hash': f'{i:040d}'} for i in range(commits)],
+        'non_technical_summaries': [],
+    }
+
+
+def hashes(section):
+    return [int(item['commit_hash']) for item in section['items']]
+
+
+def test_sections_are_listed_with_pages_and_counts(store):
+    report_id = store.store_analysis_report(make_report(7))
+
+    sections = {section['section']: section for section in store.get_report_sections(report_id)}
+
+    assert sections['detailed_analysis'] == {'section': 'detailed_analysis', 'pages': 3, 'items': 7}
+    # An empty paged section still has one page
+    assert sections['non_technical_summaries'] == {'section': 'non_technical_summaries', 'pages': 1, 'items': 0}
+    assert sections['report'] == {'section': 'report', 'pages': 1, 'items': None}
+
+
+@pytest.mark.parametrize('offset, limit, expected', [
+    (0, None, list(range(7))),
+    (2, 3, [2, 3, 4]),
+    (3, 3, [3, 4, 5]),
+    (6, 10, [6]),
+    (9, 2, []),
+    (-1, 0, []),
+])
+def test_paged_sections_are_sliced(store, offset, limit, expected):
+    report_id = store.store_analysis_report(make_report(7))
+
+    section = store.retrieve_report_section(report_id, 'detailed_analysis', offset, limit)
+
+    assert hashes(section) == expected
+    assert section['total'] == 7
+
+
+def test_only_overlapping_pages_are_read(store, monkeypatch):
+    report_id = store.store_analysis_report(make_report(7))
+    reads = []
+    read = DocumentStore._read_report_file
+    monkeypatch.setattr(DocumentStore, '_read_report_file',
+                        lambda self, path: reads.append(path) or read(self, path))
+
+    store.retrieve_report_section(report_id, 'detailed_analysis', 3, 2)
+
+    assert len(reads) == 1
+
+
+def test_other_sections_return_their_value(store):
+    report_id = store.store_analysis_report(make_report(2))
+
+    assert store.retrieve_report_section(report_id, 'dashboard_summary') == {
+        'report_id': report_id, 'section': 'dashboard_summary', 'value': {'total_commits': 2}}
+    assert store.retrieve_report_section(report_id, 'missing') is None
+    assert store.retrieve_report_section('report_missing', 'report') is None
+
+
+def test_full_report_joins_pages_and_honours_fields(store):
+    report_id = store.store_analysis_report(make_report(7))
+
+    report = store.retrieve_report(report_id)
+    assert [int(item['commit_hash']) for item in report['detailed_analysis']] == list(range(7))
+    assert set(store.retrieve_report(report_id, fields=['report', 'timeframe'])) == {'report', 'timeframe'}
+
+
+def test_legacy_single_file_reports_are_sliced(store, tmp_path):
+    report_path = tmp_path / 'data' / 'report_legacy.json'
+    report_path.write_text(json.dumps(make_report(5)))
+    with store.db.transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO analysis_reports (report_id, timeframe, created_at, commit_count, report_path, metadata)
+            VALUES ('report_legacy', 'week', '2023-06-01T12:00:00', 5, ?, '{}')
+        """, (str(report_path),))
+
+    section = store.retrieve_report_section('report_legacy', 'detailed_analysis', 1, 2)
+
+    assert hashes(section) == [1, 2]
+    assert section['total'] == 5
+    assert store.retrieve_report_section('report_legacy', 'report')['value'] == '# Report'
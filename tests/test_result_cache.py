@@ -0,0 +1,132 @@
+import pytest
+
+from main import CommitAnalysisApp
+from storage.document_store import DocumentStore
+from storage.result_cache import ResultCache, result_cache_key
+
+TIMEFRAME = '2023-01-01..2023-12-31'
+FINGERPRINT = {'head': 'a' * 40, 'window': 'b' * 40, 'commit_count': 3}
+# Noon UTC on 2023-06-10 and a week before
+NOW = 1686398400
+WEEK = (NOW - 7 * 86400, NOW)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / 'data'))
+    yield store
+    store.close()
+
+
+def store_result(store, text='# Report', commits=3):
+    report_id = store.store_analysis_report({'timeframe': 'week', 'commits_analyzed': commits, 'report': text},
+                                            '/repo')
+    return {'report_id': report_id, 'summary': text, 'commit_count': commits}
+
+
+def test_keys_separate_windows_and_options():
+    key = result_cache_key('/repo', FINGERPRINT, WEEK)
+
+    # A relative window resolved later the same day covers the same days
+    for seconds in (61, 3600, 6 * 3600):
+        assert result_cache_key('/repo', FINGERPRINT, (WEEK[0] + seconds, WEEK[1] + seconds)) == key
+    assert result_cache_key('/repo', FINGERPRINT, (WEEK[0] + 86400, WEEK[1] + 86400)) != key
+    assert result_cache_key('/repo', FINGERPRINT, (WEEK[0] - 86400, WEEK[1])) != key
+    assert result_cache_key('/repo', FINGERPRINT, (WEEK[0], None)) != key
+    assert result_cache_key('/repo', FINGERPRINT, WEEK, streaming=True) != key
+    assert result_cache_key('/other', FINGERPRINT, WEEK) != key
+    assert result_cache_key('/repo', dict(FINGERPRINT, head='c' * 40), WEEK) != key
+
+
+def test_memory_hits_skip_reading_the_report(store, monkeypatch):
+    cache = ResultCache(store)
+    result = store_result(store)
+    cache.put('key', '/repo', 'head1', result)
+    monkeypatch.setattr(store, 'retrieve_report', lambda *args, **kwargs: pytest.fail('report was read'))
+
+    assert cache.get('key') == result
+    assert cache.get('missing') is None
+
+
+def test_entries_survive_a_restart(store):
+    result = store_result(store)
+    ResultCache(store).put('key', '/repo', 'head1', result)
+
+    assert ResultCache(store).get('key') == result
+
+
+def test_expired_reports_invalidate_entries(store):
+    cache = ResultCache(store)
+    cache.put('key', '/repo', 'head1', store_result(store))
+    store.apply_retention(keep_last=0)
+
+    # Also when the result is still held in memory
+    assert cache.get('key') is None
+    assert store.get_cached_result('key') is None
+
+
+def test_a_new_head_drops_the_repository_entries(store):
+    cache = ResultCache(store)
+    cache.put('old', '/repo', 'head1', store_result(store, 'old'))
+    cache.put('other', '/other', 'head1', store_result(store, 'other'))
+    cache.put('new', '/repo', 'head2', store_result(store, 'new'))
+
+    assert cache.get('old') is None
+    assert cache.get('other')['summary'] == 'other'
+    assert cache.get('new')['summary'] == 'new'
+
+
+def test_least_recently_used_entries_are_evicted(store):
+    cache = ResultCache(store, max_entries=2, memory_entries=1)
+    for key in ('first', 'second'):
+        cache.put(key, f'/{key}', 'head', store_result(store, key))
+    cache.get('first')
+    cache.put('third', '/third', 'head', store_result(store, 'third'))
+
+    assert cache.get('second') is None
+    assert cache.get('first')['summary'] == 'first'
+    assert cache.get('third')['summary'] == 'third'
+    assert len(cache._memory) == 1
+
+
+def test_repeated_runs_reuse_the_result_until_head_moves(git_repo, tmp_path):
+    git_repo.commit({'a.py': 'print(1)\n'}, 'Add a')
+    app = CommitAnalysisApp(str(git_repo.path), str(tmp_path / 'data'))
+    try:
+        first = app.run_analysis(TIMEFRAME)
+        second = app.run_analysis(TIMEFRAME)
+        assert second['cached'] and second['report_id'] == first['report_id']
+        assert 'cached' not in app.run_analysis(TIMEFRAME, incremental=False)
+
+        git_repo.commit({'b.py': 'print(2)\n'}, 'Add b', date='2023-06-02T12:00:00+00:00')
+        third = app.run_analysis(TIMEFRAME)
+    finally:
+        app.close()
+
+    assert 'cached' not in third
+    assert third['commit_count'] == 2
+
+
+def test_relative_windows_hit_after_the_clock_moves(git_repo, tmp_path, monkeypatch):
+    import main
+
+    git_repo.commit({'a.py': 'print(1)\n'}, 'Add a', date='2023-06-05T12:00:00+00:00')
+    clock = {'now': NOW}
+
+    def resolve_dates(repo_path, since, until):
+        # Stands in for git resolving a one-week relative window at the current time
+        return clock['now'] - 7 * 86400, clock['now']
+
+    monkeypatch.setattr(main, 'resolve_dates', resolve_dates)
+    app = CommitAnalysisApp(str(git_repo.path), str(tmp_path / 'data'))
+    try:
+        first = app.run_analysis(TIMEFRAME)
+        clock['now'] += 90
+        second = app.run_analysis(TIMEFRAME)
+        clock['now'] += 86400
+        next_day = app.run_analysis(TIMEFRAME)
+    finally:
+        app.close()
+
+    assert second['cached'] and second['report_id'] == first['report_id']
+    assert 'cached' not in next_day
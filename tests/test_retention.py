@@ -0,0 +1,105 @@
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from storage.document_store import ORPHAN_GRACE_SECONDS, DocumentStore
+from storage.retention import RetentionPolicy, run_maintenance
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DocumentStore(str(tmp_path / 'data'))
+    yield store
+    store.close()
+
+
+def store_report(store, commits, created_at, repo_path='/repo', timeframe='week', text=None):
+    report_id = store.store_analysis_report({
+        'timeframe': timeframe,
+        'commits_analyzed': commits,
+        'report': text or f'{commits} commits on {created_at}',
+        'detailed_analysis': [],
+    }, repo_path)
+    with store.db.transaction() as cursor:
+        cursor.execute("UPDATE analysis_reports SET created_at = ? WHERE report_id = ?", (created_at, report_id))
+    return report_id
+
+
+def age_blobs(store):
+    past = time.time() - ORPHAN_GRACE_SECONDS - 60
+    for path in store.storage_path.glob('blobs/*/*'):
+        os.utime(path, (past, past))
+
+
+def test_keep_last_applies_per_repository_and_timeframe(store):
+    old = store_report(store, 1, '2023-06-01T10:00:00')
+    older = store_report(store, 2, '2023-06-01T09:00:00')
+    newest = store_report(store, 3, '2023-06-02T10:00:00')
+    other_repo = store_report(store, 4, '2023-06-01T08:00:00', repo_path='/other')
+    other_timeframe = store_report(store, 5, '2023-06-01T08:00:00', timeframe='month')
+
+    assert store.apply_retention(keep_last=1) == {'expired_reports': 2}
+
+    for report_id in (old, older):
+        assert store.retrieve_report(report_id) is None
+    for report_id in (newest, other_repo, other_timeframe):
+        assert store.retrieve_report(report_id) is not None
+
+
+def test_expired_reports_are_rolled_up_per_day(store):
+    store_report(store, 1, '2023-06-01T10:00:00')
+    store_report(store, 4, '2023-06-01T11:00:00')
+    store.apply_retention(keep_last=0)
+    store_report(store, 2, '2023-06-01T12:00:00')
+    store.apply_retention(max_age_days=1)
+
+    assert store.get_report_rollups('/repo') == [{
+        'repo_path': '/repo',
+        'timeframe': 'week',
+        'day': '2023-06-01',
+        'report_count': 3,
+        'commit_count': 7,
+        'max_commit_count': 4,
+        'first_created_at': '2023-06-01T10:00:00',
+        'last_created_at': '2023-06-01T12:00:00',
+    }]
+    assert store.get_report_rollups('/other') == []
+
+
+def test_no_policy_expires_nothing(store):
+    store_report(store, 1, '2023-06-01T10:00:00')
+
+    assert store.apply_retention() == {'expired_reports': 0}
+    assert not RetentionPolicy().enabled
+    assert store.get_report_rollups() == []
+
+
+def test_compaction_removes_only_unreferenced_blobs(store):
+    store_report(store, 1, '2023-06-01T10:00:00', text='shared')
+    kept = store_report(store, 1, datetime.now().isoformat(), text='shared')
+    store_report(store, 9, '2023-06-01T09:00:00', repo_path='/other', text='only in expired')
+    store.apply_retention(max_age_days=1)
+
+    # Blobs within the grace period may belong to a report being written
+    assert store.compact()['removed_files'] == 0
+
+    age_blobs(store)
+    result = store.compact(vacuum=True)
+
+    assert result['removed_files'] > 0
+    assert result['vacuumed']
+    assert store.retrieve_report(kept)['report'] == 'shared'
+
+
+def test_run_maintenance_reports_both_steps(store):
+    store_report(store, 1, '2023-06-01T10:00:00')
+    store_report(store, 2, '2023-06-02T10:00:00')
+    age_blobs(store)
+
+    result = run_maintenance(store, RetentionPolicy(keep_last=1), vacuum=False)
+
+    assert result['expired_reports'] == 1
+    assert result['removed_files'] >= 1
+    assert result['vacuumed'] is False
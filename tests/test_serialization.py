@@ -0,0 +1,87 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.advanced_analyzer import CodeExplanation
+from agents.base_agent import CommitAnalysis
+from storage import serialization
+
+
+def make_analysis(**overrides):
+    values = dict(
+        commit_hash='a' * 40,
+        author='Alice',
+        date=datetime(2023, 6, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))),
+        message='Add parser',
+        files_changed=['src/parser.py'],
+        insertions=10,
+        deletions=2,
+        summary='Adds a parser',
+        category='feature',
+        impact_score=0.4,
+        risk_assessment='low',
+        file_stats={'src/parser.py': (10, 2)},
+        omitted_files=1,
+        committed_at=datetime(2023, 6, 2, 9, 30, tzinfo=timezone.utc)
+    )
+    values.update(overrides)
+    return CommitAnalysis(**values)
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        if not serialization.HAS_ORJSON:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(serialization, 'HAS_ORJSON', False)
+    return request.param
+
+
+def test_report_round_trips_commit_analyses(encoder):
+    analysis = make_analysis()
+    report = {'timeframe': 'week', 'detailed_analysis': [analysis], 'report': '# Report'}
+
+    data = serialization.dumps(serialization.encode_report(report))
+    decoded = serialization.decode_report(serialization.loads(data))
+
+    assert decoded['detailed_analysis'] == [analysis]
+    assert decoded['report'] == '# Report'
+
+
+def test_analysis_without_committer_date_round_trips(encoder):
+    analysis = make_analysis(committed_at=None)
+
+    data = serialization.dumps(serialization.encode_report({'detailed_analysis': [analysis]}))
+
+    assert serialization.decode_report(serialization.loads(data))['detailed_analysis'] == [analysis]
+
+
+def test_both_encoders_produce_the_same_bytes(monkeypatch):
+    if not serialization.HAS_ORJSON:
+        pytest.skip('orjson is not installed')
+    value = {'b': [1, 2.5, None], 'a': {'z': 'ü', 'y': True}, 'd': datetime(2023, 6, 1, 12, 0)}
+
+    fast = serialization.dumps(value)
+    monkeypatch.setattr(serialization, 'HAS_ORJSON', False)
+
+    assert serialization.dumps(value) == fast
+
+
+def test_fallback_encodes_remaining_objects(encoder):
+    explanation = CodeExplanation(file_path='a.py', language='Python', purpose='Parsing',
+                                  complexity_level='Low', impact_description='Small',
+                                  non_technical_summary='Edits a', changes_explanation='1 line added',
+                                  code_summary='Parser')
+    data = json.loads(serialization.dumps({
+        'analysis': make_analysis(),
+        'explanation': explanation,
+        'tags': {'x'},
+        'pair': (1, 2),
+    }))
+
+    assert data['analysis']['date'] == '2023-06-01T12:00:00+02:00'
+    assert data['explanation']['file_path'] == 'a.py'
+    assert data['tags'] == ['x']
+    assert data['pair'] == [1, 2]
@@ -0,0 +1,71 @@
+import pytest
+
+from agents.commit_analyzer import EXTRACTION_MODES, CommitAnalyzerAgent
+from main import CommitAnalysisApp
+
+TIMEFRAME = '2023-01-01..2023-12-31'
+
+
+@pytest.fixture
+def history(git_repo):
+    for day in range(1, 8):
+        git_repo.commit({f'src/module{day}.py': 'print(1)\n' * day, 'README.md': f'v{day}\n'},
+                        f'Add feature {day}', author=['Alice', 'Bob'][day % 2],
+                        date=f'2023-06-0{day}T12:00:00+00:00')
+    return git_repo
+
+
+@pytest.fixture(params=EXTRACTION_MODES)
+def agent(request, history):
+    agent = CommitAnalyzerAgent(str(history.path), extraction_mode=request.param)
+    yield agent
+    agent.close()
+
+
+def test_stream_hands_bounded_batches_to_the_sink(agent):
+    batches = []
+
+    result = agent.process_stream(TIMEFRAME, sink=batches.append, buffer_size=3)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert result['commits_analyzed'] == 7
+    assert result['streamed'] and result['detailed_analysis'] == []
+
+    streamed = [analysis for batch in batches for analysis in batch]
+    assert streamed == agent._analyze_commits(agent._fetch_commits(TIMEFRAME))
+
+
+def test_stream_dashboard_matches_the_in_memory_run(agent):
+    streamed = agent.process_stream(TIMEFRAME, buffer_size=2)
+    in_memory = agent.process(TIMEFRAME)
+
+    assert streamed['dashboard_summary'] == in_memory['dashboard_summary']
+    assert streamed['dashboard_partials'].keys() == in_memory['dashboard_partials'].keys()
+
+
+def test_stream_rehydrates_known_commits(agent):
+    first = agent._analyze_commits(agent._fetch_commits(TIMEFRAME))
+    stored = {analysis.commit_hash: analysis for analysis in first[:4]}
+    loaded = []
+
+    def load_known(commit_hashes):
+        loaded.extend(commit_hashes)
+        return {commit_hash: stored[commit_hash] for commit_hash in commit_hashes}
+
+    batches = []
+    agent.process_stream(TIMEFRAME, batches.append, set(stored), load_known, buffer_size=3)
+
+    assert sorted(loaded) == sorted(stored)
+    assert [analysis for batch in batches for analysis in batch] == first
+
+
+def test_streaming_app_run_stores_every_commit(history, tmp_path):
+    app = CommitAnalysisApp(str(history.path), str(tmp_path / 'data'))
+    try:
+        result = app.run_analysis(TIMEFRAME, streaming=True)
+        stored = app.storage.get_known_commit_hashes(app.repo_key)
+    finally:
+        app.close()
+
+    assert result['commit_count'] == 7
+    assert len(stored) == 7
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from storage import vector_store
+from storage.vector_store import VectorStore
+
+
+@pytest.fixture(params=['faiss', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param == 'faiss':
+        if not vector_store.HAS_FAISS:
+            pytest.skip('faiss is not installed')
+    else:
+        monkeypatch.setattr(vector_store, 'HAS_FAISS', False)
+    return request.param
+
+
+@pytest.fixture
+def store(tmp_path, backend):
+    store = VectorStore(tmp_path / 'vectors')
+    yield store
+    store.close()
+
+
+def ids(results):
+    return [result['document_id'] for result in results]
+
+
+def test_add_and_get(store):
+    store.add('a', [1.0, 0.0, 0.0])
+    store.add_many(['b', 'c'], [[0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+
+    assert len(store) == 3
+    assert 'b' in store and 'd' not in store
+    assert store.get('c') == [0.0, 0.0, 1.0]
+    assert store.get('d') is None
+
+
+def test_search_orders_by_cosine_similarity(store):
+    store.add_many(['a', 'b', 'c'], [[1.0, 0.0], [1.0, 1.0], [0.0, 1.0]])
+
+    results = store.search([2.0, 0.1], k=2)
+
+    assert ids(results) == ['a', 'b']
+    assert results[0]['score'] == pytest.approx(0.99875, abs=1e-4)
+    assert ids(store.search([1.0, 0.0], k=2, exclude='a')) == ['b', 'c']
+    assert store.search([1.0, 0.0], k=0) == []
+
+
+def test_storing_a_document_again_supersedes_its_row(store):
+    store.add_many(['a', 'b'], [[1.0, 0.0], [0.0, 1.0]])
+    store.search([1.0, 0.0])
+    store.add('a', [0.0, 1.0])
+
+    assert len(store) == 2
+    assert store.get('a') == [0.0, 1.0]
+    assert ids(store.search([1.0, 0.0], k=5)) in (['a', 'b'], ['b', 'a'])
+
+
+def test_dimension_mismatch_is_rejected(store):
+    store.add('a', [1.0, 0.0])
+
+    with pytest.raises(ValueError):
+        store.add('b', [1.0, 0.0, 0.0])
+    with pytest.raises(ValueError):
+        store.add('bad\nid', [1.0, 0.0])
+
+
+def test_rows_of_other_writers_are_picked_up(tmp_path, backend):
+    first = VectorStore(tmp_path / 'vectors')
+    second = VectorStore(tmp_path / 'vectors')
+    try:
+        first.add('a', [1.0, 0.0])
+        assert second.search([1.0, 0.0], k=1)[0]['document_id'] == 'a'
+
+        second.add('b', [0.0, 1.0])
+        first.add('a', [0.0, 1.0])
+
+        assert len(second) == 2
+        assert second.get('a') == [0.0, 1.0]
+        assert first.get('b') == [0.0, 1.0]
+    finally:
+        first.close()
+        second.close()
+
+
+def test_close_writes_the_index_for_the_next_instance(tmp_path):
+    if not vector_store.HAS_FAISS:
+        pytest.skip('faiss is not installed')
+    store = VectorStore(tmp_path / 'vectors')
+    store.add_many(['a', 'b'], [[1.0, 0.0], [0.0, 1.0]])
+    store.search([1.0, 0.0])
+    assert not store.index_path.exists()
+    store.close()
+
+    assert store.index_path.exists()
+    reopened = VectorStore(tmp_path / 'vectors')
+    try:
+        reopened.add('c', [1.0, 1.0])
+        assert ids(reopened.search([1.0, 0.0], k=3)) == ['a', 'c', 'b']
+    finally:
+        reopened.close()
+
+
+def test_interrupted_append_is_trimmed_on_load(tmp_path, backend):
+    store = VectorStore(tmp_path / 'vectors')
+    store.add_many(['a', 'b'], [[1.0, 0.0], [0.0, 1.0]])
+    store.close()
+
+    # The matrix row of 'c' was written but its ID never was
+    with open(store.matrix_path, 'ab') as f:
+        f.write(np.asarray([[1.0, 1.0]], dtype=np.float32).tobytes()[:6])
+
+    reopened = VectorStore(tmp_path / 'vectors')
+    try:
+        assert store.matrix_path.stat().st_size == 2 * 2 * 4
+        assert len(reopened) == 2
+        reopened.add('c', [1.0, 1.0])
+        assert reopened.get('c') == [1.0, 1.0]
+        assert reopened.get('b') == [0.0, 1.0]
+    finally:
+        reopened.close()